@@ -0,0 +1,34 @@
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import User
+from apps.accounts.stats import reconcile_profile_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild UserProfile quiz totals from completed TestAttempt history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users per transaction')
+        parser.add_argument('--user', action='append', dest='emails', help='Only these users (repeatable)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many profiles drifted')
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['emails']:
+            users = users.filter(email__in=options['emails'])
+        user_ids = users.values_list('id', flat=True).iterator(chunk_size=options['batch_size'])
+
+        started = time.perf_counter()
+        checked = drifted = 0
+        for batch in iter(lambda: list(islice(user_ids, options['batch_size'])), []):
+            drifted += reconcile_profile_stats(batch, dry_run=options['dry_run'])
+            checked += len(batch)
+
+        elapsed = time.perf_counter() - started
+        verb = 'would be rebuilt' if options['dry_run'] else 'rebuilt'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} profiles in {elapsed:.1f}s: {drifted} {verb}'
+        ))
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+SEARCH_FIELDS = ('email', 'first_name', 'last_name')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Index the user search fields for substring (icontains) lookups.
+
+    Only PostgreSQL has trigram indexes (pg_trgm); B-tree indexes cannot
+    serve '%term%' patterns, so other backends keep scanning.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS accounts_user_{field}_trgm '
+            f'ON accounts_user USING gin (UPPER({field}) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS accounts_user_{field}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_userprofile_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
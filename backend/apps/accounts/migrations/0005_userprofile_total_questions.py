@@ -0,0 +1,69 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:35
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_quiz_totals(apps, schema_editor):
+    """
+    Set tests_attempted, correct_answers and total_questions from completed
+    attempts, the way reconcile_profile_stats does; users with completed
+    attempts but no profile get one.
+    """
+    TestAttempt = apps.get_model('quiz', 'TestAttempt')
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    rows = (
+        TestAttempt.objects.filter(is_completed=True)
+        .values('user_id')
+        .annotate(
+            tests_attempted=Count('id'),
+            correct_answers=Sum('correct_answers'),
+            total_questions=Sum('total_questions'),
+        )
+        .order_by('user_id')
+    )
+    totals = {
+        row['user_id']: {
+            'tests_attempted': row['tests_attempted'],
+            'correct_answers': row['correct_answers'] or 0,
+            'total_questions': row['total_questions'] or 0,
+        }
+        for row in rows
+    }
+    now = timezone.now()
+    profiles = UserProfile.objects.filter(user_id__in=list(totals)).order_by('user_id')
+    updated = []
+    for profile in profiles.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        for field, value in totals.pop(profile.user_id).items():
+            setattr(profile, field, value)
+        profile.updated_at = now
+        updated.append(profile)
+    UserProfile.objects.bulk_update(
+        updated,
+        ['tests_attempted', 'correct_answers', 'total_questions', 'updated_at'],
+        batch_size=BACKFILL_BATCH_SIZE,
+    )
+    UserProfile.objects.bulk_create(
+        [UserProfile(user_id=user_id, **stats) for user_id, stats in totals.items()],
+        batch_size=BACKFILL_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_search_trigram_indexes'),
+        ('quiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='total_questions',
+            field=models.IntegerField(default=0, help_text='Total number of questions across completed quizzes'),
+        ),
+        migrations.RunPython(backfill_quiz_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_userprofile_total_questions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='is_staff',
+            field=models.BooleanField(default=False, help_text='Operators allowed to read internal endpoints such as /api/metrics/'),
+        ),
+    ]
@@ -24,6 +24,10 @@ class User(AbstractBaseUser):
     first_name = models.CharField(max_length=150, blank=True)
     last_name = models.CharField(max_length=150, blank=True)
     is_active = models.BooleanField(default=True)
+    is_staff = models.BooleanField(
+        default=False,
+        help_text='Operators allowed to read internal endpoints such as /api/metrics/'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -78,6 +82,10 @@ class UserProfile(models.Model):
         default=0,
         help_text='Total number of correct answers'
     )
+    total_questions = models.IntegerField(
+        default=0,
+        help_text='Total number of questions across completed quizzes'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -90,24 +98,7 @@ class UserProfile(models.Model):
     
     @property
     def accuracy_percentage(self):
-        """Calculate accuracy percentage from quiz statistics"""
-        if self.correct_answers == 0:
-            return 0
-        total_questions = self._get_total_questions()
-        if total_questions == 0:
-            return 0
-        return round((self.correct_answers / total_questions) * 100, 2)
-    
-    def _get_total_questions(self):
-        """Get total number of questions attempted"""
-        try:
-            from apps.quiz.models import QuizResult
-            total = QuizResult.objects.filter(
-                user=self.user,
-                is_completed=True
-            ).aggregate(
-                models.Sum('total_questions')
-            )['total_questions__sum'] or 0
-            return total
-        except (ImportError, Exception):
+        """Correct answers as a percentage of all questions in completed tests"""
+        if self.total_questions == 0:
             return 0
+        return round((self.correct_answers / self.total_questions) * 100, 2)
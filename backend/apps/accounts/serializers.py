@@ -143,6 +143,7 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
             'total_points',
             'tests_attempted',
             'correct_answers',
+            'total_questions',
             'accuracy_percentage',
         ]
         read_only_fields = ['id', 'username', 'email', 'accuracy_percentage']
@@ -152,7 +153,7 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
         return obj.user.get_full_name()
     
     def get_accuracy_percentage(self, obj):
-        """Calculate and return accuracy percentage"""
+        """Accuracy from the stored totals (no aggregate query)"""
         return obj.accuracy_percentage
 
 
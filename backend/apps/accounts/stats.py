@@ -0,0 +1,117 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from apps.quiz.models import TestAttempt
+from apps.rewards.models import PointsLedgerEntry
+from .models import UserProfile
+
+
+# ============================================================================
+# PROFILE STATISTICS - Denormalized quiz totals on UserProfile
+# ============================================================================
+# tests_attempted, correct_answers and total_questions are running totals
+# over the user's completed test attempts; total_points is the balance of
+# the user's points ledger (apps.rewards.ledger). They are bumped with F()
+# increments when an attempt completes (see apps.quiz.services.complete_test)
+# and can be rebuilt from history with `manage.py reconcile_profile_stats`.
+STAT_FIELDS = ('total_points', 'tests_attempted', 'correct_answers', 'total_questions')
+
+
+def record_test_completion(test):
+    """
+    Add a completed attempt to its user's profile totals.
+
+    One UPDATE with F() increments, so concurrent completions never lose
+    each other's counts; the profile is created on first completion. The
+    caller must run this once per attempt, in the completion transaction.
+    """
+    increment_profile_stats(
+        test.user_id,
+        total_points=test.earned_points,
+        tests_attempted=1,
+        correct_answers=test.correct_answers,
+        total_questions=test.total_questions,
+    )
+
+
+def increment_profile_stats(user_id, **increments):
+    """Apply F() increments to a user's profile, creating it if missing"""
+    if _increment_profile(user_id, increments):
+        return
+    try:
+        with transaction.atomic():
+            UserProfile.objects.create(user_id=user_id, **increments)
+    except IntegrityError:
+        # A concurrent request created the profile first
+        _increment_profile(user_id, increments)
+
+
+def _increment_profile(user_id, increments):
+    # updated_at moves too, so the profile ETag changes with the stats
+    return UserProfile.objects.filter(user_id=user_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + value for field, value in increments.items()}
+    )
+
+
+def profile_stats_from_history(user_ids):
+    """
+    Return {user_id: {stat: value}} recomputed from completed attempts,
+    with total_points summed from the points ledger.
+    """
+    rows = (
+        TestAttempt.objects.filter(user_id__in=user_ids, is_completed=True)
+        .values('user_id')
+        .annotate(
+            tests_attempted=Count('id'),
+            correct_answers=Sum('correct_answers'),
+            total_questions=Sum('total_questions'),
+        )
+    )
+    balances = dict(
+        PointsLedgerEntry.objects.filter(user_id__in=user_ids)
+        .values('user_id')
+        .annotate(total=Sum('points'))
+        .values_list('user_id', 'total')
+    )
+    stats = {user_id: dict.fromkeys(STAT_FIELDS, 0) for user_id in user_ids}
+    for row in rows:
+        user_id = row.pop('user_id')
+        stats[user_id].update({field: value or 0 for field, value in row.items()})
+    for user_id, total in balances.items():
+        stats[user_id]['total_points'] = total or 0
+    return stats
+
+
+def reconcile_profile_stats(user_ids, dry_run=False):
+    """
+    Rebuild the totals for a batch of users from TestAttempt history.
+
+    Returns the number of profiles whose stored totals had drifted (missing
+    profiles count as drifted and are created). Each batch is one
+    transaction that locks the profiles it rewrites.
+    """
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        profiles = {
+            profile.user_id: profile
+            for profile in UserProfile.objects.select_for_update().filter(user_id__in=user_ids)
+        }
+        expected = profile_stats_from_history(user_ids)
+        now = timezone.now()
+        drifted = []
+        missing = []
+        for user_id, stats in expected.items():
+            profile = profiles.get(user_id)
+            if profile is None:
+                missing.append(UserProfile(user_id=user_id, **stats))
+            elif any(getattr(profile, field) != value for field, value in stats.items()):
+                for field, value in stats.items():
+                    setattr(profile, field, value)
+                profile.updated_at = now
+                drifted.append(profile)
+        if not dry_run:
+            UserProfile.objects.bulk_update(drifted, STAT_FIELDS + ('updated_at',))
+            UserProfile.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(drifted) + len(missing)
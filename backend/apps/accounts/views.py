@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
+from apps.core.conditional import conditional
 from .serializers import (
     SignupSerializer,
     LoginSerializer,
@@ -62,6 +63,17 @@ class LoginView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def profile_validators(request):
+    """Validate the profile by the latest profile / user update"""
+    profile_updated_at = UserProfile.objects.filter(
+        user=request.user
+    ).values_list('updated_at', flat=True).first()
+    if profile_updated_at is None:
+        return None
+    updated_at = max(profile_updated_at, request.user.updated_at)
+    return updated_at, updated_at
+
+
 class UserProfileView(APIView):
     """
     User profile endpoint for GET and PUT operations.
@@ -77,6 +89,7 @@ class UserProfileView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    @conditional('accounts.profile', profile_validators)
     def get(self, request):
         """
         Retrieve current user's profile with all details.
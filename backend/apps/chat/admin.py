@@ -4,6 +4,6 @@ from .models import Message
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('sender', 'recipient', 'created_at', 'is_read')
-    search_fields = ('sender__username', 'recipient__username')
+    search_fields = ('sender__email', 'recipient__email')
     list_filter = ('is_read', 'created_at')
 
@@ -77,7 +77,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                     'type': 'chat_message',
                     'message': message_text,
                     'sender_id': self.sender_id,
-                    'sender_username': self.user.username,
+                    'sender_username': self.user.email,
                     'timestamp': self.get_current_timestamp()
                 }
             )
@@ -24,4 +24,4 @@ class Message(models.Model):
         ]
     
     def __str__(self):
-        return f'{self.sender.username} -> {self.recipient.username}: {self.text[:50]}'
+        return f'{self.sender.email} -> {self.recipient.email}: {self.text[:50]}'
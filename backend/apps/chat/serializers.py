@@ -5,6 +5,8 @@ from .models import Message
 User = get_user_model()
 
 class UserSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='email', read_only=True)
+    
     class Meta:
         model = User
         fields = ('id', 'username', 'email')
@@ -13,7 +13,7 @@ class ChatHistoryView(APIView):
         messages = Message.objects.filter(
             Q(sender_id=request.user.id, recipient_id=friend_id) |
             Q(sender_id=friend_id, recipient_id=request.user.id)
-        ).order_by('created_at')
+        ).select_related('sender', 'recipient').order_by('created_at')
         
         serializer = MessageSerializer(messages, many=True)
         return Response(serializer.data)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.db import connection, connections
+
+
+# ============================================================================
+# BENCHMARK HELPERS - Shared by the bench_* management commands
+# ============================================================================
+@contextmanager
+def benchmark_database(verbosity=0):
+    """
+    Run the enclosed block against a throwaway test database.
+
+    SQLite test databases default to in-memory, which cannot be shared
+    between threads, so a temporary file is used instead. This also keeps
+    lock contention realistic for concurrency benchmarks.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_name = connection.settings_dict['NAME']
+    old_test_name = test_settings.get('NAME')
+    tmp_path = None
+
+    if connection.vendor == 'sqlite' and not old_test_name:
+        fd, tmp_path = tempfile.mkstemp(prefix='bench_', suffix='.sqlite3')
+        os.close(fd)
+        test_settings['NAME'] = tmp_path
+
+    connection.creation.create_test_db(
+        verbosity=verbosity,
+        autoclobber=True,
+        serialize=False,
+    )
+    try:
+        yield connection
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        test_settings['NAME'] = old_test_name
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile (0-100) of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def latency_summary(samples):
+    """Summarize latency samples (seconds) as milliseconds"""
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 2),
+        'p95_ms': round(percentile(samples, 95) * 1000, 2),
+        'p99_ms': round(percentile(samples, 99) * 1000, 2),
+        'max_ms': round(max(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+def run_concurrently(func, args_list, workers):
+    """
+    Call func(*args) for each args tuple on a thread pool.
+
+    Returns (wall_seconds, latencies, errors). Each worker thread closes its
+    own DB connection when done so the test database can be destroyed.
+    """
+    def timed(args):
+        start = time.perf_counter()
+        try:
+            func(*args)
+            return time.perf_counter() - start, None
+        except Exception as exc:
+            return time.perf_counter() - start, exc
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(timed, args_list))
+    wall = time.perf_counter() - started
+
+    latencies = [elapsed for elapsed, error in results if error is None]
+    errors = [error for _, error in results if error is not None]
+    return wall, latencies, errors
@@ -0,0 +1,107 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .metrics import metrics
+from .models import ResourceVersion
+
+
+# ============================================================================
+# VERSION COUNTERS - Cheap shared validators for derived resources
+# ============================================================================
+def get_version(name):
+    """
+    Get the current version of a named resource (one primary key read).
+
+    A missing counter is seeded from the clock, so it never repeats a value
+    a client may still hold.
+    """
+    version = ResourceVersion.objects.filter(name=name).values_list('version', flat=True).first()
+    if version is None:
+        counter, _ = ResourceVersion.objects.get_or_create(
+            name=name, defaults={'version': time.time_ns()}
+        )
+        version = counter.version
+    return version
+
+
+def bump_version(name):
+    """Mark a named resource as changed (visible once the caller commits)"""
+    if not ResourceVersion.objects.filter(name=name).update(version=F('version') + 1):
+        # Not seeded yet; any fresh seed differs from what clients hold
+        ResourceVersion.objects.get_or_create(name=name, defaults={'version': time.time_ns()})
+
+
+# ============================================================================
+# CONDITIONAL RESPONSES - ETag / Last-Modified for APIView GET handlers
+# ============================================================================
+def conditional(endpoint, validator):
+    """
+    Decorate an APIView (or ViewSet) GET handler with conditional responses.
+
+    `validator(request, *args, **kwargs)` runs before the handler and returns
+    (version, last_modified): `version` is any value that changes whenever
+    the response body would (a version counter, a (count, max updated_at)
+    tuple, ...) and `last_modified` is a datetime or None. It must be much
+    cheaper than the handler, typically one indexed aggregate or a cache
+    read. Returning None (e.g. the object does not exist) skips conditional
+    handling, so the handler produces its usual response.
+
+    The ETag also covers the user, the full path (query string included) and
+    the negotiated renderer, so one validator serves every page and format.
+    Hits (304 Not Modified) and misses are counted under
+    `http.conditional.<endpoint>` in the metrics registry.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            validators = validator(request, *args, **kwargs)
+            if validators is None:
+                return handler(view, request, *args, **kwargs)
+
+            version, modified = validators
+            etag_value = _build_etag(request, version)
+            modified_timestamp = int(modified.timestamp()) if modified else None
+
+            not_modified = get_conditional_response(
+                request,
+                etag=etag_value,
+                last_modified=modified_timestamp,
+            )
+            if not_modified is not None:
+                if not_modified.status_code == 304:
+                    metrics.incr(f'http.conditional.{endpoint}.hit')
+                    _set_validators(not_modified, etag_value, modified_timestamp)
+                return not_modified
+
+            metrics.incr(f'http.conditional.{endpoint}.miss')
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                _set_validators(response, etag_value, modified_timestamp)
+            return response
+        return wrapper
+    return decorator
+
+
+def _set_validators(response, etag_value, modified_timestamp):
+    if etag_value:
+        response['ETag'] = etag_value
+    if modified_timestamp is not None:
+        response['Last-Modified'] = http_date(modified_timestamp)
+    # Validators are per user; shared caches must revalidate
+    response['Cache-Control'] = 'private, no-cache'
+
+
+def _build_etag(request, version):
+    renderer = getattr(request, 'accepted_renderer', None)
+    raw = ':'.join([
+        str(request.user.pk),
+        request.get_full_path(),
+        getattr(renderer, 'format', ''),
+        repr(version),
+    ])
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
@@ -0,0 +1,435 @@
+import asyncio
+import html
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from channels.testing import HttpCommunicator, WebsocketCommunicator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from apps.core.benchmark import benchmark_database, latency_summary
+from apps.quiz.models import Question, QuestionOption
+from apps.quiz.question_counts import reconcile_question_counts
+
+PASSWORD = 'load-test-pass-123'
+IN_MEMORY_CHANNEL_LAYERS = {
+    'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'},
+}
+
+
+class FlowError(Exception):
+    """A simulated user got an unexpected response and abandoned its flow"""
+
+
+# ============================================================================
+# DB INSTRUMENTATION - Query time and lock waits across every connection
+# ============================================================================
+class QueryTimer:
+    """
+    Times every statement on every connection opened while installed.
+
+    Django runs each request's sync code on its own asgiref thread, which
+    opens its own connection, so the wrapper is attached from
+    connection_created rather than with connection.execute_wrapper() on the
+    current thread. On SQLite, waits for a lock happen inside the statement
+    (in the busy handler), so contention shows up as inflated query time.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.write_seconds = 0.0
+        self.lock_errors = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except Exception as exc:
+            if 'locked' in str(exc) or 'deadlock' in str(exc):
+                with self._lock:
+                    self.lock_errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.queries += 1
+                self.seconds += elapsed
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    self.write_seconds += elapsed
+
+    def attach(self, sender, connection, **kwargs):
+        # The wrapper list outlives reconnects of the same DatabaseWrapper
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def install(self):
+        connection_created.connect(self.attach)
+
+    def uninstall(self):
+        connection_created.disconnect(self.attach)
+
+
+class LockWaitSampler(threading.Thread):
+    """
+    Samples backends blocked on a lock (PostgreSQL pg_stat_activity) and
+    integrates them into total lock-wait seconds.
+
+    SQLite does not expose lock waits (they happen inside its busy
+    handler); see QueryTimer.write_seconds and lock_errors instead.
+    """
+
+    QUERY = (
+        "SELECT count(*) FROM pg_stat_activity "
+        "WHERE datname = current_database() AND wait_event_type = 'Lock' "
+        "AND pid <> pg_backend_pid()"
+    )
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.seconds = 0.0
+        self.peak_waiters = 0
+        self._stop_event = threading.Event()
+
+    @property
+    def supported(self):
+        return connection.vendor == 'postgresql'
+
+    def run(self):
+        try:
+            with connections['default'].cursor() as cursor:
+                while not self._stop_event.wait(self.interval):
+                    cursor.execute(self.QUERY)
+                    waiters = cursor.fetchone()[0]
+                    self.seconds += waiters * self.interval
+                    self.peak_waiters = max(self.peak_waiters, waiters)
+        finally:
+            connections['default'].close()
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+
+# ============================================================================
+# SIMULATED USERS - Drive the ASGI application directly, no sockets
+# ============================================================================
+class LoadGenerator:
+    """
+    Runs simulated users against the ASGI application in one event loop.
+
+    Users run in pairs: both take a full quiz, then one befriends the other
+    and they exchange messages over the chat websocket.
+    """
+
+    def __init__(self, application, difficulty, messages, timeout):
+        self.application = application
+        self.difficulty = difficulty
+        self.messages = messages
+        self.timeout = timeout
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+        self.completed_flows = 0
+
+    async def request(self, name, method, path, token=None, data=None, expect=(200, 201)):
+        body = json.dumps(data).encode() if data is not None else b''
+        headers = [
+            (b'host', b'testserver'),
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ]
+        if token:
+            headers.append((b'authorization', f'Bearer {token}'.encode()))
+
+        communicator = HttpCommunicator(self.application, method, path, body=body, headers=headers)
+        started = time.perf_counter()
+        try:
+            response = await communicator.get_response(timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.statuses[name]['timeout'] += 1
+            raise FlowError(f'{name} timed out')
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][response['status']] += 1
+
+        if response['status'] not in expect:
+            raise FlowError(f'{name} returned {response["status"]}{self._error_detail(response)}')
+        return json.loads(response['body']) if response['body'] else None
+
+    @staticmethod
+    def _error_detail(response):
+        """A short reason for a failed response: API error or exception name"""
+        body = response['body'].decode(errors='replace')
+        title = re.search(r'<title>\s*(\w+)', body)
+        if title:
+            # DEBUG error page: report 'ExceptionType: message', not the path
+            value = re.search(r'<pre class="exception_value">(.*?)</pre>', body, re.DOTALL)
+            message = html.unescape(value.group(1)).strip() if value else ''
+            return f' ({title.group(1)}: {message})'
+        return f' ({body[:120]})' if body else ''
+
+    async def quiz_flow(self, number):
+        """signup -> login -> start -> answer each question -> complete -> results"""
+        email = f'load{number}@example.com'
+        signup = await self.request('auth.signup', 'POST', '/api/auth/signup/', data={
+            'email': email,
+            'first_name': 'Load',
+            'last_name': f'User{number}',
+            'password': PASSWORD,
+            'password_confirm': PASSWORD,
+        })
+        login = await self.request('auth.login', 'POST', '/api/auth/login/', data={
+            'email': email,
+            'password': PASSWORD,
+        })
+        token = login['access']
+
+        session = await self.request(
+            'quiz.start', 'POST', '/api/quiz/start/', token, {'difficulty': self.difficulty}
+        )
+        test_id = session['id']
+        for question in session['questions']:
+            option = random.choice(question['options'])
+            await self.request(
+                'quiz.answer', 'POST', f'/api/quiz/test/{test_id}/answer/', token,
+                {'question_id': question['id'], 'option_id': option['id']}
+            )
+        await self.request('quiz.complete', 'POST', f'/api/quiz/test/{test_id}/complete/', token, {})
+        await self.request('quiz.results', 'GET', f'/api/quiz/test/{test_id}/results/', token)
+        self.completed_flows += 1
+        return signup['user']['id'], token
+
+    async def chat_flow(self, first, second):
+        """Befriend, connect both websockets and trade messages"""
+        (first_id, first_token), (second_id, second_token) = first, second
+        friend_request = await self.request(
+            'friends.send_request', 'POST', f'/api/friends/request/{second_id}/', first_token, {}
+        )
+        await self.request(
+            'friends.accept_request', 'POST',
+            f'/api/friends/request/{friend_request["id"]}/accept/', second_token, {}
+        )
+
+        sockets = [
+            await self.connect(f'/ws/chat/{second_id}/?token={first_token}'),
+            await self.connect(f'/ws/chat/{first_id}/?token={second_token}'),
+        ]
+        try:
+            for index in range(self.messages):
+                sender, receiver = sockets[index % 2], sockets[1 - index % 2]
+                started = time.perf_counter()
+                await sender.send_to(text_data=json.dumps({'message': f'Message {index}'}))
+                # Both ends are in the room group; the receiver's copy marks delivery
+                await receiver.receive_from(timeout=self.timeout)
+                self.latencies['ws.message'].append(time.perf_counter() - started)
+                await sender.receive_from(timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.statuses['ws.message']['timeout'] += 1
+            raise FlowError('ws.message timed out')
+        finally:
+            for socket in sockets:
+                await socket.disconnect()
+
+    async def connect(self, path):
+        communicator = WebsocketCommunicator(self.application, path)
+        started = time.perf_counter()
+        try:
+            connected, _ = await communicator.connect(timeout=self.timeout)
+            if connected:
+                greeting = json.loads(await communicator.receive_from(timeout=self.timeout))
+                connected = greeting.get('type') == 'connection_established'
+        except asyncio.TimeoutError:
+            self.statuses['ws.connect']['timeout'] += 1
+            raise FlowError('ws.connect timed out')
+        self.latencies['ws.connect'].append(time.perf_counter() - started)
+        self.statuses['ws.connect']['accepted' if connected else 'rejected'] += 1
+        if not connected:
+            raise FlowError('ws.connect was rejected')
+        return communicator
+
+    async def pair(self, number, semaphore):
+        async with semaphore:
+            users = await asyncio.gather(
+                self.quiz_flow(number * 2),
+                self.quiz_flow(number * 2 + 1),
+                return_exceptions=True,
+            )
+            failures = [user for user in users if isinstance(user, Exception)]
+            for failure in failures:
+                self.errors[self._describe(failure)] += 1
+            if failures or not self.messages:
+                return
+            try:
+                await self.chat_flow(*users)
+            except Exception as exc:
+                self.errors[self._describe(exc)] += 1
+
+    @staticmethod
+    def _describe(exc):
+        return str(exc) if isinstance(exc, FlowError) else f'{type(exc).__name__}: {exc}'
+
+    async def run(self, users, concurrency):
+        semaphore = asyncio.Semaphore(max(1, concurrency // 2))
+        await asyncio.gather(*(self.pair(number, semaphore) for number in range(users // 2)))
+
+
+# ============================================================================
+# COMMAND
+# ============================================================================
+class Command(BaseCommand):
+    help = 'Load-test the ASGI application in-process with simulated quiz takers and chat users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Simulated users (run in pairs)')
+        parser.add_argument('--concurrency', type=int, default=200, help='Users in flight at once')
+        parser.add_argument('--difficulty', default='medium', choices=('easy', 'medium', 'hard'))
+        parser.add_argument('--questions', type=int, default=300, help='Question bank size per difficulty')
+        parser.add_argument('--messages', type=int, default=4, help='Chat messages per pair (0 skips chat)')
+        parser.add_argument('--timeout', type=float, default=60.0, help='Per-request timeout in seconds')
+        parser.add_argument(
+            '--fast-hashing', action='store_true',
+            help='Use a cheap password hasher so signup/login do not dominate'
+        )
+        parser.add_argument(
+            '--redis-channel-layer', action='store_true',
+            help='Use the configured channel layer instead of an in-memory one'
+        )
+        parser.add_argument('--lock-sample-interval', type=float, default=0.05,
+                            help='Seconds between lock-wait samples (PostgreSQL)')
+        parser.add_argument('--report', help='Write a JSON report to this path')
+
+    def handle(self, *args, **options):
+        overrides = {}
+        if not options['redis_channel_layer']:
+            overrides['CHANNEL_LAYERS'] = IN_MEMORY_CHANNEL_LAYERS
+        if options['fast_hashing']:
+            overrides['PASSWORD_HASHERS'] = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+        # Lets requests for 'testserver' through ALLOWED_HOSTS
+        setup_test_environment()
+        try:
+            with override_settings(**overrides), benchmark_database():
+                self._seed(options['questions'])
+                report = self._run(options)
+        finally:
+            teardown_test_environment()
+
+        self._print(report)
+        if options['report']:
+            with open(options['report'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+            self.stdout.write(f'Report written to {options["report"]}')
+
+        if report['failures']:
+            for error, count in sorted(report['errors'].items(), key=lambda item: -item[1]):
+                self.stderr.write(f'{count:>6}  {error}')
+            raise CommandError(f'{report["failures"]} simulated users failed')
+
+    def _seed(self, bank_size):
+        questions = Question.objects.bulk_create([
+            Question(text=f'Load question {i}', difficulty=difficulty)
+            for difficulty in ('easy', 'medium', 'hard')
+            for i in range(bank_size)
+        ])
+        QuestionOption.objects.bulk_create([
+            QuestionOption(question=question, text=f'Option {order}', order=order, is_correct=order == 0)
+            for question in questions
+            for order in range(4)
+        ])
+        reconcile_question_counts()
+        # Sync views run on another thread; release this one's connection
+        connection.close()
+
+    def _run(self, options):
+        from config.asgi import application
+
+        generator = LoadGenerator(
+            application, options['difficulty'], options['messages'], options['timeout']
+        )
+        timer = QueryTimer()
+        sampler = LockWaitSampler(options['lock_sample_interval'])
+
+        self.stdout.write(
+            f'Running {options["users"]} users, {options["concurrency"]} in flight, '
+            f'against config.asgi.application ({connection.vendor})...'
+        )
+        # Failed requests are summarized at the end instead of logged one by one
+        request_logger = logging.getLogger('django.request')
+        log_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        timer.install()
+        if sampler.supported:
+            sampler.start()
+        started = time.perf_counter()
+        try:
+            asyncio.run(generator.run(options['users'], options['concurrency']))
+        finally:
+            wall = time.perf_counter() - started
+            sampler.stop()
+            timer.uninstall()
+            request_logger.setLevel(log_level)
+
+        endpoints = []
+        for name, samples in generator.latencies.items():
+            endpoints.append({
+                'name': name,
+                'throughput_per_sec': round(len(samples) / wall, 2) if wall else 0.0,
+                'latency': latency_summary(samples),
+                'statuses': {str(code): count for code, count in generator.statuses[name].items()},
+            })
+        requests = sum(len(samples) for samples in generator.latencies.values())
+        pairs = options['users'] // 2
+        return {
+            'database': connection.vendor,
+            'users': pairs * 2,
+            'concurrency': options['concurrency'],
+            'wall_seconds': round(wall, 2),
+            'completed_flows': generator.completed_flows,
+            'failures': sum(generator.errors.values()),
+            'flows_per_sec': round(generator.completed_flows / wall, 2) if wall else 0.0,
+            'requests_per_sec': round(requests / wall, 2) if wall else 0.0,
+            'db': {
+                'queries': timer.queries,
+                'query_seconds': round(timer.seconds, 3),
+                'write_seconds': round(timer.write_seconds, 3),
+                'lock_wait_seconds': round(sampler.seconds, 3) if sampler.supported else None,
+                'peak_lock_waiters': sampler.peak_waiters if sampler.supported else None,
+                'lock_errors': timer.lock_errors,
+            },
+            'endpoints': endpoints,
+            'errors': dict(generator.errors),
+        }
+
+    def _print(self, report):
+        self.stdout.write(f'{"endpoint":<24} {"count":>7} {"req/s":>9} {"p50":>9} {"p95":>9} {"p99":>9}')
+        for endpoint in report['endpoints']:
+            latency = endpoint['latency']
+            self.stdout.write(
+                f'{endpoint["name"]:<24} {latency["count"]:>7} {endpoint["throughput_per_sec"]:>9.1f} '
+                f'{latency["p50_ms"]:>7.1f}ms {latency["p95_ms"]:>7.1f}ms {latency["p99_ms"]:>7.1f}ms'
+            )
+
+        db = report['db']
+        lock_wait = (
+            f'{db["lock_wait_seconds"]}s (peak {db["peak_lock_waiters"]} waiters)'
+            if db['lock_wait_seconds'] is not None else 'not exposed by this backend'
+        )
+        self.stdout.write(
+            f'{report["completed_flows"]}/{report["users"]} quiz flows in {report["wall_seconds"]}s: '
+            f'{report["flows_per_sec"]} flows/sec, {report["requests_per_sec"]} requests/sec'
+        )
+        self.stdout.write(
+            f'DB: {db["queries"]} queries, {db["query_seconds"]}s query time '
+            f'({db["write_seconds"]}s writing), '
+            f'lock wait {lock_wait}, {db["lock_errors"]} lock errors'
+        )
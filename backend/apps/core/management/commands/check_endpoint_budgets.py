@@ -0,0 +1,436 @@
+import itertools
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User, UserProfile
+from apps.chat.models import Message
+from apps.core.benchmark import benchmark_database, latency_summary
+from apps.friends.models import FriendRequest
+from apps.quiz.models import Question, QuestionOption, TestAttempt, TestResponse
+from apps.quiz.search import rebuild_search_index
+from apps.quiz.services import complete_test, provision_test
+from apps.rewards.leaderboard import snapshot_leaderboard
+from apps.rewards.models import Badge, Reward, UserBadge
+
+SCALES = {
+    'small': 1000,
+    'large': 100000,
+}
+PASSWORD = 'budget-pass-123'
+# Listed in QUIZ_CONTENT_EDITOR_EMAILS while the budgets run
+EDITOR_EMAIL = 'editor@example.com'
+
+
+# ============================================================================
+# FIXTURES - Scalable seed data plus fresh per-iteration state
+# ============================================================================
+class Fixture:
+    """
+    Seeds a dataset of a given size and hands out fresh users, attempts and
+    friend requests so mutating endpoints can be measured repeatedly.
+    """
+
+    def __init__(self, user_count, attempts_per_user):
+        self.user_count = user_count
+        self.attempts_per_user = attempts_per_user
+        self._sequence = itertools.count()
+
+    def seed(self):
+        now = timezone.now()
+        User.objects.bulk_create([
+            User(email=f'seed{i}@example.com', first_name=f'Seed{i}', password='!')
+            for i in range(self.user_count)
+        ], batch_size=5000)
+        user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+        UserProfile.objects.bulk_create([
+            UserProfile(user_id=user_id, total_points=random.randint(0, 5000))
+            for user_id in user_ids
+        ], batch_size=5000)
+
+        questions = Question.objects.bulk_create([
+            Question(text=f'Budget question {i}', difficulty=difficulty)
+            for difficulty in ('easy', 'medium', 'hard')
+            for i in range(100)
+        ])
+        QuestionOption.objects.bulk_create([
+            QuestionOption(question=question, text=f'Option {order}', order=order, is_correct=order == 0)
+            for question in questions
+            for order in range(4)
+        ])
+        rebuild_search_index()
+        self.question_ids = {
+            difficulty: list(
+                Question.objects.filter(difficulty=difficulty).values_list('id', flat=True)
+            )
+            for difficulty in ('easy', 'medium', 'hard')
+        }
+
+        TestAttempt.objects.bulk_create([
+            TestAttempt(
+                user_id=user_id,
+                difficulty='medium',
+                total_questions=15,
+                answered_questions=15,
+                correct_answers=10,
+                incorrect_answers=5,
+                total_score=40,
+                max_score=60,
+                percentage=66.67,
+                earned_points=40,
+                is_completed=True,
+                completed_at=now - timedelta(minutes=random.randint(1, 10 ** 5)),
+            )
+            for user_id in user_ids
+            for _ in range(self.attempts_per_user)
+        ], batch_size=5000)
+
+        FriendRequest.objects.bulk_create([
+            FriendRequest(
+                sender_id=user_id,
+                receiver_id=user_ids[(index + offset) % len(user_ids)],
+                status=FriendRequest.ACCEPTED if offset < 3 else FriendRequest.PENDING,
+            )
+            for index, user_id in enumerate(user_ids)
+            for offset in range(1, 5)
+        ], batch_size=5000)
+
+        Reward.objects.bulk_create([
+            Reward(name=name, min_points=points, description=f'{name} tier')
+            for name, points in [
+                ('bronze', 100), ('silver', 500), ('gold', 1000),
+                ('platinum', 2500), ('diamond', 5000),
+            ]
+        ])
+        badge = Badge.objects.create(name='Starter', description='First test', icon='star')
+        snapshot_leaderboard(size=100)
+        UserBadge.objects.bulk_create([UserBadge(user_id=user_ids[0], badge=badge)])
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        # A fully connected user for the read endpoints
+        self.user = self.new_user(friends=5, messages=20, attempts=self.attempts_per_user)
+        # The friend the messages were sent to, so chat history is non-empty
+        self.friend = User.objects.get(id=Message.objects.filter(
+            sender=self.user
+        ).values_list('recipient_id', flat=True).first())
+        self.completed_test = self.new_attempt(self.user, completed=True)
+        # A content editor for the question bank endpoints
+        self.editor = User(email=EDITOR_EMAIL, first_name='Editor')
+        self.editor.set_unusable_password()
+        self.editor.save()
+        # A staff user for the operational endpoints
+        self.staff = User(email='staff@example.com', first_name='Staff', is_staff=True)
+        self.staff.set_unusable_password()
+        self.staff.save()
+
+    def new_user(self, friends=0, messages=0, attempts=0, password=None):
+        """Create a user (with profile) that no other iteration touches"""
+        n = next(self._sequence)
+        user = User(email=f'probe{n}@example.com', first_name='Probe', last_name=str(n))
+        if password:
+            user.set_password(password)
+        else:
+            user.set_unusable_password()
+        user.save()
+        UserProfile.objects.create(user=user)
+
+        friend_ids = random.sample(range(1, self.user_count + 1), friends)
+        FriendRequest.objects.bulk_create([
+            FriendRequest(sender=user, receiver_id=friend_id, status=FriendRequest.ACCEPTED)
+            for friend_id in friend_ids
+        ])
+        Message.objects.bulk_create([
+            Message(sender=user, recipient_id=friend_ids[0], text=f'Message {i}')
+            for i in range(messages)
+        ] if friend_ids else [])
+        for _ in range(attempts):
+            self.new_attempt(user, completed=True)
+        return user
+
+    def new_attempt(self, user, completed=False):
+        """Provision (and optionally complete) a test with every question answered"""
+        test = provision_test(user, 'medium', random.sample(self.question_ids['medium'], 15))
+        if completed:
+            TestResponse.objects.filter(attempt=test).update(is_unanswered=False)
+            complete_test(test)
+        return test
+
+    def first_question(self, test):
+        """Return (question_id, option_id) for a question in the test"""
+        return QuestionOption.objects.filter(
+            question__testresponse__attempt=test
+        ).values_list('question_id', 'id').first()
+
+    def pending_request_to(self, receiver):
+        sender = self.new_user()
+        return FriendRequest.objects.create(sender=sender, receiver=receiver)
+
+
+# ============================================================================
+# ENDPOINT BUDGETS
+# ============================================================================
+# Each setup(fixture) runs untimed before every call and returns
+# (user or None, path, data). Budgets: max queries per call, p95 latency.
+def _read(path, user='user'):
+    return lambda fx: (getattr(fx, user), path.format(fx=fx), None)
+
+
+def _signup(fx):
+    n = next(fx._sequence)
+    return None, '/api/auth/signup/', {
+        'email': f'signup{n}@example.com',
+        'first_name': 'Budget',
+        'last_name': 'User',
+        'password': PASSWORD,
+        'password_confirm': PASSWORD,
+    }
+
+
+def _login(fx):
+    user = fx.new_user(password=PASSWORD)
+    return None, '/api/auth/login/', {'email': user.email, 'password': PASSWORD}
+
+
+def _refresh(fx):
+    return None, '/api/auth/token/refresh/', {'refresh': str(RefreshToken.for_user(fx.user))}
+
+
+def _start(fx):
+    return fx.new_user(), '/api/quiz/start/', {'difficulty': 'medium'}
+
+
+def _session(fx):
+    user = fx.new_user()
+    test = fx.new_attempt(user)
+    return user, f'/api/quiz/test/{test.id}/', None
+
+
+def _active(fx):
+    user = fx.new_user()
+    fx.new_attempt(user)
+    return user, '/api/quiz/active-test/', None
+
+
+def _answer(fx):
+    user = fx.new_user()
+    test = fx.new_attempt(user)
+    question_id, option_id = fx.first_question(test)
+    return user, f'/api/quiz/test/{test.id}/answer/', {
+        'question_id': question_id, 'option_id': option_id,
+    }
+
+
+def _answers(fx):
+    user = fx.new_user()
+    test = fx.new_attempt(user)
+    answers = [
+        {'question_id': question_id, 'option_id': option_id}
+        for question_id, option_id in QuestionOption.objects.filter(
+            question__testresponse__attempt=test, order=0
+        ).values_list('question_id', 'id')
+    ]
+    return user, f'/api/quiz/test/{test.id}/answers/', {'answers': answers, 'complete': True}
+
+
+def _complete(fx):
+    user = fx.new_user()
+    test = fx.new_attempt(user)
+    TestResponse.objects.filter(attempt=test).update(is_unanswered=False)
+    return user, f'/api/quiz/test/{test.id}/complete/', {}
+
+
+def _send_request(fx):
+    return fx.new_user(), f'/api/friends/request/{fx.user.id}/', {}
+
+
+def _accept_request(fx):
+    friend_request = fx.pending_request_to(fx.user)
+    return fx.user, f'/api/friends/request/{friend_request.id}/accept/', {}
+
+
+def _reject_request(fx):
+    friend_request = fx.pending_request_to(fx.user)
+    return fx.user, f'/api/friends/request/{friend_request.id}/reject/', {}
+
+
+def _remove_friend(fx):
+    user = fx.new_user(friends=1)
+    friend_id = FriendRequest.objects.filter(sender=user).values_list('receiver_id', flat=True).first()
+    return user, f'/api/friends/remove/{friend_id}/', {}
+
+
+ENDPOINTS = [
+    # name, method, setup, max queries, p95 ms
+    ('auth.signup', 'post', _signup, 8, 1500),
+    ('auth.login', 'post', _login, 4, 1500),
+    ('auth.token_refresh', 'post', _refresh, 2, 100),
+    ('auth.me', 'get', _read('/api/auth/me/'), 1, 50),
+    ('auth.profile', 'get', _read('/api/auth/profile/'), 4, 50),
+    ('auth.profile_update', 'put', lambda fx: (fx.user, '/api/auth/profile/', {'bio': 'Budget'}), 6, 250),
+    ('quiz.questions', 'get', _read('/api/quiz/questions/'), 2, 50),
+    ('quiz.questions_export', 'get', _read('/api/quiz/questions/export/?difficulty=medium', user='editor'), 3, 200),
+    ('quiz.questions_search', 'get', _read('/api/quiz/questions/search/?q=budget+question+42', user='editor'), 5, 100),
+    ('quiz.start', 'post', _start, 12, 200),
+    ('quiz.active_test', 'get', _active, 3, 50),
+    ('quiz.test_session', 'get', _session, 7, 100),
+    ('quiz.answer', 'post', _answer, 4, 50),
+    ('quiz.answers_batch', 'post', _answers, 19, 200),
+    ('quiz.complete', 'post', _complete, 13, 200),
+    ('quiz.results', 'get', _read('/api/quiz/test/{fx.completed_test.id}/results/'), 2, 50),
+    ('quiz.summary', 'get', _read('/api/quiz/test/{fx.completed_test.id}/summary/'), 2, 50),
+    ('quiz.history', 'get', _read('/api/quiz/history/'), 3, 50),
+    ('quiz.history_stats', 'get', _read('/api/quiz/history/stats/'), 3, 50),
+    ('quiz.history_export', 'get', _read('/api/quiz/history/?export=json'), 3, 100),
+    ('friends.search', 'get', _read('/api/friends/search/?q=seed12'), 2, 500),
+    ('friends.send_request', 'post', _send_request, 5, 100),
+    ('friends.accept_request', 'post', _accept_request, 7, 100),
+    ('friends.reject_request', 'post', _reject_request, 4, 100),
+    ('friends.pending_requests', 'get', _read('/api/friends/requests/'), 2, 50),
+    ('friends.list', 'get', _read('/api/friends/list/'), 3, 50),
+    ('friends.leaderboard', 'get', _read('/api/friends/leaderboard/'), 2, 50),
+    ('friends.remove', 'post', _remove_friend, 5, 50),
+    ('friends.chat_room', 'get', _read('/api/friends/chat/{fx.friend.id}/'), 5, 50),
+    ('chat.history', 'get', _read('/api/chat/history/{fx.friend.id}/'), 2, 50),
+    ('rewards.list', 'get', _read('/api/rewards/'), 4, 50),
+    ('rewards.user_rewards', 'get', _read('/api/rewards/user-rewards/'), 6, 50),
+    ('rewards.points_history', 'get', _read('/api/rewards/points-history/'), 2, 50),
+    ('rewards.check_and_award', 'post', lambda fx: (fx.user, '/api/rewards/check-and-award/', {}), 12, 100),
+    ('rewards.leaderboard', 'get', _read('/api/rewards/leaderboard/'), 2, 50),
+    ('rewards.leaderboard_me', 'get', _read('/api/rewards/leaderboard/me/'), 2, 50),
+    ('rewards.user_badges', 'get', lambda fx: (fx.user, '/api/rewards/user/1/badges/', None), 2, 50),
+    ('metrics', 'get', _read('/api/metrics/', user='staff'), 1, 50),
+]
+
+
+class Command(BaseCommand):
+    help = 'Check every REST endpoint against its query-count and p95 latency budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small', help='Seeded users (1k or 100k)')
+        parser.add_argument('--users', type=int, help='Override the number of seeded users')
+        parser.add_argument('--attempts', type=int, default=3, help='Completed attempts per user')
+        parser.add_argument('--iterations', type=int, default=20, help='Measured calls per endpoint')
+        parser.add_argument('--only', help='Comma-separated endpoint name prefixes to run')
+        parser.add_argument('--report', help='Write a JSON report to this path')
+
+    def handle(self, *args, **options):
+        user_count = options['users'] or SCALES[options['scale']]
+        endpoints = ENDPOINTS
+        if options['only']:
+            prefixes = tuple(options['only'].split(','))
+            endpoints = [endpoint for endpoint in ENDPOINTS if endpoint[0].startswith(prefixes)]
+
+        # Lets the test client through ALLOWED_HOSTS, as under the test runner
+        setup_test_environment()
+        try:
+            with override_settings(QUIZ_CONTENT_EDITOR_EMAILS=[EDITOR_EMAIL]):
+                results = self._run(user_count, endpoints, options)
+        finally:
+            teardown_test_environment()
+
+        report = {
+            'database': connection.vendor,
+            'users': user_count,
+            'attempts_per_user': options['attempts'],
+            'iterations': options['iterations'],
+            'endpoints': results,
+        }
+        if options['report']:
+            with open(options['report'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+            self.stdout.write(f'Report written to {options["report"]}')
+
+        failed = [result['name'] for result in results if not result['passed']]
+        if failed:
+            raise CommandError(f'{len(failed)} endpoints over budget: {", ".join(failed)}')
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} endpoints within budget'))
+
+    def _run(self, user_count, endpoints, options):
+        with benchmark_database():
+            return self.check_budgets(
+                user_count, endpoints, options['attempts'], options['iterations']
+            )
+
+    def check_budgets(self, user_count, endpoints, attempts, iterations):
+        """Seed the current database and measure each endpoint against its budget"""
+        fixture = Fixture(user_count, attempts)
+        self.stdout.write(f'Seeding {user_count} users...')
+        started = time.perf_counter()
+        fixture.seed()
+        self.stdout.write(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+        return [
+            self._measure(fixture, *endpoint, iterations=iterations)
+            for endpoint in endpoints
+        ]
+
+    def _measure(self, fixture, name, method, setup, max_queries, p95_budget_ms, iterations):
+        client = APIClient(raise_request_exception=False)
+        cache.clear()
+
+        query_counts = []
+        latencies = []
+        statuses = set()
+        # The first call warms caches and is not measured
+        for iteration in range(iterations + 1):
+            user, path, data = setup(fixture)
+            client.credentials()
+            if user is not None:
+                token = RefreshToken.for_user(user).access_token
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+            # The query log is a bounded deque; once full, captures read as empty
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, data, format='json' if data is not None else None)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = time.perf_counter() - started
+
+            statuses.add(response.status_code)
+            if iteration:
+                query_counts.append(len(queries.captured_queries))
+                latencies.append(elapsed)
+
+        latency = latency_summary(latencies)
+        failures = []
+        if max(query_counts) > max_queries:
+            failures.append(f'{max(query_counts)} queries > {max_queries}')
+        if latency['p95_ms'] > p95_budget_ms:
+            failures.append(f'p95 {latency["p95_ms"]}ms > {p95_budget_ms}ms')
+        errors = sorted(code for code in statuses if code >= 400)
+        if errors:
+            failures.append(f'status {errors}')
+
+        label = self.style.SUCCESS('ok') if not failures else self.style.ERROR('; '.join(failures))
+        self.stdout.write(
+            f'{name:<26} {max(query_counts):>3}q  p95 {latency["p95_ms"]:>8.2f}ms  {label}'
+        )
+        return {
+            'name': name,
+            'method': method.upper(),
+            'queries': {'min': min(query_counts), 'max': max(query_counts)},
+            'budget_queries': max_queries,
+            'latency': latency,
+            'budget_p95_ms': p95_budget_ms,
+            'status_codes': sorted(statuses),
+            'passed': not failures,
+            'failures': failures,
+        }
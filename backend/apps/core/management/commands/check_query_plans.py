@@ -0,0 +1,195 @@
+import random
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.chat.models import Message
+from apps.core.benchmark import benchmark_database
+from apps.friends.models import FriendRequest
+from apps.quiz.models import TestAttempt
+from apps.quiz.services import attempt_expiry_cutoff
+
+
+# ============================================================================
+# HOT QUERIES - Each must be answered through an index, never a table scan
+# ============================================================================
+# (name, build(user, other) -> queryset, backends where a scan is expected)
+HOT_QUERIES = [
+    (
+        'active_attempt',
+        lambda user, other: TestAttempt.objects.filter(user=user, is_completed=False)[:1],
+        (),
+    ),
+    (
+        'test_history_page',
+        lambda user, other: TestAttempt.objects.filter(
+            user=user, is_completed=True
+        ).order_by('-completed_at', '-id')[:21],
+        (),
+    ),
+    (
+        'expired_attempt_sweep',
+        lambda user, other: TestAttempt.objects.filter(
+            is_completed=False, started_at__lt=attempt_expiry_cutoff()
+        ).order_by('started_at')[:200],
+        (),
+    ),
+    (
+        'chat_history',
+        lambda user, other: Message.objects.filter(
+            Q(sender_id=user.id, recipient_id=other.id) |
+            Q(sender_id=other.id, recipient_id=user.id)
+        ).order_by('created_at'),
+        (),
+    ),
+    (
+        'friend_request_between',
+        lambda user, other: FriendRequest.objects.filter(
+            Q(sender=user, receiver=other) | Q(sender=other, receiver=user)
+        ).exclude(status=FriendRequest.REJECTED)[:1],
+        (),
+    ),
+    (
+        'friends_of_user',
+        lambda user, other: FriendRequest.objects.filter(
+            Q(sender=user) | Q(receiver=user),
+            status=FriendRequest.ACCEPTED
+        ),
+        (),
+    ),
+    (
+        'pending_requests',
+        lambda user, other: FriendRequest.objects.filter(
+            receiver=user, status=FriendRequest.PENDING
+        ),
+        (),
+    ),
+    (
+        # '%term%' cannot use a B-tree; PostgreSQL uses the pg_trgm indexes
+        'user_search',
+        lambda user, other: User.objects.filter(
+            Q(email__icontains='user12') |
+            Q(first_name__icontains='user12') |
+            Q(last_name__icontains='user12')
+        ).exclude(id=user.id)[:20],
+        ('sqlite',),
+    ),
+]
+
+SCAN_PATTERNS = {
+    # "SCAN table" is a full table scan, "SCAN table USING [COVERING] INDEX"
+    # a full index walk; both read every row
+    'sqlite': re.compile(r'\bSCAN (?!CONSTANT ROW)(?!\()(\w+)'),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Fail if any hot ORM query plans a table scan on a large seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20000, help='Users to seed')
+        parser.add_argument('--attempts', type=int, default=5, help='Test attempts per user')
+        parser.add_argument('--friends', type=int, default=4, help='Friend requests sent per user')
+        parser.add_argument('--messages', type=int, default=10, help='Messages per friend pair')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SCAN_PATTERNS:
+            raise CommandError(f'Plan checks are not supported on {connection.vendor}')
+
+        with benchmark_database():
+            failures = self.check_plans(**options)
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot queries scan a table: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All hot queries use indexes'))
+
+    def check_plans(self, verbose_plans=False, **options):
+        """Seed the current database and return the hot queries that scan"""
+        self._seed(options)
+        return self._check(verbose_plans)
+
+    def _seed(self, options):
+        user_count = options['users']
+        self.stdout.write(f'Seeding {user_count} users...')
+
+        User.objects.bulk_create([
+            User(email=f'user{i}@example.com', first_name=f'User{i}', password='!')
+            for i in range(user_count)
+        ], batch_size=5000)
+        user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+
+        now = timezone.now()
+        attempts = []
+        for user_id in user_ids:
+            for n in range(options['attempts']):
+                # Every 10th user has an attempt in progress, some abandoned
+                active = n == 0 and user_id % 10 == 0
+                attempts.append(TestAttempt(
+                    user_id=user_id,
+                    difficulty=random.choice(['easy', 'medium', 'hard']),
+                    total_questions=15,
+                    is_completed=not active,
+                    completed_at=None if active else now - timedelta(minutes=random.randint(1, 10 ** 5)),
+                ))
+        TestAttempt.objects.bulk_create(attempts, batch_size=5000)
+        TestAttempt.objects.filter(is_completed=False, user_id__lt=user_ids[len(user_ids) // 2]).update(
+            started_at=now - timedelta(days=1)
+        )
+
+        statuses = [FriendRequest.ACCEPTED, FriendRequest.ACCEPTED, FriendRequest.PENDING, FriendRequest.REJECTED]
+        requests = []
+        for index, user_id in enumerate(user_ids):
+            for offset in range(1, options['friends'] + 1):
+                requests.append(FriendRequest(
+                    sender_id=user_id,
+                    receiver_id=user_ids[(index + offset) % len(user_ids)],
+                    status=random.choice(statuses),
+                ))
+        FriendRequest.objects.bulk_create(requests, batch_size=5000)
+
+        messages = []
+        for sender_id, recipient_id in FriendRequest.objects.filter(
+            status=FriendRequest.ACCEPTED
+        ).values_list('sender_id', 'receiver_id'):
+            for n in range(options['messages']):
+                if n % 2:
+                    sender_id, recipient_id = recipient_id, sender_id
+                messages.append(Message(sender_id=sender_id, recipient_id=recipient_id, text='hi'))
+        Message.objects.bulk_create(messages, batch_size=5000)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(
+            f'Seeded {len(attempts)} attempts, {len(requests)} friend requests, '
+            f'{len(messages)} messages'
+        )
+
+    def _check(self, verbose):
+        pattern = SCAN_PATTERNS[connection.vendor]
+        users = list(User.objects.order_by('id')[User.objects.count() // 2:][:2])
+        user, other = users[0], users[1]
+
+        failures = []
+        for name, build, scan_expected_on in HOT_QUERIES:
+            plan = build(user, other).explain()
+            scans = sorted(set(pattern.findall(plan)))
+            if scans and connection.vendor in scan_expected_on:
+                label = self.style.WARNING('SCAN (expected on this backend)')
+            elif scans:
+                label = self.style.ERROR(f'SCAN {", ".join(scans)}')
+                failures.append(name)
+            else:
+                label = self.style.SUCCESS('ok')
+
+            self.stdout.write(f'{name:<24} {label}')
+            if verbose or (scans and name in failures):
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+        return failures
@@ -0,0 +1,76 @@
+import threading
+from collections import defaultdict
+
+
+# ============================================================================
+# METRICS REGISTRY - In-process counters and gauges shared by all apps
+# ============================================================================
+class MetricsRegistry:
+    """
+    Thread-safe in-process metrics store.
+
+    Counters only ever go up (hits, misses, refreshes); gauges hold the
+    latest observed value (pool sizes). Counters named '<prefix>.hit' and
+    '<prefix>.miss' are paired up into a hit rate in the snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._gauges = {}
+
+    def incr(self, name, value=1):
+        """Increment a counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name, value):
+        """Record the current value of a gauge"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name):
+        """Get the current value of a counter (or gauge)"""
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name]
+            return self._gauges.get(name, 0)
+
+    def hit_rate(self, prefix):
+        """Return hits / (hits + misses) for a prefix, or None if unused"""
+        hits = self.get(f'{prefix}.hit')
+        misses = self.get(f'{prefix}.miss')
+        total = hits + misses
+        return round(hits / total, 4) if total else None
+
+    def snapshot(self):
+        """Return a copy of all metrics with derived hit rates"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        prefixes = {
+            name.rsplit('.', 1)[0]
+            for name in counters
+            if name.endswith('.hit') or name.endswith('.miss')
+        }
+        hit_rates = {}
+        for prefix in sorted(prefixes):
+            hits = counters.get(f'{prefix}.hit', 0)
+            misses = counters.get(f'{prefix}.miss', 0)
+            hit_rates[prefix] = round(hits / (hits + misses), 4)
+
+        return {
+            'counters': counters,
+            'gauges': gauges,
+            'hit_rates': hit_rates,
+        }
+
+    def reset(self):
+        """Clear all metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = MetricsRegistry()
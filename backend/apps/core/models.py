@@ -0,0 +1,22 @@
+from django.db import models
+
+
+# ============================================================================
+# RESOURCE VERSION MODEL - Shared version counters (see conditional.py)
+# ============================================================================
+class ResourceVersion(models.Model):
+    """
+    Version counter of a named derived resource, bumped whenever it changes.
+
+    Kept in the database rather than the cache so every process and worker
+    sees the same value, and a cache eviction or restart never resets it.
+    """
+    
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField()
+    
+    class Meta:
+        db_table = 'core_resource_version'
+    
+    def __str__(self):
+        return f"{self.name}: {self.version}"
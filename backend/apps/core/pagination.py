@@ -0,0 +1,85 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# ============================================================================
+# KEYSET PAGINATION - Seek-based paging on a (timestamp, id) pair
+# ============================================================================
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset ("seek") pagination on a descending (timestamp, id)
+    pair, e.g. ('completed_at', 'id').
+
+    Each page is `WHERE (ts, id) < (last_ts, last_id) ORDER BY ts DESC,
+    id DESC LIMIT n`, which is an index range scan with a matching index no
+    matter how deep the client pages, unlike OFFSET.
+    """
+    timestamp_field = 'created_at'
+    id_field = 'id'
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, timestamp, pk):
+        # isoformat() keeps microseconds; DjangoJSONEncoder would truncate them
+        raw = json.dumps([timestamp.isoformat(), pk])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            timestamp, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            timestamp = parse_datetime(timestamp)
+            if timestamp is None:
+                raise ValueError
+            return timestamp, int(pk)
+        except (TypeError, ValueError, json.JSONDecodeError):
+            raise NotFound('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        ts, pk = self.timestamp_field, self.id_field
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            last_ts, last_pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{f'{ts}__lt': last_ts}) | Q(**{ts: last_ts, f'{pk}__lt': last_pk})
+            )
+
+        rows = list(queryset.order_by(f'-{ts}', f'-{pk}')[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = rows[-1]
+            self.next_cursor = self.encode_cursor(getattr(last, ts), getattr(last, pk))
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -0,0 +1,45 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# ============================================================================
+# STREAMING WRITERS - Generator-based JSON / JSONL / CSV responses
+# ============================================================================
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def iter_json_array(rows):
+    """Yield a JSON array one row at a time"""
+    yield '['
+    for index, row in enumerate(rows):
+        yield (',' if index else '') + json.dumps(row, cls=JSONEncoder)
+    yield ']'
+
+
+def iter_jsonl(rows):
+    """Yield one JSON document per line"""
+    for row in rows:
+        yield json.dumps(row, cls=JSONEncoder) + '\n'
+
+
+def iter_csv(fieldnames, rows):
+    """Yield CSV lines (header first) for dict rows"""
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames, extrasaction='ignore')
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def streaming_response(chunks, content_type, filename=None):
+    """Wrap a chunk generator in a StreamingHttpResponse"""
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
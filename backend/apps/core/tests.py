@@ -0,0 +1,53 @@
+from io import StringIO
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from .management.commands.check_endpoint_budgets import (
+    EDITOR_EMAIL,
+    ENDPOINTS,
+    Command as EndpointBudgetCommand,
+)
+from .management.commands.check_query_plans import SCAN_PATTERNS, Command as QueryPlanCommand
+
+
+# ============================================================================
+# QUERY PLANS - The check_query_plans assertions, run by manage.py test
+# ============================================================================
+class HotQueryPlanTests(TestCase):
+    """Every hot ORM query is answered through an index"""
+
+    def test_hot_queries_use_indexes(self):
+        if connection.vendor not in SCAN_PATTERNS:
+            self.skipTest(f'Plan checks are not supported on {connection.vendor}')
+
+        failures = QueryPlanCommand(stdout=StringIO()).check_plans(
+            users=2000, attempts=5, friends=4, messages=2
+        )
+
+        self.assertEqual(failures, [])
+
+
+# ============================================================================
+# ENDPOINT BUDGETS - The check_endpoint_budgets query budgets, per endpoint
+# ============================================================================
+@override_settings(QUIZ_CONTENT_EDITOR_EMAILS=[EDITOR_EMAIL])
+class EndpointQueryBudgetTests(TransactionTestCase):
+    """
+    Every endpoint succeeds within its query budget. A TransactionTestCase,
+    so atomic blocks are real transactions rather than counted savepoints.
+    Latency budgets are left to the command, run against a realistic dataset.
+    """
+
+    def test_endpoints_within_query_budget(self):
+        results = EndpointBudgetCommand(stdout=StringIO()).check_budgets(
+            user_count=200, endpoints=ENDPOINTS, attempts=2, iterations=3
+        )
+
+        for result in results:
+            with self.subTest(endpoint=result['name']):
+                self.assertLessEqual(result['queries']['max'], result['budget_queries'])
+                self.assertFalse(
+                    [code for code in result['status_codes'] if code >= 400],
+                    f'{result["name"]} returned {result["status_codes"]}',
+                )
@@ -0,0 +1,23 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from .metrics import metrics
+
+
+class MetricsView(APIView):
+    """
+    Expose cache and pool metrics to staff users.
+
+    Counters live in process memory, so each response covers only the
+    worker that served it; sum across workers for deployment totals.
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        """
+        Get metrics snapshot
+        
+        Returns: {'counters': {...}, 'gauges': {...}, 'hit_rates': {...}}
+        """
+        return Response(metrics.snapshot(), status=status.HTTP_200_OK)
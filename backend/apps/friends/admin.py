@@ -4,11 +4,11 @@ from .models import FriendRequest, ChatRoom
 @admin.register(FriendRequest)
 class FriendRequestAdmin(admin.ModelAdmin):
     list_display = ('sender', 'receiver', 'status', 'created_at')
-    search_fields = ('sender__username', 'receiver__username')
+    search_fields = ('sender__email', 'receiver__email')
     list_filter = ('status', 'created_at')
 
 @admin.register(ChatRoom)
 class ChatRoomAdmin(admin.ModelAdmin):
     list_display = ('user1', 'user2', 'created_at')
-    search_fields = ('user1__username', 'user2__username')
+    search_fields = ('user1__email', 'user2__email')
 
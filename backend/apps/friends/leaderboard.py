@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+
+from apps.core.metrics import metrics
+from .models import FriendRequest
+
+User = get_user_model()
+
+
+# ============================================================================
+# FRIENDS LEADERBOARD - Rank among accepted friends, cached per user
+# ============================================================================
+# Two cache entries per user: their ranked friends leaderboard and their
+# friend ids (the adjacency set). Accepting or removing a friendship drops
+# both for the two users (signals.py); a points grant drops the leaderboard
+# of the user and of everyone in their adjacency set (apps.rewards.ledger).
+def _leaderboard_key(user_id):
+    return f'friends:leaderboard:{user_id}'
+
+
+def _friend_ids_key(user_id):
+    return f'friends:ids:{user_id}'
+
+
+def _accepted_friend_ids(user_id):
+    """Subqueries for both directions of an accepted friendship"""
+    sent = FriendRequest.objects.filter(
+        sender_id=user_id, status=FriendRequest.ACCEPTED
+    ).order_by().values('receiver_id')
+    received = FriendRequest.objects.filter(
+        receiver_id=user_id, status=FriendRequest.ACCEPTED
+    ).order_by().values('sender_id')
+    return sent, received
+
+
+def get_friend_ids(user_id):
+    """The user's accepted friends as a cached set of user ids"""
+    key = _friend_ids_key(user_id)
+    friend_ids = cache.get(key)
+    if friend_ids is None:
+        sent, received = _accepted_friend_ids(user_id)
+        friend_ids = set(sent.values_list('receiver_id', flat=True).union(
+            received.values_list('sender_id', flat=True)
+        ))
+        cache.set(key, friend_ids, timeout=settings.FRIENDS_LEADERBOARD_CACHE_TIMEOUT)
+    return friend_ids
+
+
+def build_friends_leaderboard(user_id):
+    """
+    Rank the user and their accepted friends by points.
+
+    One query: the friend set is resolved by subqueries on the indexed
+    (sender, status) / (receiver, status) pairs and joined to the profiles,
+    sorted by the database. Equal points share a rank (1, 2, 2, 4).
+    """
+    sent, received = _accepted_friend_ids(user_id)
+    rows = (
+        User.objects.filter(Q(id=user_id) | Q(id__in=sent) | Q(id__in=received))
+        .annotate(points=Coalesce('profile__total_points', 0))
+        .order_by('-points', 'id')
+        .values_list('id', 'email', 'points')
+    )
+
+    results = []
+    previous = None
+    for position, (friend_id, email, points) in enumerate(rows, 1):
+        if points != previous:
+            rank = position
+        results.append({
+            'rank': rank,
+            'user_id': friend_id,
+            'username': email,
+            'total_points': points,
+            'is_me': friend_id == user_id,
+        })
+        previous = points
+
+    me = next(entry for entry in results if entry['is_me'])
+    return {'rank': me['rank'], 'total_points': me['total_points'], 'results': results}
+
+
+def get_friends_leaderboard(user_id):
+    """The user's friends leaderboard from the cache, building it on a miss"""
+    key = _leaderboard_key(user_id)
+    leaderboard = cache.get(key)
+    if leaderboard is not None:
+        metrics.incr('friends.leaderboard.hit')
+        return leaderboard
+
+    metrics.incr('friends.leaderboard.miss')
+    leaderboard = build_friends_leaderboard(user_id)
+    cache.set(key, leaderboard, timeout=settings.FRIENDS_LEADERBOARD_CACHE_TIMEOUT)
+    return leaderboard
+
+
+# ============================================================================
+# INVALIDATION
+# ============================================================================
+def invalidate_friendship(*user_ids):
+    """Forget the adjacency sets and leaderboards of both sides of a friendship"""
+    cache.delete_many(
+        [_friend_ids_key(user_id) for user_id in user_ids]
+        + [_leaderboard_key(user_id) for user_id in user_ids]
+    )
+
+
+def invalidate_points(user_id):
+    """A user's points changed: drop every leaderboard that lists them"""
+    user_ids = get_friend_ids(user_id) | {user_id}
+    cache.delete_many([_leaderboard_key(friend_id) for friend_id in user_ids])
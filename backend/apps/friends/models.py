@@ -34,9 +34,14 @@ class FriendRequest(models.Model):
     class Meta:
         unique_together = ('sender', 'receiver')
         ordering = ['-created_at']
+        indexes = [
+            # Each side of the Q(sender=user) | Q(receiver=user) filters
+            models.Index(fields=['sender', 'status']),
+            models.Index(fields=['receiver', 'status']),
+        ]
     
     def __str__(self):
-        return f'{self.sender.username} -> {self.receiver.username} ({self.status})'
+        return f'{self.sender.email} -> {self.receiver.email} ({self.status})'
     
     def accept(self):
         self.status = self.ACCEPTED
@@ -66,7 +71,7 @@ class ChatRoom(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f'ChatRoom: {self.user1.username} - {self.user2.username}'
+        return f'ChatRoom: {self.user1.email} - {self.user2.email}'
     
     @staticmethod
     def get_or_create_room(user1, user2):
@@ -74,4 +79,6 @@ class ChatRoom(models.Model):
         if user1.id > user2.id:
             user1, user2 = user2, user1
         room, created = ChatRoom.objects.get_or_create(user1=user1, user2=user2)
+        # Reuse the loaded users rather than refetching them on access
+        room.user1, room.user2 = user1, user2
         return room
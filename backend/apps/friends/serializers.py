@@ -7,6 +7,8 @@ User = get_user_model()
 
 class UserSearchSerializer(serializers.ModelSerializer):
     """Simple user serializer for search results"""
+    username = serializers.CharField(source='email', read_only=True)
+    
     class Meta:
         model = User
         fields = ('id', 'username', 'email')
@@ -14,6 +16,7 @@ class UserSearchSerializer(serializers.ModelSerializer):
 
 class UserDetailSerializer(serializers.ModelSerializer):
     """User details with profile info"""
+    username = serializers.CharField(source='email', read_only=True)
     total_points = serializers.SerializerMethodField()
     
     class Meta:
@@ -23,7 +26,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
     def get_total_points(self, obj):
         # Assumes user has profile with total_points
         try:
-            return obj.userprofile.total_points
+            return obj.profile.total_points
         except:
             return 0
 
@@ -31,8 +34,8 @@ class UserDetailSerializer(serializers.ModelSerializer):
 class FriendRequestSerializer(serializers.ModelSerializer):
     sender = UserSearchSerializer(read_only=True)
     receiver = UserSearchSerializer(read_only=True)
-    sender_username = serializers.CharField(source='sender.username', read_only=True)
-    receiver_username = serializers.CharField(source='receiver.username', read_only=True)
+    sender_username = serializers.CharField(source='sender.email', read_only=True)
+    receiver_username = serializers.CharField(source='receiver.email', read_only=True)
     
     class Meta:
         model = FriendRequest
@@ -58,6 +61,22 @@ class FriendSerializer(serializers.Serializer):
     friend_request_id = serializers.IntegerField()  # ID of accepted friend request
 
 
+class FriendsLeaderboardEntrySerializer(serializers.Serializer):
+    """One ranked user on a friends leaderboard"""
+    rank = serializers.IntegerField()
+    user_id = serializers.IntegerField()
+    username = serializers.CharField()
+    total_points = serializers.IntegerField()
+    is_me = serializers.BooleanField()
+
+
+class FriendsLeaderboardSerializer(serializers.Serializer):
+    """The current user's rank among friends plus the ranked list"""
+    rank = serializers.IntegerField()
+    total_points = serializers.IntegerField()
+    results = FriendsLeaderboardEntrySerializer(many=True)
+
+
 class ChatRoomSerializer(serializers.ModelSerializer):
     user1 = UserSearchSerializer()
     user2 = UserSearchSerializer()
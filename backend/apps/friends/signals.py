@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .leaderboard import invalidate_friendship
+from .models import FriendRequest
+
+
+# ============================================================================
+# FRIENDS LEADERBOARD SYNC - Drop cached friend sets on friendship changes
+# ============================================================================
+@receiver(post_save, sender=FriendRequest)
+@receiver(post_delete, sender=FriendRequest)
+def invalidate_friends_on_friendship_change(sender, instance, **kwargs):
+    """An accepted request was saved (accepted) or deleted (friend removed)"""
+    if instance.status != FriendRequest.ACCEPTED:
+        return
+    transaction.on_commit(
+        lambda: invalidate_friendship(instance.sender_id, instance.receiver_id)
+    )
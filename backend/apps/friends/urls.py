@@ -6,6 +6,7 @@ from .views import (
     RejectFriendRequestView,
     PendingRequestsView,
     FriendsListView,
+    FriendsLeaderboardView,
     RemoveFriendView,
     GetChatRoomView,
 )
@@ -22,6 +23,7 @@ urlpatterns = [
     
     # Friends
     path('list/', FriendsListView.as_view(), name='friends-list'),
+    path('leaderboard/', FriendsLeaderboardView.as_view(), name='friends-leaderboard'),
     path('remove/<int:friend_id>/', RemoveFriendView.as_view(), name='remove-friend'),
     
     # Chat
@@ -3,9 +3,12 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import Count, Max, Q
+from apps.core.conditional import conditional
+from .leaderboard import get_friends_leaderboard
 from .models import FriendRequest, ChatRoom
 from .serializers import (
+    FriendsLeaderboardSerializer,
     FriendRequestSerializer,
     UserSearchSerializer,
     FriendSerializer,
@@ -16,7 +19,7 @@ User = get_user_model()
 
 
 class SearchUsersView(APIView):
-    """Search users by username or email"""
+    """Search users by email or name"""
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -30,7 +33,9 @@ class SearchUsersView(APIView):
         
         # Search users excluding current user
         users = User.objects.filter(
-            Q(username__icontains=query) | Q(email__icontains=query)
+            Q(email__icontains=query) |
+            Q(first_name__icontains=query) |
+            Q(last_name__icontains=query)
         ).exclude(id=request.user.id).distinct()[:20]
         
         serializer = UserSearchSerializer(users, many=True)
@@ -86,7 +91,7 @@ class AcceptFriendRequestView(APIView):
     
     def post(self, request, request_id):
         try:
-            friend_request = FriendRequest.objects.get(
+            friend_request = FriendRequest.objects.select_related('sender', 'receiver').get(
                 id=request_id,
                 receiver=request.user,
                 status=FriendRequest.PENDING
@@ -112,7 +117,7 @@ class RejectFriendRequestView(APIView):
     
     def post(self, request, request_id):
         try:
-            friend_request = FriendRequest.objects.get(
+            friend_request = FriendRequest.objects.select_related('sender', 'receiver').get(
                 id=request_id,
                 receiver=request.user,
                 status=FriendRequest.PENDING
@@ -136,36 +141,70 @@ class PendingRequestsView(APIView):
         pending = FriendRequest.objects.filter(
             receiver=request.user,
             status=FriendRequest.PENDING
-        )
+        ).select_related('sender', 'receiver')
         serializer = FriendRequestSerializer(pending, many=True)
         return Response(serializer.data)
 
 
+def friends_list_validators(request):
+    """
+    Validate the friends list by its accepted requests and the latest
+    profile update on either side (friends' points are listed too).
+    """
+    state = FriendRequest.objects.filter(
+        Q(sender=request.user) | Q(receiver=request.user),
+        status=FriendRequest.ACCEPTED
+    ).aggregate(
+        count=Count('id'),
+        changed=Max('updated_at'),
+        sender_profile=Max('sender__profile__updated_at'),
+        receiver_profile=Max('receiver__profile__updated_at'),
+    )
+    timestamps = [value for key, value in state.items() if key != 'count' and value]
+    return tuple(state.values()), max(timestamps, default=None)
+
+
 class FriendsListView(APIView):
     """List all friends of the current user"""
     permission_classes = [IsAuthenticated]
     
+    @conditional('friends.list', friends_list_validators)
     def get(self, request):
         # Get all accepted friend requests involving current user
         friend_requests = FriendRequest.objects.filter(
             Q(sender=request.user) | Q(receiver=request.user),
             status=FriendRequest.ACCEPTED
-        )
+        ).select_related('sender__profile', 'receiver__profile')
         
         friends = []
         for fr in friend_requests:
-            friend = fr.receiver if fr.sender == request.user else fr.sender
+            friend = fr.receiver if fr.sender_id == request.user.id else fr.sender
+            profile = getattr(friend, 'profile', None)
             friends.append({
                 'id': friend.id,
-                'username': friend.username,
+                'username': friend.email,
                 'email': friend.email,
-                'total_points': getattr(friend.userprofile, 'total_points', 0) if hasattr(friend, 'userprofile') else 0,
+                'total_points': profile.total_points if profile else 0,
                 'friend_request_id': fr.id
             })
         
         return Response(friends)
 
 
+class FriendsLeaderboardView(APIView):
+    """
+    Rank the current user among their accepted friends by points.
+    
+    Built with one query and cached per user until a friendship is
+    accepted or removed or anyone on it gains points.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        leaderboard = get_friends_leaderboard(request.user.id)
+        return Response(FriendsLeaderboardSerializer(leaderboard).data)
+
+
 class RemoveFriendView(APIView):
     """Remove a friend (reject the accepted request)"""
     permission_classes = [IsAuthenticated]
@@ -1,11 +1,21 @@
 from django.contrib import admin
-from .models import Question, QuestionOption, TestAttempt, TestResponse
+from .models import Question, QuestionOption, TestAttempt, TestResponse, PreparedPaper, TestResultSnapshot, QuestionCounter
+from .search import get_search_backend, search_question_ids
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
     list_display = ('text', 'difficulty', 'created_at')
     search_fields = ('text',)
     list_filter = ('difficulty', 'created_at')
+    # Best-ranked full-text hits the changelist is narrowed to
+    search_limit = 1000
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Use the full-text index instead of a LIKE scan over quiz_question"""
+        if not search_term or get_search_backend() is None:
+            return super().get_search_results(request, queryset, search_term)
+        hits = search_question_ids(search_term, limit=self.search_limit)
+        return queryset.filter(id__in=[question_id for question_id, _ in hits]), False
 
 @admin.register(QuestionOption)
 class QuestionOptionAdmin(admin.ModelAdmin):
@@ -15,7 +25,7 @@ class QuestionOptionAdmin(admin.ModelAdmin):
 @admin.register(TestAttempt)
 class TestAttemptAdmin(admin.ModelAdmin):
     list_display = ('user', 'difficulty', 'total_questions', 'is_completed')
-    search_fields = ('user__username',)
+    search_fields = ('user__email',)
     list_filter = ('is_completed', 'difficulty', 'started_at')
 
 @admin.register(TestResponse)
@@ -23,3 +33,16 @@ class TestResponseAdmin(admin.ModelAdmin):
     list_display = ('question', 'selected_option', 'is_correct')
     search_fields = ('question__text',)
 
+@admin.register(PreparedPaper)
+class PreparedPaperAdmin(admin.ModelAdmin):
+    list_display = ('id', 'difficulty', 'created_at')
+    list_filter = ('difficulty',)
+
+@admin.register(TestResultSnapshot)
+class TestResultSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('attempt', 'user', 'schema_version', 'created_at')
+    exclude = ('result', 'summary')
+
+@admin.register(QuestionCounter)
+class QuestionCounterAdmin(admin.ModelAdmin):
+    list_display = ('difficulty', 'count')
@@ -0,0 +1,199 @@
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from apps.core.metrics import metrics
+
+
+# ============================================================================
+# ANSWER BUFFER BACKENDS - Write-behind storage for in-progress answers
+# ============================================================================
+class LocMemAnswerBuffer:
+    """
+    In-process buffer for tests and single-process development.
+
+    Entries live in this worker's memory only and are lost on restart;
+    use RedisAnswerBuffer anywhere answers must survive a restart.
+    """
+
+    def __init__(self, **kwargs):
+        self._lock = threading.Lock()
+        self._answers = {}
+
+    def put(self, attempt_id, question_id, option_id, is_correct):
+        """Buffer an answer, replacing any earlier answer to the question"""
+        with self._lock:
+            self._answers.setdefault(attempt_id, {})[question_id] = (option_id, is_correct)
+
+    def restore(self, attempt_id, entries):
+        """Put back popped entries without overwriting newer answers"""
+        with self._lock:
+            answers = self._answers.setdefault(attempt_id, {})
+            for question_id, entry in entries.items():
+                answers.setdefault(question_id, entry)
+
+    def get(self, attempt_id):
+        """Return {question_id: (option_id, is_correct)} for an attempt"""
+        with self._lock:
+            return dict(self._answers.get(attempt_id, {}))
+
+    def pop(self, attempt_id):
+        """Atomically take and remove all buffered answers for an attempt"""
+        with self._lock:
+            return self._answers.pop(attempt_id, {})
+
+    def pending_attempts(self):
+        """Return ids of attempts with buffered answers"""
+        with self._lock:
+            return [attempt_id for attempt_id, answers in self._answers.items() if answers]
+
+
+class RedisAnswerBuffer:
+    """
+    Redis-backed buffer shared by all workers.
+
+    Each attempt is a hash (question_id -> "option_id:is_correct") and a set
+    tracks attempts with pending answers, so buffered answers survive worker
+    restarts and can be flushed by any process.
+    """
+
+    PENDING_KEY = 'quiz:answer_buffer:pending'
+
+    def __init__(self, url=None, **kwargs):
+        import redis
+
+        self._redis = redis.Redis.from_url(url or settings.QUIZ_ANSWER_BUFFER_URL)
+
+    def _key(self, attempt_id):
+        return f'quiz:answer_buffer:{attempt_id}'
+
+    @staticmethod
+    def _decode(raw):
+        return {
+            int(question_id): (int(value.split(b':')[0]), value.endswith(b':1'))
+            for question_id, value in raw.items()
+        }
+
+    def put(self, attempt_id, question_id, option_id, is_correct):
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key(attempt_id), question_id, f'{option_id}:{int(is_correct)}')
+        pipe.sadd(self.PENDING_KEY, attempt_id)
+        pipe.execute()
+
+    def restore(self, attempt_id, entries):
+        pipe = self._redis.pipeline()
+        for question_id, (option_id, is_correct) in entries.items():
+            pipe.hsetnx(self._key(attempt_id), question_id, f'{option_id}:{int(is_correct)}')
+        pipe.sadd(self.PENDING_KEY, attempt_id)
+        pipe.execute()
+
+    def get(self, attempt_id):
+        return self._decode(self._redis.hgetall(self._key(attempt_id)))
+
+    def pop(self, attempt_id):
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hgetall(self._key(attempt_id))
+        pipe.delete(self._key(attempt_id))
+        pipe.srem(self.PENDING_KEY, attempt_id)
+        raw, _, _ = pipe.execute()
+        return self._decode(raw)
+
+    def pending_attempts(self):
+        return [int(attempt_id) for attempt_id in self._redis.smembers(self.PENDING_KEY)]
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_answer_buffer():
+    """Return the configured buffer backend, or None when buffering is off"""
+    path = getattr(settings, 'QUIZ_ANSWER_BUFFER_BACKEND', None)
+    if not path:
+        return None
+    return _load_backend(path)
+
+
+# ============================================================================
+# FLUSHING
+# ============================================================================
+def flush_attempt(attempt_id, claimed=False):
+    """
+    Write an attempt's buffered answers to TestResponse in one bulk upsert.
+
+    The attempt is claimed first with a write (see services.claim_attempt),
+    the same serialization point complete_test uses, so answers are never
+    popped by one request while another is scoring without them. Callers
+    that already hold the claim (complete_test, a batch submission) pass
+    claimed=True.
+
+    Entries for questions that are no longer part of the attempt, or for an
+    attempt that is already completed or gone, are dropped. If the write
+    fails the entries are put back so a later flush can retry. Returns the
+    number of rows written.
+    """
+    from .services import claim_attempt
+
+    buffer = get_answer_buffer()
+    if buffer is None or not buffer.get(attempt_id):
+        return 0
+
+    # No savepoint: callers already in a transaction just extend it
+    with transaction.atomic(savepoint=False):
+        if not claimed and not claim_attempt(attempt_id):
+            dropped = buffer.pop(attempt_id)
+            metrics.incr('quiz.answer_buffer.dropped', len(dropped))
+            return 0
+
+        entries = buffer.pop(attempt_id)
+        if not entries:
+            return 0
+        return _write_entries(buffer, attempt_id, entries)
+
+
+def _write_entries(buffer, attempt_id, entries):
+    """Upsert popped entries, putting them back if the write fails"""
+    from .models import TestResponse
+
+    try:
+        existing = set(
+            TestResponse.objects.filter(
+                attempt_id=attempt_id,
+                question_id__in=entries.keys()
+            ).values_list('question_id', flat=True)
+        )
+        responses = [
+            TestResponse(
+                attempt_id=attempt_id,
+                question_id=question_id,
+                selected_option_id=option_id,
+                is_correct=is_correct,
+                is_unanswered=False,
+            )
+            for question_id, (option_id, is_correct) in entries.items()
+            if question_id in existing
+        ]
+        TestResponse.objects.bulk_create(
+            responses,
+            update_conflicts=True,
+            unique_fields=['attempt', 'question'],
+            update_fields=['selected_option', 'is_correct', 'is_unanswered'],
+        )
+    except Exception:
+        buffer.restore(attempt_id, entries)
+        raise
+
+    metrics.incr('quiz.answer_buffer.flushed', len(responses))
+    return len(responses)
+
+
+def flush_all():
+    """Flush every attempt with buffered answers; returns rows written"""
+    buffer = get_answer_buffer()
+    if buffer is None:
+        return 0
+    return sum(flush_attempt(attempt_id) for attempt_id in buffer.pending_attempts())
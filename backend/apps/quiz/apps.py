@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class QuizConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.quiz'
+    
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Question payloads and answer keys are cached for a day and invalidated
+    by deleting their keys, which a per-process cache only does in the
+    process that saved the question. Deployments need a shared cache.
+    """
+    if settings.CACHES['default']['BACKEND'] != PROCESS_LOCAL_CACHE:
+        return []
+    return [Error(
+        'The default cache is process-local, so question edits would leave '
+        'other workers serving stale question payloads and answer keys.',
+        hint='Set CACHE_BACKEND to a shared backend, e.g. '
+             'django.core.cache.backends.redis.RedisCache.',
+        id='quiz.E001',
+    )]
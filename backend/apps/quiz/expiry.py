@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import transaction
+
+from apps.core.metrics import metrics
+from .models import TestAttempt
+from .services import attempt_expiry_cutoff, complete_test
+
+
+# ============================================================================
+# ATTEMPT EXPIRY - Close attempts that ran past the time limit
+# ============================================================================
+EXPIRY_ACTIONS = ('complete', 'delete')
+
+
+def expire_attempt(test, action=None):
+    """Complete or delete one expired attempt per QUIZ_EXPIRED_ATTEMPT_ACTION"""
+    action = action or settings.QUIZ_EXPIRED_ATTEMPT_ACTION
+    if action == 'delete':
+        test.delete()
+        metrics.incr('quiz.attempt_expiry.deleted')
+    elif complete_test(test):
+        metrics.incr('quiz.attempt_expiry.completed')
+
+
+def expire_stale_attempts(batch_size=None, max_batches=None, action=None):
+    """
+    Expire every in-progress attempt past the time limit, batch by batch.
+
+    Each batch is its own transaction over at most batch_size attempts,
+    picked oldest first through the partial index on incomplete attempts,
+    so the sweep never reads completed history and never holds locks for
+    long. Rows a concurrent request has locked are skipped until the next
+    sweep (where the database supports SKIP LOCKED). Expired attempts drop
+    out of the index as they are handled, so no cursor is needed. Returns the number of
+    attempts expired.
+    """
+    batch_size = batch_size or settings.QUIZ_EXPIRY_BATCH_SIZE
+    action = action or settings.QUIZ_EXPIRED_ATTEMPT_ACTION
+    if action not in EXPIRY_ACTIONS:
+        raise ValueError(f'Unknown expiry action: {action}')
+
+    cutoff = attempt_expiry_cutoff()
+    expired = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            tests = list(
+                TestAttempt.objects.select_for_update(skip_locked=True, of=('self',))
+                .filter(is_completed=False, started_at__lt=cutoff)
+                .select_related('user')
+                .order_by('started_at')[:batch_size]
+            )
+            if not tests:
+                break
+
+            if action == 'delete':
+                TestAttempt.objects.filter(
+                    id__in=[test.id for test in tests],
+                    is_completed=False
+                ).delete()
+                metrics.incr('quiz.attempt_expiry.deleted', len(tests))
+            else:
+                for test in tests:
+                    complete_test(test)
+                metrics.incr('quiz.attempt_expiry.completed', len(tests))
+
+        expired += len(tests)
+        batches += 1
+
+    return expired
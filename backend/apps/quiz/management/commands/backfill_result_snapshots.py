@@ -0,0 +1,60 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.quiz.models import TestAttempt
+from apps.quiz.serializers import prefetch_test_results
+from apps.quiz.snapshots import SNAPSHOT_SCHEMA_VERSION, build_snapshot, save_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Build result snapshots for completed tests that have none (or an outdated one)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Attempts per chunk')
+        parser.add_argument('--workers', type=int, default=4, help='Chunks processed in parallel')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        attempt_ids = list(
+            TestAttempt.objects.filter(is_completed=True)
+            .exclude(result_snapshot__schema_version=SNAPSHOT_SCHEMA_VERSION)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        chunks = [
+            attempt_ids[start:start + chunk_size]
+            for start in range(0, len(attempt_ids), chunk_size)
+        ]
+        self.stdout.write(f'{len(attempt_ids)} attempts to snapshot in {len(chunks)} chunks')
+
+        started = time.perf_counter()
+        written = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(self._snapshot_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    written += future.result()
+                except Exception as exc:
+                    failed += len(chunk)
+                    self.stderr.write(f'Chunk {chunk[0]}-{chunk[-1]} failed: {exc}')
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} snapshots in {elapsed:.1f}s ({failed} failed)'
+        ))
+
+    def _snapshot_chunk(self, attempt_ids):
+        """Render and bulk-save snapshots for one chunk of attempts"""
+        try:
+            tests = list(TestAttempt.objects.filter(id__in=attempt_ids).select_related('user'))
+            prefetch_test_results(tests)
+            save_snapshots([build_snapshot(test)[0] for test in tests], replace_outdated=True)
+            return len(tests)
+        finally:
+            # Each worker thread has its own connection
+            connection.close()
@@ -0,0 +1,91 @@
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.core.benchmark import benchmark_database, latency_summary, run_concurrently
+from apps.quiz.models import Question, QuestionOption, TestResponse
+from apps.quiz.services import provision_test
+from apps.quiz.views import CompleteTestView
+
+
+class Command(BaseCommand):
+    help = 'Benchmark POST /api/quiz/test/<id>/complete/ latency under concurrent completions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Concurrent completions')
+        parser.add_argument('--questions', type=int, default=200, help='Question bank size')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self._run(options['users'], options['questions'])
+
+    def _seed(self, user_count, bank_size):
+        question_count = settings.QUIZ_QUESTIONS_PER_TEST
+        questions = Question.objects.bulk_create([
+            Question(text=f'Benchmark question {i}', difficulty='medium')
+            for i in range(bank_size)
+        ])
+        QuestionOption.objects.bulk_create([
+            QuestionOption(question=question, text=f'Option {order}', order=order, is_correct=order == 0)
+            for question in questions
+            for order in range(4)
+        ])
+        options = {}
+        for question_id, option_id, is_correct in QuestionOption.objects.values_list(
+            'question_id', 'id', 'is_correct'
+        ):
+            options.setdefault(question_id, []).append((option_id, is_correct))
+
+        User.objects.bulk_create([
+            User(email=f'bench{i}@example.com') for i in range(user_count)
+        ])
+        question_ids = list(options)
+        attempts = []
+        for user in User.objects.all():
+            attempt = provision_test(user, 'medium', random.sample(question_ids, question_count))
+            attempts.append((user, attempt.id))
+
+        # Answer most questions so scoring has something to count
+        responses = list(TestResponse.objects.all())
+        for response in responses:
+            if random.random() < 0.8:
+                option_id, is_correct = random.choice(options[response.question_id])
+                response.selected_option_id = option_id
+                response.is_correct = is_correct
+                response.is_unanswered = False
+        TestResponse.objects.bulk_update(
+            responses, ['selected_option', 'is_correct', 'is_unanswered'], batch_size=1000
+        )
+        return attempts
+
+    def _run(self, user_count, bank_size):
+        attempts = self._seed(user_count, bank_size)
+        factory = APIRequestFactory()
+        view = CompleteTestView.as_view()
+
+        def complete(user, attempt_id):
+            request = factory.post(f'/api/quiz/test/{attempt_id}/complete/', {}, format='json')
+            force_authenticate(request, user=user)
+            response = view(request, test_id=attempt_id)
+            assert response.status_code == 200, response.data
+
+        # Query count for a single completion
+        user, attempt_id = attempts.pop()
+        with CaptureQueriesContext(connection) as ctx:
+            complete(user, attempt_id)
+        query_count = len(ctx.captured_queries)
+
+        wall, latencies, errors = run_concurrently(complete, attempts, workers=len(attempts))
+        summary = latency_summary(latencies)
+        self.stdout.write(
+            f'{len(latencies)} completions in {wall:.2f}s | '
+            f'p50 {summary["p50_ms"]}ms p99 {summary["p99_ms"]}ms | '
+            f'{query_count} queries per completion | errors {len(errors)}'
+        )
+        for error in {repr(error) for error in errors}:
+            self.stdout.write(f'  error: {error}')
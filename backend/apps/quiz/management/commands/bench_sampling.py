@@ -0,0 +1,69 @@
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from apps.core.benchmark import benchmark_database, latency_summary
+from apps.quiz.models import Question
+from apps.quiz.question_pool import QuestionPool
+from apps.quiz.sampling import RandomKeySampler
+
+
+class Command(BaseCommand):
+    help = 'Benchmark random question sampling strategies on large question banks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[10_000, 1_000_000],
+            help='Question bank sizes to benchmark'
+        )
+        parser.add_argument('--k', type=int, default=15, help='Questions per sample')
+        parser.add_argument('--runs', type=int, default=50, help='Samples per strategy')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            seeded = 0
+            for size in sorted(options['sizes']):
+                self._seed(seeded, size)
+                seeded = size
+                self._run(size, options['k'], options['runs'])
+
+    def _seed(self, start, end):
+        batch_size = 10_000
+        for offset in range(start, end, batch_size):
+            Question.objects.bulk_create([
+                Question(text=f'Benchmark question {i}', difficulty='easy')
+                for i in range(offset, min(offset + batch_size, end))
+            ])
+
+    def _run(self, size, k, runs):
+        sampler = RandomKeySampler()
+        exclude_ids = set(random.sample(range(1, size + 1), min(size // 10, 5000)))
+
+        strategies = (
+            ('full id list', lambda: random.sample(
+                list(Question.objects.filter(difficulty='easy').values_list('id', flat=True)), k
+            )),
+            ('pool (cold)', lambda: random.sample(QuestionPool(ttl=0).get_ids('easy'), k)),
+            ('random_key', lambda: sampler.sample('easy', k)),
+            ('random_key + exclude', lambda: sampler.sample('easy', k, exclude_ids)),
+        )
+
+        self.stdout.write(f'\n{size:,} questions, k={k}, {runs} runs')
+        for label, func in strategies:
+            tracemalloc.start()
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                picked = func()
+                samples.append(time.perf_counter() - start)
+                assert len(set(picked)) == k
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            summary = latency_summary(samples)
+            self.stdout.write(
+                f'  {label:<22} p50 {summary["p50_ms"]:>9}ms  '
+                f'p99 {summary["p99_ms"]:>9}ms  peak mem {peak / 1024:>9.0f} KiB'
+            )
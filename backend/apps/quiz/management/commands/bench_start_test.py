@@ -0,0 +1,64 @@
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import User
+from apps.core.benchmark import benchmark_database, latency_summary, run_concurrently
+from apps.quiz.models import Question, TestAttempt, TestResponse
+from apps.quiz.services import provision_test
+
+
+def legacy_provision_test(user, difficulty, question_ids):
+    """Pre-bulk provisioning path: one INSERT per row, no transaction"""
+    attempt = TestAttempt.objects.create(
+        user=user,
+        difficulty=difficulty,
+        total_questions=len(question_ids)
+    )
+    for question_id in question_ids:
+        TestResponse.objects.create(attempt=attempt, question_id=question_id)
+    return attempt
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent test starts (legacy row-by-row vs bulk provisioning)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Concurrent users')
+        parser.add_argument('--questions', type=int, default=500, help='Question bank size')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self._run(options['users'], options['questions'])
+
+    def _run(self, user_count, bank_size):
+        question_count = settings.QUIZ_QUESTIONS_PER_TEST
+        Question.objects.bulk_create([
+            Question(text=f'Benchmark question {i}', difficulty='easy')
+            for i in range(bank_size)
+        ])
+        question_ids = list(Question.objects.values_list('id', flat=True))
+        User.objects.bulk_create([
+            User(email=f'bench{i}@example.com') for i in range(user_count)
+        ])
+        users = list(User.objects.all())
+
+        for label, func in (('legacy', legacy_provision_test), ('bulk', provision_test)):
+            TestAttempt.objects.all().delete()
+            args_list = [
+                (user, 'easy', random.sample(question_ids, question_count))
+                for user in users
+            ]
+            wall, latencies, errors = run_concurrently(func, args_list, workers=user_count)
+            summary = latency_summary(latencies)
+            starts_per_sec = len(latencies) / wall if wall else 0.0
+            orphans = TestAttempt.objects.exclude(
+                responses__isnull=False
+            ).count()
+
+            self.stdout.write(
+                f'{label:>6}: {starts_per_sec:8.1f} starts/sec | '
+                f'p50 {summary["p50_ms"]}ms p99 {summary["p99_ms"]}ms | '
+                f'ok {len(latencies)} errors {len(errors)} orphaned attempts {orphans}'
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from apps.quiz.expiry import EXPIRY_ACTIONS, expire_stale_attempts
+from apps.quiz.models import TestAttempt
+from apps.quiz.services import attempt_expiry_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Expire in-progress test attempts past the time limit (fallback for the beat task)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Attempts per transaction')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+        parser.add_argument(
+            '--action',
+            choices=EXPIRY_ACTIONS,
+            help='Override QUIZ_EXPIRED_ATTEMPT_ACTION'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many are expired')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = TestAttempt.objects.filter(
+                is_completed=False,
+                started_at__lt=attempt_expiry_cutoff()
+            ).count()
+            self.stdout.write(f'{count} expired attempts')
+            return
+
+        expired = expire_stale_attempts(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            action=options['action'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} attempts'))
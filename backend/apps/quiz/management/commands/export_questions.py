@@ -0,0 +1,50 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.streaming import iter_csv, iter_jsonl
+from apps.quiz.question_counts import DIFFICULTIES
+from apps.quiz.question_export import EXPORT_CHUNK_SIZE, csv_row, iter_question_records
+from apps.quiz.question_import import CSV_FIELDS, IMPORT_FORMATS
+
+
+class Command(BaseCommand):
+    help = 'Stream the question bank (with options) to a JSONL or CSV file that import_questions accepts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="Output file, or '-' for stdout")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--difficulty', choices=DIFFICULTIES, help='Only export one difficulty')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Questions per DB fetch')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+
+        records = iter_question_records(options['difficulty'], chunk_size=options['chunk_size'])
+        exported = 0
+
+        def counted(records):
+            nonlocal exported
+            for record in records:
+                exported += 1
+                yield record
+
+        if fmt == 'csv':
+            chunks = iter_csv(CSV_FIELDS, (csv_row(record) for record in counted(records)))
+        else:
+            chunks = iter_jsonl(counted(records))
+
+        started = time.perf_counter()
+        if path == '-':
+            sys.stdout.writelines(chunks)
+        else:
+            with open(path, 'w', newline='', encoding='utf-8') as output:
+                output.writelines(chunks)
+        elapsed = time.perf_counter() - started
+
+        # Keep stdout clean for the data when streaming there
+        report = self.stderr if path == '-' else self.stdout
+        rate = exported / elapsed if elapsed else 0.0
+        report.write(f'Exported {exported} questions in {elapsed:.1f}s ({rate:.0f} rows/sec)')
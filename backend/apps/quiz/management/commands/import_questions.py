@@ -0,0 +1,80 @@
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.quiz.question_import import (
+    IMPORT_FORMATS,
+    QuestionRowError,
+    parse_question_row,
+    read_question_rows,
+    save_question_chunk,
+)
+
+
+class Command(BaseCommand):
+    help = 'Stream a JSONL or CSV question bank into the database with chunked bulk upserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Question bank file, or '-' for stdin")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Questions per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, write nothing')
+        parser.add_argument('--show-errors', type=int, default=20, help='Invalid rows to print')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        if path == '-':
+            self._import(sys.stdin, fmt, options)
+            return
+        try:
+            with open(path, newline='', encoding='utf-8') as stream:
+                self._import(stream, fmt, options)
+        except FileNotFoundError:
+            raise CommandError(f'No such file: {path}')
+
+    def _import(self, stream, fmt, options):
+        errors = []
+        created = updated = valid = 0
+
+        def valid_rows():
+            nonlocal valid
+            for line_number, record in read_question_rows(stream, fmt):
+                try:
+                    row = parse_question_row(record)
+                except QuestionRowError as exc:
+                    errors.append((line_number, str(exc)))
+                    continue
+                valid += 1
+                yield row
+
+        started = time.perf_counter()
+        rows = valid_rows()
+        while True:
+            chunk = list(islice(rows, options['chunk_size']))
+            if not chunk:
+                break
+            if not options['dry_run']:
+                chunk_created, chunk_updated = save_question_chunk(chunk)
+                created += chunk_created
+                updated += chunk_updated
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'{valid} rows ({valid / elapsed:.0f} rows/sec)')
+        elapsed = time.perf_counter() - started
+
+        for line_number, message in errors[:options['show_errors']]:
+            self.stderr.write(f'Line {line_number}: {message}')
+        if len(errors) > options['show_errors']:
+            self.stderr.write(f'... and {len(errors) - options["show_errors"]} more invalid rows')
+
+        rate = valid / elapsed if elapsed else 0.0
+        if options['dry_run']:
+            summary = f'Validated {valid} rows in {elapsed:.1f}s ({rate:.0f} rows/sec)'
+        else:
+            summary = (
+                f'Imported {valid} rows in {elapsed:.1f}s ({rate:.0f} rows/sec): '
+                f'{created} created, {updated} updated'
+            )
+        self.stdout.write(self.style.SUCCESS(f'{summary}, {len(errors)} invalid'))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.quiz.search import get_search_backend, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the question full-text search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Questions per reindex statement')
+
+    def handle(self, *args, **options):
+        if get_search_backend() is None:
+            self.stdout.write(self.style.WARNING(
+                'No full-text index on this database; search falls back to LIKE scans'
+            ))
+            return
+        started = time.perf_counter()
+        indexed = rebuild_search_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {indexed} questions in {time.perf_counter() - started:.1f}s'
+        ))
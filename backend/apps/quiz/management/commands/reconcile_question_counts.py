@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.quiz.question_counts import reconcile_question_counts
+
+
+class Command(BaseCommand):
+    help = 'Repair drift between QuestionCounter rows and the real question counts'
+
+    def handle(self, *args, **options):
+        drift = reconcile_question_counts()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Question counters are in sync'))
+            return
+
+        for difficulty, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f'{difficulty}: {stored} -> {actual}')
+        self.stdout.write(self.style.SUCCESS(f'Repaired {len(drift)} counter(s)'))
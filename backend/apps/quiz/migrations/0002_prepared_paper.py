@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PreparedPaper',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], max_length=10)),
+                ('question_ids', models.JSONField(help_text='Ordered list of question IDs for this paper')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'quiz_prepared_paper',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['difficulty', 'id'], name='quiz_prepar_difficu_9a899b_idx')],
+            },
+        ),
+    ]
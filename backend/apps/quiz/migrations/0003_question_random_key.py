@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:43
+
+import random
+
+import apps.quiz.models
+from django.db import migrations, models
+
+
+def randomize_existing_keys(apps, schema_editor):
+    """AddField evaluates the default once, so give existing rows their own keys"""
+    Question = apps.get_model('quiz', 'Question')
+    batch = []
+    for question in Question.objects.only('id').iterator(chunk_size=2000):
+        question.random_key = random.random()
+        batch.append(question)
+        if len(batch) >= 2000:
+            Question.objects.bulk_update(batch, ['random_key'])
+            batch = []
+    if batch:
+        Question.objects.bulk_update(batch, ['random_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0002_prepared_paper'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='random_key',
+            field=models.FloatField(default=apps.quiz.models.generate_random_key, editable=False, help_text='Uniform random sort key used for indexed random sampling'),
+        ),
+        migrations.RunPython(randomize_existing_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['difficulty', 'random_key'], name='quiz_questi_difficu_35eead_idx'),
+        ),
+    ]
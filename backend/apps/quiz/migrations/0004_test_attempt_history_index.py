@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0003_question_random_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['user', 'is_completed', '-completed_at', '-id'], name='quiz_test_a_user_id_5bcb39_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('quiz', '0004_test_attempt_history_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestResultSnapshot',
+            fields=[
+                ('attempt', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='result_snapshot', serialize=False, to='quiz.testattempt')),
+                ('schema_version', models.PositiveSmallIntegerField()),
+                ('result', models.BinaryField(help_text='zlib-compressed JSON of TestResultSerializer')),
+                ('summary', models.BinaryField(help_text='zlib-compressed JSON score summary')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='test_result_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'quiz_test_result_snapshot',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:01
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_question_counters(apps, schema_editor):
+    """Start every difficulty's counter from the current question count"""
+    Question = apps.get_model('quiz', 'Question')
+    QuestionCounter = apps.get_model('quiz', 'QuestionCounter')
+    counts = dict(
+        Question.objects.order_by().values_list('difficulty').annotate(count=Count('id'))
+    )
+    QuestionCounter.objects.bulk_create([
+        QuestionCounter(difficulty=difficulty, count=counts.get(difficulty, 0))
+        for difficulty in ('easy', 'medium', 'hard')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0005_test_result_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionCounter',
+            fields=[
+                ('difficulty', models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], max_length=10, primary_key=True, serialize=False)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'quiz_question_counter',
+            },
+        ),
+        migrations.RunPython(seed_question_counters, migrations.RunPython.noop),
+    ]
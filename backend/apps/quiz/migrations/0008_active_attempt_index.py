@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0007_incomplete_attempt_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['user', '-started_at'], name='quiz_attempt_active_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 09:12
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_content_hashes(apps, schema_editor):
+    """Hash existing questions; duplicates of an earlier text keep no hash"""
+    Question = apps.get_model('quiz', 'Question')
+    seen = set()
+    updated = []
+    for question in Question.objects.order_by('id').only('id', 'text').iterator(chunk_size=2000):
+        normalized = ' '.join(question.text.split()).casefold()
+        content_hash = hashlib.sha256(normalized.encode()).hexdigest()
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+        question.content_hash = content_hash
+        updated.append(question)
+    Question.objects.bulk_update(updated, ['content_hash'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0008_active_attempt_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='content_hash',
+            field=models.CharField(editable=False, help_text='Hash of the normalized text; re-imports upsert on it', max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_content_hashes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='question',
+            name='content_hash',
+            field=models.CharField(editable=False, help_text='Hash of the normalized text; re-imports upsert on it', max_length=64, null=True, unique=True),
+        ),
+    ]
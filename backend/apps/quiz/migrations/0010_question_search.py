@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-17 10:05
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """Create and fill the full-text index for the current database (see apps/quiz/search.py)"""
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    'CREATE VIRTUAL TABLE quiz_question_fts USING fts5('
+                    "text, options, explanation, tokenize = 'porter unicode61')"
+                )
+            except Exception:
+                # SQLite built without FTS5: search falls back to LIKE scans
+                return
+            cursor.execute(
+                'INSERT INTO quiz_question_fts (rowid, text, options, explanation) '
+                'SELECT q.id, q.text, '
+                "COALESCE((SELECT group_concat(o.text, ' ') FROM quiz_question_option o "
+                "WHERE o.question_id = q.id), ''), COALESCE(q.explanation, '') "
+                'FROM quiz_question q'
+            )
+        elif vendor == 'postgresql':
+            cursor.execute(
+                'CREATE TABLE quiz_question_search ('
+                'question_id bigint PRIMARY KEY REFERENCES quiz_question (id) '
+                'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                'CREATE INDEX quiz_question_search_document_idx '
+                'ON quiz_question_search USING GIN (document)'
+            )
+            cursor.execute(
+                'INSERT INTO quiz_question_search (question_id, document) '
+                "SELECT q.id, setweight(to_tsvector('english', q.text), 'A') || "
+                "setweight(to_tsvector('english', COALESCE(string_agg(o.text, ' '), '')), 'B') || "
+                "setweight(to_tsvector('english', COALESCE(q.explanation, '')), 'C') "
+                'FROM quiz_question q LEFT JOIN quiz_question_option o ON o.question_id = q.id '
+                'GROUP BY q.id'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute('DROP TABLE IF EXISTS quiz_question_fts')
+        elif vendor == 'postgresql':
+            cursor.execute('DROP TABLE IF EXISTS quiz_question_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0009_question_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
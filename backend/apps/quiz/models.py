@@ -1,8 +1,24 @@
-from django.db import models
+import hashlib
+import random
+
+from django.db import IntegrityError, models, transaction
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from apps.accounts.models import User
 
+
+def generate_random_key():
+    """Default for Question.random_key (must be importable by migrations)"""
+    return random.random()
+
+
+def question_content_hash(text):
+    """Identity of a question's text, ignoring case and whitespace differences"""
+    normalized = ' '.join(text.split()).casefold()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
 # ============================================================================
 # QUESTION MODEL - Core question entity with difficulty levels
 # ============================================================================
@@ -29,6 +45,18 @@ class Question(models.Model):
         null=True,
         help_text='Optional explanation of the correct answer'
     )
+    random_key = models.FloatField(
+        default=generate_random_key,
+        editable=False,
+        help_text='Uniform random sort key used for indexed random sampling'
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        editable=False,
+        help_text='Hash of the normalized text; re-imports upsert on it'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -37,10 +65,78 @@ class Question(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['difficulty']),
+            models.Index(fields=['difficulty', 'random_key']),
         ]
     
     def __str__(self):
         return f"[{self.get_difficulty_display()}] {self.text[:50]}"
+    
+    def duplicate_id(self, content_hash=None):
+        """Id of another question that owns this text's content_hash, if any"""
+        return (
+            Question.objects.filter(content_hash=content_hash or question_content_hash(self.text))
+            .exclude(pk=self.pk)
+            .values_list('pk', flat=True)
+            .first()
+        )
+    
+    def clean(self):
+        """Reject text that duplicates another question up to case and whitespace"""
+        duplicate_id = self.duplicate_id()
+        if duplicate_id is not None:
+            raise self._duplicate_error(duplicate_id)
+    
+    def _duplicate_error(self, duplicate_id):
+        return ValidationError({
+            'text': f'Question #{duplicate_id} already has this text '
+                    '(ignoring case and whitespace).'
+        })
+    
+    def save(self, *args, **kwargs):
+        """
+        Save atomically so QuestionCounter updates (signals) commit with the row.
+
+        Duplicate text is caught by the unique content_hash constraint and
+        raised as the same ValidationError clean() gives.
+        """
+        content_hash = question_content_hash(self.text)
+        self.content_hash = content_hash
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'content_hash'}
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            # Only look the duplicate up once the constraint has rejected it
+            duplicate_id = self.duplicate_id(content_hash)
+            if duplicate_id is None:
+                raise
+            raise self._duplicate_error(duplicate_id)
+
+
+# ============================================================================
+# QUESTION COUNTER MODEL - Maintained question totals per difficulty
+# ============================================================================
+class QuestionCounter(models.Model):
+    """
+    Number of questions per difficulty, kept in step with Question by the
+    signals in apps/quiz/signals.py (repair drift with
+    `manage.py reconcile_question_counts`).
+    """
+    
+    difficulty = models.CharField(
+        max_length=10,
+        choices=Question.DIFFICULTY_CHOICES,
+        primary_key=True
+    )
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'quiz_question_counter'
+    
+    def __str__(self):
+        return f"{self.difficulty}: {self.count}"
 
 
 # ============================================================================
@@ -156,6 +252,20 @@ class TestAttempt(models.Model):
             models.Index(fields=['user', '-started_at']),
             models.Index(fields=['difficulty']),
             models.Index(fields=['is_completed']),
+            # Keyset pagination of test history (see UserTestHistoryView)
+            models.Index(fields=['user', 'is_completed', '-completed_at', '-id']),
+            # A user's active attempt (StartTestView, ActiveTestView, GetTestView)
+            models.Index(
+                fields=['user', '-started_at'],
+                condition=models.Q(is_completed=False),
+                name='quiz_attempt_active_idx'
+            ),
+            # Expiry sweep over in-progress attempts only (see expiry.py)
+            models.Index(
+                fields=['started_at'],
+                condition=models.Q(is_completed=False),
+                name='quiz_attempt_incomplete_idx'
+            ),
         ]
     
     def __str__(self):
@@ -276,3 +386,64 @@ class TestResponse(models.Model):
             self.is_correct = False
             self.is_unanswered = True
         super().save(*args, **kwargs)
+
+
+# ============================================================================
+# PREPARED PAPER MODEL - Pre-generated question sets for fast test starts
+# ============================================================================
+class PreparedPaper(models.Model):
+    """Randomized question set generated ahead of time by the paper pool worker"""
+    
+    difficulty = models.CharField(
+        max_length=10,
+        choices=Question.DIFFICULTY_CHOICES
+    )
+    question_ids = models.JSONField(
+        help_text='Ordered list of question IDs for this paper'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'quiz_prepared_paper'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['difficulty', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"Paper {self.id} ({self.difficulty}, {len(self.question_ids)} questions)"
+
+
+# ============================================================================
+# TEST RESULT SNAPSHOT MODEL - Frozen rendered results of a completed test
+# ============================================================================
+class TestResultSnapshot(models.Model):
+    """
+    Compressed, rendered results and score summary of a completed attempt.
+    
+    Written once on completion (see apps/quiz/snapshots.py) and never
+    updated, so result views can serve it with a single-row read.
+    """
+    
+    attempt = models.OneToOneField(
+        TestAttempt,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='result_snapshot'
+    )
+    # Denormalized so ownership is checked without joining test attempts
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='test_result_snapshots'
+    )
+    schema_version = models.PositiveSmallIntegerField()
+    result = models.BinaryField(help_text='zlib-compressed JSON of TestResultSerializer')
+    summary = models.BinaryField(help_text='zlib-compressed JSON score summary')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'quiz_test_result_snapshot'
+    
+    def __str__(self):
+        return f"Result snapshot for attempt {self.attempt_id} (v{self.schema_version})"
@@ -0,0 +1,126 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.metrics import metrics
+from .models import PreparedPaper
+from .sampling import sample_question_ids
+
+logger = logging.getLogger(__name__)
+
+MAX_CLAIM_ATTEMPTS = 3
+
+
+# ============================================================================
+# PAPER POOL - Pre-generated randomized papers popped by StartTestView
+# ============================================================================
+def is_enabled():
+    return getattr(settings, 'QUIZ_PAPER_POOL_ENABLED', False)
+
+
+def pool_size(difficulty):
+    """Get number of ready papers for a difficulty"""
+    return PreparedPaper.objects.filter(difficulty=difficulty).count()
+
+
+def pop_paper(difficulty):
+    """
+    Take one ready paper for a difficulty and return its question IDs.
+
+    Returns None when the pool is disabled or exhausted so the caller can
+    fall back to sampling the question pool directly. A refill is requested
+    whenever the remaining papers drop below the low watermark.
+    """
+    if not is_enabled():
+        return None
+
+    question_ids = None
+    for _ in range(MAX_CLAIM_ATTEMPTS):
+        claimed = _claim_paper(difficulty)
+        if claimed is None:
+            break  # Exhausted
+        if claimed is False:
+            continue  # Taken by a concurrent request
+        if len(claimed) != settings.QUIZ_QUESTIONS_PER_TEST:
+            continue  # Generated before QUIZ_QUESTIONS_PER_TEST changed
+        question_ids = claimed
+        break
+
+    if pool_size(difficulty) < settings.QUIZ_PAPER_POOL_LOW_WATERMARK:
+        request_refill(difficulty)
+
+    if question_ids is None:
+        metrics.incr('quiz.paper_pool.miss')
+        metrics.incr(f'quiz.paper_pool.exhausted.{difficulty}')
+        logger.warning('Paper pool exhausted for %s difficulty; sampling on demand', difficulty)
+        return None
+
+    metrics.incr('quiz.paper_pool.hit')
+    return question_ids
+
+
+def _claim_paper(difficulty):
+    """
+    Lock and delete one ready paper (LIMIT 1), skipping rows other starts
+    hold. Returns its question IDs, None if there are none, or False if it
+    was taken concurrently (databases without SKIP LOCKED).
+    """
+    with transaction.atomic():
+        paper = (
+            PreparedPaper.objects.select_for_update(skip_locked=True)
+            .filter(difficulty=difficulty)
+            .values_list('id', 'question_ids')
+            .first()
+        )
+        if paper is None:
+            return None
+        paper_id, question_ids = paper
+        deleted, _ = PreparedPaper.objects.filter(id=paper_id).delete()
+        return question_ids if deleted else False
+
+
+def request_refill(difficulty):
+    """Enqueue a refill unless one is already pending for this difficulty"""
+    from .tasks import refill_paper_pool
+
+    lock_key = f'quiz:paper_pool:refill:{difficulty}'
+    if not cache.add(lock_key, 1, timeout=settings.QUIZ_PAPER_POOL_REFILL_LOCK_SECONDS):
+        return False
+    metrics.incr('quiz.paper_pool.refill_requested')
+    refill_paper_pool.delay(difficulty)
+    return True
+
+
+def refill(difficulty, target=None):
+    """
+    Top the pool for a difficulty back up to its target size.
+
+    Returns the number of papers created.
+    """
+    if target is None:
+        target = settings.QUIZ_PAPER_POOL_TARGET_SIZE
+    question_count = settings.QUIZ_QUESTIONS_PER_TEST
+
+    try:
+        current = pool_size(difficulty)
+        papers = []
+        for _ in range(max(0, target - current)):
+            question_ids = sample_question_ids(difficulty, question_count)
+            if len(question_ids) < question_count:
+                break  # Not enough questions in the bank
+            papers.append(PreparedPaper(difficulty=difficulty, question_ids=question_ids))
+
+        PreparedPaper.objects.bulk_create(papers)
+    finally:
+        cache.delete(f'quiz:paper_pool:refill:{difficulty}')
+
+    metrics.incr('quiz.paper_pool.papers_created', len(papers))
+    metrics.gauge(f'quiz.paper_pool.size.{difficulty}', current + len(papers))
+    return len(papers)
+
+
+def discard_papers(difficulty):
+    """Drop ready papers for a difficulty (e.g. after a question is deleted or moved)"""
+    PreparedPaper.objects.filter(difficulty=difficulty).delete()
@@ -0,0 +1,17 @@
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class IsContentEditor(BasePermission):
+    """
+    Allow users listed in QUIZ_CONTENT_EDITOR_EMAILS. The question bank
+    includes correct answers, so it must not be readable by quiz takers.
+    """
+    message = 'Only content editors can access the question bank'
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated
+            and user.email.lower() in {email.lower() for email in settings.QUIZ_CONTENT_EDITOR_EMAILS}
+        )
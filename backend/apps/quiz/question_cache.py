@@ -0,0 +1,164 @@
+from django.core.cache import cache
+
+from apps.core.conditional import bump_version
+from apps.core.metrics import metrics
+from .models import Question, QuestionOption
+
+
+# ============================================================================
+# QUESTION CACHE - Pre-rendered question fragments and option answer keys
+# ============================================================================
+# Entries are dropped on every question/option save (signals.py), so the
+# default cache must be shared by all workers (checks.py enforces it).
+# Bump when QuestionDetailSerializer output changes so old fragments are ignored
+PAYLOAD_SCHEMA_VERSION = 1
+PAYLOAD_TIMEOUT = 60 * 60 * 24
+# Version counter for rendered question content (validates test sessions)
+QUESTION_BANK_VERSION = 'quiz.question_bank'
+
+
+def _payload_key(question_id):
+    return f'quiz:question_payload:v{PAYLOAD_SCHEMA_VERSION}:{question_id}'
+
+
+def _answer_cache_key(question_id):
+    return f'quiz:answer_key:{question_id}'
+
+
+def _correct_answer_cache_key(question_id):
+    return f'quiz:correct_answer:{question_id}'
+
+
+def get_question_payloads(question_ids):
+    """
+    Return rendered question payloads (with options) in the given order.
+
+    Cached fragments are fetched in one round-trip; only the misses are
+    loaded from the DB (one query for questions, one for their options)
+    and written back to the cache.
+    """
+    keys = {question_id: _payload_key(question_id) for question_id in question_ids}
+    cached = cache.get_many(list(keys.values()))
+    payloads = {
+        question_id: cached[key]
+        for question_id, key in keys.items()
+        if key in cached
+    }
+
+    missing = [question_id for question_id in question_ids if question_id not in payloads]
+    metrics.incr('quiz.question_payload.hit', len(payloads))
+    metrics.incr('quiz.question_payload.miss', len(missing))
+
+    if missing:
+        rendered = render_question_payloads(missing)
+        cache.set_many(
+            {keys[question_id]: payload for question_id, payload in rendered.items()},
+            timeout=PAYLOAD_TIMEOUT
+        )
+        payloads.update(rendered)
+
+    return [payloads[question_id] for question_id in question_ids if question_id in payloads]
+
+
+def render_question_payloads(question_ids):
+    """Serialize questions with their options, keyed by question id"""
+    from .serializers import QuestionDetailSerializer
+
+    questions = Question.objects.filter(id__in=question_ids).prefetch_related('options')
+    return {
+        payload['id']: payload
+        for payload in QuestionDetailSerializer(questions, many=True).data
+    }
+
+
+def get_answer_keys(question_ids):
+    """
+    Return {question_id: {option_id: is_correct}} for the given questions.
+
+    Questions that do not exist (or have no options) are left out. Misses
+    are loaded with a single query over QuestionOption.
+    """
+    keys = {question_id: _answer_cache_key(question_id) for question_id in question_ids}
+    cached = cache.get_many(list(keys.values()))
+    answer_keys = {
+        question_id: cached[key]
+        for question_id, key in keys.items()
+        if key in cached
+    }
+
+    missing = [question_id for question_id in keys if question_id not in answer_keys]
+    metrics.incr('quiz.answer_key.hit', len(answer_keys))
+    metrics.incr('quiz.answer_key.miss', len(missing))
+
+    if missing:
+        loaded = {}
+        for question_id, option_id, is_correct in QuestionOption.objects.filter(
+            question_id__in=missing
+        ).order_by().values_list('question_id', 'id', 'is_correct'):
+            loaded.setdefault(question_id, {})[option_id] = is_correct
+        cache.set_many(
+            {keys[question_id]: options for question_id, options in loaded.items()},
+            timeout=PAYLOAD_TIMEOUT
+        )
+        answer_keys.update(loaded)
+
+    return answer_keys
+
+
+def get_correct_answers(question_ids):
+    """
+    Return {question_id: {'id': option_id, 'text': option_text}} for the
+    correct option of each question. Questions without a correct option are
+    left out. Misses are loaded with a single query over QuestionOption.
+    """
+    keys = {question_id: _correct_answer_cache_key(question_id) for question_id in question_ids}
+    cached = cache.get_many(list(keys.values()))
+    correct_answers = {
+        question_id: cached[key]
+        for question_id, key in keys.items()
+        if key in cached
+    }
+
+    missing = [question_id for question_id in keys if question_id not in correct_answers]
+    metrics.incr('quiz.correct_answer.hit', len(correct_answers))
+    metrics.incr('quiz.correct_answer.miss', len(missing))
+
+    if missing:
+        loaded = {}
+        for question_id, option_id, text in QuestionOption.objects.filter(
+            question_id__in=missing,
+            is_correct=True
+        ).order_by('question_id', 'order').values_list('question_id', 'id', 'text'):
+            # Mirror options.filter(is_correct=True).first(): lowest order wins
+            loaded.setdefault(question_id, {'id': option_id, 'text': text})
+        cache.set_many(
+            {keys[question_id]: answer for question_id, answer in loaded.items()},
+            timeout=PAYLOAD_TIMEOUT
+        )
+        correct_answers.update(loaded)
+
+    return correct_answers
+
+
+def invalidate_question(question_id):
+    """Drop every cached entry for a question"""
+    cache.delete_many([
+        _payload_key(question_id),
+        _answer_cache_key(question_id),
+        _correct_answer_cache_key(question_id),
+    ])
+    bump_version(QUESTION_BANK_VERSION)
+
+
+def invalidate_questions(question_ids):
+    """Drop every cached entry for many questions at once (bulk imports)"""
+    cache.delete_many([
+        key
+        for question_id in question_ids
+        for key in (
+            _payload_key(question_id),
+            _answer_cache_key(question_id),
+            _correct_answer_cache_key(question_id),
+        )
+    ])
+    bump_version(QUESTION_BANK_VERSION)
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Question, QuestionCounter
+
+
+# ============================================================================
+# QUESTION COUNTS - Maintained per-difficulty totals (see QuestionCounter)
+# ============================================================================
+DIFFICULTIES = [difficulty for difficulty, _ in Question.DIFFICULTY_CHOICES]
+
+
+def adjust_question_count(difficulty, delta):
+    """
+    Add delta to a difficulty's counter in the caller's transaction.
+
+    Anything that writes Question rows without signals (bulk_create,
+    queryset.update of difficulty) must call this in the same transaction.
+    """
+    updated = QuestionCounter.objects.filter(difficulty=difficulty).update(
+        count=F('count') + delta
+    )
+    if not updated:
+        QuestionCounter.objects.get_or_create(difficulty=difficulty)
+        QuestionCounter.objects.filter(difficulty=difficulty).update(
+            count=F('count') + delta
+        )
+
+
+def get_question_counts():
+    """Return {difficulty: count} for every difficulty with a single read"""
+    counts = dict.fromkeys(DIFFICULTIES, 0)
+    counts.update(QuestionCounter.objects.values_list('difficulty', 'count'))
+    return counts
+
+
+def reconcile_question_counts():
+    """
+    Reset every counter to the real question count.
+
+    Counter rows are locked (where the database supports it) while counting
+    so concurrent adjustments wait instead of being overwritten. Returns
+    {difficulty: (stored, actual)} for the counters that had drifted.
+    """
+    with transaction.atomic():
+        stored = dict.fromkeys(DIFFICULTIES, 0)
+        stored.update(
+            QuestionCounter.objects.select_for_update().values_list('difficulty', 'count')
+        )
+        actual = dict.fromkeys(DIFFICULTIES, 0)
+        actual.update(
+            Question.objects.order_by().values_list('difficulty').annotate(count=Count('id'))
+        )
+
+        drift = {
+            difficulty: (stored.get(difficulty, 0), count)
+            for difficulty, count in actual.items()
+            if stored.get(difficulty, 0) != count
+        }
+        for difficulty, (_, count) in drift.items():
+            QuestionCounter.objects.update_or_create(
+                difficulty=difficulty,
+                defaults={'count': count}
+            )
+    return drift
@@ -0,0 +1,65 @@
+from itertools import groupby, islice
+
+from .models import Question, QuestionOption
+from .question_import import OPTIONS_PER_QUESTION
+
+
+# ============================================================================
+# QUESTION EXPORT - Flat-memory iteration over the question bank
+# ============================================================================
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_question_records(difficulty=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield every question with its options, in the JSONL import format.
+
+    Questions are read with a server-side cursor in chunks of chunk_size,
+    and each chunk's options are fetched with one query, so memory stays
+    flat however large the bank is.
+    """
+    questions = Question.objects.order_by('id').values_list(
+        'id', 'text', 'difficulty', 'explanation'
+    )
+    if difficulty:
+        questions = questions.filter(difficulty=difficulty)
+
+    rows = questions.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        options = QuestionOption.objects.filter(
+            question_id__in=[question_id for question_id, *_ in chunk]
+        ).order_by('question_id', 'order').values_list('question_id', 'text', 'is_correct')
+        options_by_question = {
+            question_id: [
+                {'text': text, 'is_correct': is_correct}
+                for _, text, is_correct in question_options
+            ]
+            for question_id, question_options in groupby(options, key=lambda option: option[0])
+        }
+
+        for question_id, text, question_difficulty, explanation in chunk:
+            yield {
+                'id': question_id,
+                'text': text,
+                'difficulty': question_difficulty,
+                'explanation': explanation or '',
+                'options': options_by_question.get(question_id, []),
+            }
+
+
+def csv_row(record):
+    """Flatten an exported question into the import CSV layout (see CSV_FIELDS)"""
+    row = {
+        'text': record['text'],
+        'difficulty': record['difficulty'],
+        'explanation': record['explanation'],
+        'correct': '',
+    }
+    for number, option in enumerate(record['options'][:OPTIONS_PER_QUESTION], 1):
+        row[f'option_{number}'] = option['text']
+        if option['is_correct'] and not row['correct']:
+            row['correct'] = number
+    return row
@@ -0,0 +1,191 @@
+import csv
+import json
+from collections import Counter
+
+from django.db import transaction
+
+from .models import Question, QuestionOption, question_content_hash
+from .paper_pool import discard_papers
+from .question_cache import invalidate_questions
+from .question_counts import DIFFICULTIES, adjust_question_count
+from .question_pool import question_pool
+from .search import reindex_questions
+
+
+# ============================================================================
+# QUESTION IMPORT - Streaming, validated, chunked bulk upserts
+# ============================================================================
+OPTIONS_PER_QUESTION = 4
+IMPORT_FORMATS = ('jsonl', 'csv')
+# CSV layout: one row per question, `correct` is the 1-based option number
+CSV_FIELDS = ['text', 'difficulty', 'explanation'] + [
+    f'option_{number}' for number in range(1, OPTIONS_PER_QUESTION + 1)
+] + ['correct']
+
+
+class QuestionRowError(ValueError):
+    """Raised when an import row is not a valid question"""
+
+
+def read_question_rows(stream, fmt):
+    """
+    Yield (line_number, record) from a JSONL or CSV question bank without
+    loading the whole file.
+
+    JSONL records look like seed_questions.py entries plus a difficulty:
+    {"text", "difficulty", "explanation", "options": [4 strings],
+    "correct_idx": 0-3}; options may instead be {"text", "is_correct"}
+    objects. Undecodable JSONL lines are yielded as QuestionRowError.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            record['options'] = [
+                record.pop(f'option_{number}', None)
+                for number in range(1, OPTIONS_PER_QUESTION + 1)
+            ]
+            correct = (record.pop('correct', None) or '').strip()
+            record['correct_idx'] = int(correct) - 1 if correct.isdigit() else None
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, QuestionRowError(f'Invalid JSON: {exc.msg}')
+
+
+def parse_question_row(record):
+    """
+    Validate a raw record and return the row to import.
+
+    Raises QuestionRowError unless the question has text, a known
+    difficulty and exactly 4 non-empty options of which exactly one is
+    correct.
+    """
+    if isinstance(record, QuestionRowError):
+        raise record
+    if not isinstance(record, dict):
+        raise QuestionRowError('Expected an object')
+
+    text = (record.get('text') or '').strip()
+    if not text:
+        raise QuestionRowError('Question text is required')
+
+    difficulty = (record.get('difficulty') or '').strip().lower()
+    if difficulty not in DIFFICULTIES:
+        raise QuestionRowError(f'Unknown difficulty {record.get("difficulty")!r}')
+
+    options = record.get('options')
+    if not isinstance(options, list) or len(options) != OPTIONS_PER_QUESTION:
+        raise QuestionRowError(f'Expected exactly {OPTIONS_PER_QUESTION} options')
+
+    correct_idx = record.get('correct_idx')
+    parsed_options = []
+    for order, option in enumerate(options):
+        if isinstance(option, dict):
+            option_text = option.get('text')
+            is_correct = bool(option.get('is_correct'))
+        else:
+            option_text = option
+            is_correct = order == correct_idx
+        option_text = (option_text or '').strip() if isinstance(option_text, str) else ''
+        if not option_text:
+            raise QuestionRowError(f'Option {order + 1} has no text')
+        parsed_options.append((option_text, is_correct))
+
+    correct_count = sum(is_correct for _, is_correct in parsed_options)
+    if correct_count != 1:
+        raise QuestionRowError(f'Expected exactly one correct option, found {correct_count}')
+
+    return {
+        'text': text,
+        'difficulty': difficulty,
+        'explanation': (record.get('explanation') or '').strip() or None,
+        'options': parsed_options,
+        'content_hash': question_content_hash(text),
+    }
+
+
+def save_question_chunk(rows):
+    """
+    Upsert a chunk of parsed rows and their options in one transaction.
+
+    Questions are matched on content_hash, so re-importing a bank updates
+    difficulty, explanation and options in place. bulk_create skips the
+    Question signals, so this keeps QuestionCounter, the question pools,
+    prepared papers, the search index and the question cache in step
+    itself. Returns (created, updated).
+    """
+    # A question repeated within the chunk: the last occurrence wins
+    rows = list({row['content_hash']: row for row in rows}.values())
+    hashes = [row['content_hash'] for row in rows]
+
+    with transaction.atomic():
+        previous = dict(
+            Question.objects.filter(content_hash__in=hashes).values_list('content_hash', 'difficulty')
+        )
+        Question.objects.bulk_create(
+            [
+                Question(
+                    text=row['text'],
+                    difficulty=row['difficulty'],
+                    explanation=row['explanation'],
+                    content_hash=row['content_hash'],
+                )
+                for row in rows
+            ],
+            update_conflicts=True,
+            unique_fields=['content_hash'],
+            update_fields=['text', 'difficulty', 'explanation', 'updated_at'],
+        )
+        question_ids = dict(
+            Question.objects.filter(content_hash__in=hashes).values_list('content_hash', 'id')
+        )
+        QuestionOption.objects.bulk_create(
+            [
+                QuestionOption(
+                    question_id=question_ids[row['content_hash']],
+                    text=option_text,
+                    is_correct=is_correct,
+                    order=order,
+                )
+                for row in rows
+                for order, (option_text, is_correct) in enumerate(row['options'])
+            ],
+            update_conflicts=True,
+            unique_fields=['question', 'order'],
+            update_fields=['text', 'is_correct'],
+        )
+
+        deltas = Counter()
+        moved_from = set()
+        for row in rows:
+            old_difficulty = previous.get(row['content_hash'])
+            if old_difficulty != row['difficulty']:
+                deltas[row['difficulty']] += 1
+                if old_difficulty is not None:
+                    deltas[old_difficulty] -= 1
+                    moved_from.add(old_difficulty)
+        for difficulty, delta in deltas.items():
+            if delta:
+                adjust_question_count(difficulty, delta)
+        for difficulty in moved_from:
+            discard_papers(difficulty)
+        reindex_questions(question_ids.values())
+
+        updated_ids = [question_ids[content_hash] for content_hash in previous]
+        touched = {row['difficulty'] for row in rows} | moved_from
+
+        def refresh_caches():
+            if updated_ids:
+                invalidate_questions(updated_ids)
+            for difficulty in touched:
+                question_pool.invalidate(difficulty)
+
+        transaction.on_commit(refresh_caches)
+
+    return len(rows) - len(previous), len(previous)
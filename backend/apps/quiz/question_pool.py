@@ -0,0 +1,113 @@
+import threading
+import time
+from array import array
+
+from django.conf import settings
+
+from apps.core.metrics import metrics
+from .models import Question
+
+
+# ============================================================================
+# QUESTION POOL - Per-difficulty in-memory question ID cache
+# ============================================================================
+class QuestionPool:
+    """
+    Keeps a compact array of question IDs for each difficulty so that
+    random.sample() can pick test questions without a DB round-trip.
+
+    Pools are loaded lazily, kept in sync by Question signals (see
+    signals.py) and reloaded after QUIZ_QUESTION_POOL_TTL seconds so that
+    changes made by other worker processes are picked up eventually.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._loaded_at = {}
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'QUIZ_QUESTION_POOL_TTL', 300)
+
+    def get_ids(self, difficulty):
+        """
+        Get the ID array for a difficulty, loading it from the DB if needed.
+        The returned array must be treated as read-only.
+        """
+        pool = self._pools.get(difficulty)
+        loaded_at = self._loaded_at.get(difficulty, 0)
+
+        if pool is not None and time.monotonic() - loaded_at < self.ttl:
+            metrics.incr('quiz.question_pool.hit')
+            return pool
+
+        metrics.incr('quiz.question_pool.miss')
+        return self.refresh(difficulty)
+
+    def count(self, difficulty):
+        """Get number of available questions for a difficulty"""
+        return len(self.get_ids(difficulty))
+
+    def refresh(self, difficulty):
+        """Reload the ID array for a difficulty from the database"""
+        ids = array('q', Question.objects.filter(
+            difficulty=difficulty
+        ).order_by().values_list('id', flat=True).iterator())
+
+        with self._lock:
+            self._pools[difficulty] = ids
+            self._loaded_at[difficulty] = time.monotonic()
+
+        metrics.incr('quiz.question_pool.refresh')
+        metrics.gauge(f'quiz.question_pool.size.{difficulty}', len(ids))
+        return ids
+
+    def add(self, question_id, difficulty):
+        """Add a question ID to a loaded pool (no-op if not loaded yet)"""
+        with self._lock:
+            pool = self._pools.get(difficulty)
+            if pool is None or question_id in pool:
+                return
+            pool.append(question_id)
+            size = len(pool)
+        metrics.gauge(f'quiz.question_pool.size.{difficulty}', size)
+
+    def discard(self, question_id):
+        """Remove a question ID from whichever pool holds it"""
+        with self._lock:
+            for difficulty, pool in self._pools.items():
+                if question_id not in pool:
+                    continue
+                # Copy-on-write so concurrent samplers never see a shrinking array
+                updated = array('q', (pk for pk in pool if pk != question_id))
+                self._pools[difficulty] = updated
+                metrics.gauge(f'quiz.question_pool.size.{difficulty}', len(updated))
+
+    def invalidate(self, difficulty=None):
+        """Drop one (or all) pools so they are reloaded on next access"""
+        with self._lock:
+            if difficulty is None:
+                self._pools.clear()
+                self._loaded_at.clear()
+            else:
+                self._pools.pop(difficulty, None)
+                self._loaded_at.pop(difficulty, None)
+
+    def stats(self):
+        """Return pool sizes and hit rate for monitoring"""
+        with self._lock:
+            sizes = {difficulty: len(pool) for difficulty, pool in self._pools.items()}
+        return {
+            'sizes': sizes,
+            'hits': metrics.get('quiz.question_pool.hit'),
+            'misses': metrics.get('quiz.question_pool.miss'),
+            'refreshes': metrics.get('quiz.question_pool.refresh'),
+            'hit_rate': metrics.hit_rate('quiz.question_pool'),
+        }
+
+
+question_pool = QuestionPool()
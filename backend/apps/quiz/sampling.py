@@ -0,0 +1,162 @@
+import random
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, FloatField, Value, When
+
+from apps.core.metrics import metrics
+from .models import Question
+from .question_pool import question_pool
+
+
+# ============================================================================
+# QUESTION SAMPLING - Pick k distinct random questions for a difficulty
+# ============================================================================
+def reservoir_sample(ids, k, skip=()):
+    """Uniformly pick up to k ids from an iterable in one pass, O(k) memory"""
+    reservoir = []
+    seen = 0
+    for question_id in ids:
+        if question_id in skip:
+            continue
+        seen += 1
+        if len(reservoir) < k:
+            reservoir.append(question_id)
+        else:
+            slot = random.randrange(seen)
+            if slot < k:
+                reservoir[slot] = question_id
+    random.shuffle(reservoir)
+    return reservoir
+
+
+def redraw_keys(question_ids):
+    """Give picked questions fresh random keys in one UPDATE (best effort)"""
+    try:
+        Question.objects.filter(id__in=question_ids).update(random_key=Case(
+            *(When(id=question_id, then=Value(random.random())) for question_id in question_ids),
+            output_field=FloatField(),
+        ))
+    except DatabaseError:
+        # E.g. a deadlock with a concurrent re-draw; the keys just stay
+        metrics.incr('quiz.sampling.redraw_failed')
+
+
+class RandomKeySampler:
+    """
+    Samples questions through the indexed (difficulty, random_key) column.
+
+    Each probe draws r in [0, 1) and takes the first question with
+    random_key >= r, wrapping around to the smallest key when r is above
+    every key, an O(log n) index seek. All probes for a round go out
+    as scalar subqueries in a single IN (...) query, so picking k questions
+    costs O(k log n) and never materializes the full ID set. Questions in
+    exclude_ids are rejected client-side and re-probed.
+
+    A probe picks a question with probability equal to the gap between its
+    key and the previous one, so questions after a wide gap are favoured.
+    Picked questions get fresh keys from a Celery task (redraw_keys), which
+    moves them off that gap, so no question keeps its higher odds for long.
+
+    When probes keep colliding (tiny banks, or a user who has seen almost
+    everything) it falls back to a streaming reservoir sample.
+    """
+
+    MAX_ROUNDS = 4
+
+    def _probe(self, difficulty, probe_count):
+        """Run probe_count index seeks in one query and return the hit ids"""
+        # Raw SQL: compiling dozens of ORM subqueries costs more than running them
+        table = connection.ops.quote_name(Question._meta.db_table)
+        probe = (
+            f'COALESCE('
+            f'(SELECT id FROM {table} WHERE difficulty = %s AND random_key >= %s '
+            f'ORDER BY random_key LIMIT 1), '
+            f'(SELECT id FROM {table} WHERE difficulty = %s ORDER BY random_key LIMIT 1))'
+        )
+        sql = f'SELECT id FROM {table} WHERE id IN ({", ".join([probe] * probe_count)})'
+        params = []
+        for _ in range(probe_count):
+            params.extend([difficulty, random.random(), difficulty])
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def sample(self, difficulty, k, exclude_ids=None):
+        exclude_ids = exclude_ids or set()
+
+        chosen = []
+        for _ in range(self.MAX_ROUNDS):
+            needed = k - len(chosen)
+            if needed <= 0:
+                break
+
+            # Oversample to absorb duplicate hits and excluded questions
+            found = self._probe(difficulty, needed * 2 + 2)
+            random.shuffle(found)
+
+            for question_id in found:
+                if question_id in exclude_ids or question_id in chosen:
+                    continue
+                chosen.append(question_id)
+                if len(chosen) == k:
+                    break
+
+        if len(chosen) < k:
+            skip = set(exclude_ids) | set(chosen)
+            ids = Question.objects.filter(
+                difficulty=difficulty
+            ).order_by().values_list('id', flat=True).iterator(chunk_size=5000)
+            chosen.extend(reservoir_sample(ids, k - len(chosen), skip))
+
+        if chosen:
+            from .tasks import redraw_question_keys
+
+            # The worker runs the UPDATE, so starting a test never pays for it.
+            # Enqueued once the caller commits (at once outside an atomic block).
+            transaction.on_commit(lambda: redraw_question_keys.delay(chosen))
+        return chosen
+
+
+class PoolSampler:
+    """Samples from the in-memory per-difficulty ID pool (see question_pool.py)"""
+
+    MAX_ROUNDS = 4
+
+    def sample(self, difficulty, k, exclude_ids=None):
+        ids = question_pool.get_ids(difficulty)
+        if not exclude_ids:
+            return random.sample(ids, min(k, len(ids)))
+
+        chosen = []
+        for _ in range(self.MAX_ROUNDS):
+            needed = k - len(chosen)
+            if needed <= 0:
+                return chosen
+            for question_id in random.sample(ids, min(needed * 2, len(ids))):
+                if question_id not in exclude_ids and question_id not in chosen:
+                    chosen.append(question_id)
+                    if len(chosen) == k:
+                        return chosen
+
+        skip = set(exclude_ids) | set(chosen)
+        chosen.extend(reservoir_sample(ids, k - len(chosen), skip))
+        return chosen
+
+
+SAMPLERS = {
+    'pool': PoolSampler(),
+    'random_key': RandomKeySampler(),
+}
+
+
+def sample_question_ids(difficulty, k, exclude_ids=None):
+    """
+    Pick up to k distinct random question ids for a difficulty.
+
+    Uses the sampler selected by QUIZ_SAMPLING_STRATEGY. Fewer than k ids
+    are returned only when fewer than k eligible questions exist.
+    """
+    sampler = SAMPLERS[settings.QUIZ_SAMPLING_STRATEGY]
+    return sampler.sample(difficulty, k, exclude_ids)
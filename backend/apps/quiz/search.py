@@ -0,0 +1,242 @@
+import re
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Question
+
+
+# ============================================================================
+# QUESTION SEARCH - Full-text index over question text, options, explanation
+# ============================================================================
+# SQLite: FTS5 virtual table keyed by rowid = question id.
+# PostgreSQL: weighted tsvector per question with a GIN index.
+# Both are created by migration 0010 and kept in step by signals.py (and by
+# save_question_chunk for bulk imports); rebuild with
+# `manage.py rebuild_question_search`.
+SQLITE_TABLE = 'quiz_question_fts'
+POSTGRES_TABLE = 'quiz_question_search'
+REINDEX_BATCH_SIZE = 500
+MAX_QUERY_TERMS = 8
+TERM_RE = re.compile(r'\w+')
+
+
+def query_terms(query):
+    """Split a user query into index terms (punctuation/operators dropped)"""
+    return TERM_RE.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+class SQLiteSearchBackend:
+    """FTS5 with the porter stemmer; ranked by bm25 (text > options > explanation)"""
+
+    def reindex(self, cursor, question_ids):
+        placeholders = ', '.join(['%s'] * len(question_ids))
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid IN ({placeholders})', question_ids)
+        cursor.execute(
+            f'INSERT INTO {SQLITE_TABLE} (rowid, text, options, explanation) '
+            f'SELECT q.id, q.text, '
+            f"COALESCE((SELECT group_concat(o.text, ' ') FROM quiz_question_option o "
+            f"WHERE o.question_id = q.id), ''), COALESCE(q.explanation, '') "
+            f'FROM quiz_question q WHERE q.id IN ({placeholders})',
+            question_ids
+        )
+
+    def clear(self, cursor):
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+
+    def _match(self, terms):
+        # Every term must match; the last one as a prefix (search-as-you-type)
+        return ' '.join(f'"{term}"' for term in terms) + '*'
+
+    def _from(self, difficulty):
+        # FTS5's hidden MATCH column is named after the table, so no alias
+        if difficulty:
+            return (
+                f'FROM {SQLITE_TABLE} JOIN quiz_question q ON q.id = {SQLITE_TABLE}.rowid '
+                f'WHERE {SQLITE_TABLE} MATCH %s AND q.difficulty = %s'
+            )
+        return f'FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s'
+
+    def search(self, cursor, terms, difficulty, limit, offset):
+        params = [self._match(terms)] + ([difficulty] if difficulty else [])
+        cursor.execute(
+            f'SELECT {SQLITE_TABLE}.rowid, -bm25({SQLITE_TABLE}, 10.0, 4.0, 1.0) AS score '
+            f'{self._from(difficulty)} ORDER BY score DESC, {SQLITE_TABLE}.rowid LIMIT %s OFFSET %s',
+            params + [limit, offset]
+        )
+        return cursor.fetchall()
+
+    def count(self, cursor, terms, difficulty):
+        params = [self._match(terms)] + ([difficulty] if difficulty else [])
+        cursor.execute(f'SELECT COUNT(*) {self._from(difficulty)}', params)
+        return cursor.fetchone()[0]
+
+
+class PostgresSearchBackend:
+    """Weighted tsvector (text A, options B, explanation C) ranked by ts_rank_cd"""
+
+    def reindex(self, cursor, question_ids):
+        # Deleted questions drop out through the ON DELETE CASCADE foreign key
+        cursor.execute(
+            f'INSERT INTO {POSTGRES_TABLE} (question_id, document) '
+            f"SELECT q.id, setweight(to_tsvector('english', q.text), 'A') || "
+            f"setweight(to_tsvector('english', COALESCE(string_agg(o.text, ' '), '')), 'B') || "
+            f"setweight(to_tsvector('english', COALESCE(q.explanation, '')), 'C') "
+            f'FROM quiz_question q LEFT JOIN quiz_question_option o ON o.question_id = q.id '
+            f'WHERE q.id = ANY(%s) GROUP BY q.id '
+            f'ON CONFLICT (question_id) DO UPDATE SET document = EXCLUDED.document',
+            [list(question_ids)]
+        )
+
+    def clear(self, cursor):
+        cursor.execute(f'TRUNCATE {POSTGRES_TABLE}')
+
+    def _tsquery(self, terms):
+        return ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+
+    def _from(self, difficulty):
+        sql = f"FROM {POSTGRES_TABLE} s CROSS JOIN to_tsquery('english', %s) query "
+        if difficulty:
+            sql += 'JOIN quiz_question q ON q.id = s.question_id AND q.difficulty = %s '
+        return sql + 'WHERE s.document @@ query'
+
+    def search(self, cursor, terms, difficulty, limit, offset):
+        params = [self._tsquery(terms)] + ([difficulty] if difficulty else [])
+        cursor.execute(
+            f'SELECT s.question_id, ts_rank_cd(s.document, query) AS score '
+            f'{self._from(difficulty)} ORDER BY score DESC, s.question_id LIMIT %s OFFSET %s',
+            params + [limit, offset]
+        )
+        return cursor.fetchall()
+
+    def count(self, cursor, terms, difficulty):
+        params = [self._tsquery(terms)] + ([difficulty] if difficulty else [])
+        cursor.execute(f'SELECT COUNT(*) {self._from(difficulty)}', params)
+        return cursor.fetchone()[0]
+
+
+_BACKENDS = {
+    'sqlite': (SQLiteSearchBackend, SQLITE_TABLE),
+    'postgresql': (PostgresSearchBackend, POSTGRES_TABLE),
+}
+_available = {}
+
+
+def get_search_backend():
+    """
+    Return the index backend for the current database, or None when there
+    is no index (other databases, or SQLite built without FTS5).
+    """
+    if connection.vendor not in _BACKENDS:
+        return None
+    backend_class, table = _BACKENDS[connection.vendor]
+    if connection.alias not in _available:
+        _available[connection.alias] = table in connection.introspection.table_names()
+    return backend_class() if _available[connection.alias] else None
+
+
+def reindex_questions(question_ids):
+    """(Re)build index entries for questions; ids that no longer exist are dropped"""
+    backend = get_search_backend()
+    question_ids = list(question_ids)
+    if backend is None or not question_ids:
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(question_ids), REINDEX_BATCH_SIZE):
+            backend.reindex(cursor, question_ids[start:start + REINDEX_BATCH_SIZE])
+
+
+def rebuild_search_index(batch_size=REINDEX_BATCH_SIZE):
+    """Clear and rebuild the whole index; returns the number of questions indexed"""
+    backend = get_search_backend()
+    if backend is None:
+        return 0
+    indexed = 0
+    # One transaction, so searches never see a half-empty index
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            backend.clear(cursor)
+        ids = Question.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=batch_size)
+        for batch in iter(lambda: list(islice(ids, batch_size)), []):
+            reindex_questions(batch)
+            indexed += len(batch)
+    return indexed
+
+
+def search_question_ids(query, difficulty=None, limit=20, offset=0):
+    """
+    Return [(question_id, score)] best match first (higher score is better).
+
+    Without an index, falls back to an unranked LIKE scan (score 0).
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    backend = get_search_backend()
+    if backend is None:
+        ids = _fallback_queryset(terms, difficulty).values_list('id', flat=True)[offset:offset + limit]
+        return [(question_id, 0.0) for question_id in ids]
+    with connection.cursor() as cursor:
+        return backend.search(cursor, terms, difficulty, limit, offset)
+
+
+def count_matches(query, difficulty=None):
+    terms = query_terms(query)
+    if not terms:
+        return 0
+    backend = get_search_backend()
+    if backend is None:
+        return _fallback_queryset(terms, difficulty).count()
+    with connection.cursor() as cursor:
+        return backend.count(cursor, terms, difficulty)
+
+
+def _fallback_queryset(terms, difficulty):
+    questions = Question.objects.order_by('id')
+    if difficulty:
+        questions = questions.filter(difficulty=difficulty)
+    for term in terms:
+        questions = questions.filter(
+            Q(text__icontains=term) | Q(explanation__icontains=term)
+            | Q(options__text__icontains=term)
+        )
+    return questions.distinct()
+
+
+class QuestionSearchResults:
+    """
+    Ranked search results that Django's Paginator (and DRF pagination) can
+    count and slice; each slice runs one ranked index query plus one query
+    for the questions and their options. Questions get a `search_rank`.
+    """
+
+    def __init__(self, query, difficulty=None):
+        self.query = query
+        self.difficulty = difficulty
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = count_matches(self.query, self.difficulty)
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        offset = key.start or 0
+        limit = (key.stop if key.stop is not None else self.count()) - offset
+        hits = search_question_ids(self.query, self.difficulty, limit=max(limit, 0), offset=offset)
+        questions = Question.objects.prefetch_related('options').in_bulk(
+            [question_id for question_id, _ in hits]
+        )
+        results = []
+        for question_id, score in hits:
+            question = questions.get(question_id)
+            if question is not None:
+                question.search_rank = score
+                results.append(question)
+        return results
@@ -1,5 +1,9 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 from .models import Question, QuestionOption, TestAttempt, TestResponse
+from .question_cache import get_answer_keys, get_correct_answers, get_question_payloads
 
 
 # ============================================================================
@@ -25,15 +29,31 @@ class QuestionDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'text', 'difficulty')
 
 
+class QuestionOptionAdminSerializer(serializers.ModelSerializer):
+    """Serializer for options with the correct answer visible (content editors only)"""
+    
+    class Meta:
+        model = QuestionOption
+        fields = ('id', 'text', 'order', 'is_correct')
+
+
 class QuestionAdminSerializer(serializers.ModelSerializer):
     """Serializer for question administration with correct answers visible"""
-    options = QuestionOptionSerializer(many=True, read_only=True)
+    options = QuestionOptionAdminSerializer(many=True, read_only=True)
     
     class Meta:
         model = Question
         fields = ('id', 'text', 'difficulty', 'explanation', 'options', 'created_at')
 
 
+class QuestionSearchResultSerializer(QuestionAdminSerializer):
+    """Question search hit with its relevance score (higher is better)"""
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+    
+    class Meta(QuestionAdminSerializer.Meta):
+        fields = QuestionAdminSerializer.Meta.fields + ('rank',)
+
+
 # ============================================================================
 # TEST RESPONSE SERIALIZERS
 # ============================================================================
@@ -43,25 +63,60 @@ class SubmitAnswerSerializer(serializers.Serializer):
     option_id = serializers.IntegerField()
     
     def validate(self, data):
-        """Validate question and option exist"""
-        try:
-            question = Question.objects.get(id=data['question_id'])
-        except Question.DoesNotExist:
+        """Validate question and option exist (via the cached answer key)"""
+        answer_key = get_answer_keys([data['question_id']]).get(data['question_id'])
+        
+        if not answer_key:
             raise serializers.ValidationError('Question not found')
         
-        try:
-            option = QuestionOption.objects.get(
-                id=data['option_id'],
-                question_id=data['question_id']
-            )
-        except QuestionOption.DoesNotExist:
+        if data['option_id'] not in answer_key:
             raise serializers.ValidationError('Invalid option for this question')
         
-        data['question'] = question
-        data['option'] = option
+        data['is_correct'] = answer_key[data['option_id']]
         return data
 
 
+class AnswerItemSerializer(serializers.Serializer):
+    """Single answer inside a batch submission"""
+    question_id = serializers.IntegerField()
+    option_id = serializers.IntegerField()
+
+
+class SubmitAnswersBatchSerializer(serializers.Serializer):
+    """Serializer to submit many answers in one request"""
+    answers = AnswerItemSerializer(many=True, allow_empty=False)
+    complete = serializers.BooleanField(
+        default=False,
+        help_text='Complete and score the test after saving the answers'
+    )
+    time_taken_seconds = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        help_text='Only used when complete is true'
+    )
+    
+    def validate_answers(self, value):
+        """Limit batch size to the number of questions in a test"""
+        max_answers = settings.QUIZ_QUESTIONS_PER_TEST * 2
+        if len(value) > max_answers:
+            raise serializers.ValidationError(
+                f'At most {max_answers} answers can be submitted at once'
+            )
+        return value
+
+
+class TestResponseListSerializer(serializers.ListSerializer):
+    """Looks up correct answers for every response in one batch before rendering"""
+    
+    def to_representation(self, data):
+        responses = data.all() if isinstance(data, models.manager.BaseManager) else data
+        responses = list(responses)
+        self.child.correct_answers = get_correct_answers(
+            {response.question_id for response in responses}
+        )
+        return super().to_representation(responses)
+
+
 class TestResponseSerializer(serializers.ModelSerializer):
     """Serializer for test responses after completion"""
     question_text = serializers.CharField(source='question.text', read_only=True)
@@ -82,16 +137,24 @@ class TestResponseSerializer(serializers.ModelSerializer):
             'correct_answer_id',
             'correct_answer_text',
         )
+        list_serializer_class = TestResponseListSerializer
+    
+    def _get_correct_answer(self, obj):
+        """Get {'id', 'text'} of the correct answer from the batch index"""
+        correct_answers = getattr(self, 'correct_answers', None)
+        if correct_answers is None:
+            correct_answers = get_correct_answers([obj.question_id])
+        return correct_answers.get(obj.question_id)
     
     def get_correct_answer_id(self, obj):
         """Get ID of correct answer"""
-        correct = obj.question.options.filter(is_correct=True).first()
-        return correct.id if correct else None
+        correct = self._get_correct_answer(obj)
+        return correct['id'] if correct else None
     
     def get_correct_answer_text(self, obj):
         """Get text of correct answer"""
-        correct = obj.question.options.filter(is_correct=True).first()
-        return correct.text if correct else None
+        correct = self._get_correct_answer(obj)
+        return correct['text'] if correct else None
 
 
 # ============================================================================
@@ -179,10 +242,42 @@ class TestSessionSerializer(serializers.ModelSerializer):
     
     def get_questions(self, obj):
         """Return list of questions for the test"""
-        # Get all responses for this attempt
-        responses = TestResponse.objects.filter(attempt=obj).values_list('question_id', flat=True)
-        questions = Question.objects.filter(id__in=responses).order_by('id')
-        return QuestionDetailSerializer(questions, many=True).data
+        # Get question ids for this attempt, then assemble cached payloads
+        question_ids = sorted(
+            TestResponse.objects.filter(attempt=obj).values_list('question_id', flat=True)
+        )
+        return get_question_payloads(question_ids)
+
+
+def prefetch_test_results(tests):
+    """
+    Load everything TestResultSerializer renders for the given attempts
+    (responses with their question and selected option) in one query.
+    """
+    prefetch_related_objects(
+        tests,
+        Prefetch(
+            'responses',
+            queryset=TestResponse.objects.select_related('question', 'selected_option')
+        )
+    )
+    return tests
+
+
+def performance_rating(percentage):
+    """Get performance rating based on percentage"""
+    if percentage >= 90:
+        return 'Excellent'
+    elif percentage >= 80:
+        return 'Very Good'
+    elif percentage >= 70:
+        return 'Good'
+    elif percentage >= 60:
+        return 'Satisfactory'
+    elif percentage >= 50:
+        return 'Pass'
+    else:
+        return 'Needs Improvement'
 
 
 class TestResultSerializer(serializers.ModelSerializer):
@@ -236,20 +331,33 @@ class TestResultSerializer(serializers.ModelSerializer):
             'earned_points': obj.earned_points,
             'difficulty': obj.difficulty,
             'points_per_question': obj.get_points_per_question(),
-            'performance_rating': self._get_performance_rating(obj.percentage),
+            'performance_rating': performance_rating(obj.percentage),
         }
-    
-    def _get_performance_rating(self, percentage):
-        """Get performance rating based on percentage"""
-        if percentage >= 90:
-            return 'Excellent'
-        elif percentage >= 80:
-            return 'Very Good'
-        elif percentage >= 70:
-            return 'Good'
-        elif percentage >= 60:
-            return 'Satisfactory'
-        elif percentage >= 50:
-            return 'Pass'
-        else:
-            return 'Needs Improvement'
+
+
+def render_score_summary(test):
+    """Build the TestScoreSummaryView payload for a completed attempt"""
+    return {
+        'test_id': test.id,
+        'user_email': test.user.email,
+        'difficulty': test.difficulty,
+        'difficulty_display': test.get_difficulty_display(),
+        'started_at': test.started_at,
+        'completed_at': test.completed_at,
+        'time_taken_seconds': test.time_taken_seconds,
+        'scoring': {
+            'total_questions': test.total_questions,
+            'answered_questions': test.answered_questions,
+            'unanswered_questions': test.unanswered_questions,
+            'correct_answers': test.correct_answers,
+            'incorrect_answers': test.incorrect_answers,
+            'total_score': test.total_score,
+            'max_score': test.max_score,
+            'percentage': round(test.percentage, 2),
+            'points_per_question': test.get_points_per_question(),
+        },
+        'rewards': {
+            'earned_points': test.earned_points,
+            'performance_rating': performance_rating(test.percentage),
+        }
+    }
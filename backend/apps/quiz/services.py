@@ -0,0 +1,282 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework import status
+
+from apps.accounts.stats import record_test_completion
+from apps.core.metrics import metrics
+from apps.rewards.ledger import record_test_points
+from .answer_buffer import flush_attempt, get_answer_buffer
+from .models import TestAttempt, TestResponse
+
+
+class SubmissionError(Exception):
+    """Raised when an answer cannot be recorded against a test attempt"""
+    
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+# ============================================================================
+# TEST PROVISIONING
+# ============================================================================
+def provision_test(user, difficulty, question_ids):
+    """
+    Create a test attempt with a blank response per question.
+
+    Runs as a single transaction with one bulk INSERT for the responses, so
+    a failure never leaves a half-built attempt behind. The block only
+    writes, which lets SQLite take the write lock up front instead of
+    failing on a read-to-write lock upgrade under concurrency.
+    """
+    with transaction.atomic():
+        attempt = TestAttempt.objects.create(
+            user=user,
+            difficulty=difficulty,
+            total_questions=len(question_ids)
+        )
+        TestResponse.objects.bulk_create([
+            TestResponse(attempt=attempt, question_id=question_id)
+            for question_id in question_ids
+        ])
+    return attempt
+
+
+# ============================================================================
+# ANSWER SUBMISSION
+# ============================================================================
+def attempt_expiry_cutoff(now=None):
+    """Attempts started before this moment are past the time limit"""
+    now = now or timezone.now()
+    return now - timedelta(seconds=settings.QUIZ_ATTEMPT_TIME_LIMIT_SECONDS)
+
+
+def is_attempt_expired(test, now=None):
+    """Check if an in-progress attempt has run past the time limit"""
+    return not test.is_completed and test.started_at < attempt_expiry_cutoff(now)
+
+
+def claim_attempt(test_id, user=None, unexpired=False):
+    """
+    Lock an in-progress attempt for the rest of the current transaction.
+
+    A no-op conditional UPDATE issued before any read: it takes the row lock
+    (and SQLite's write lock) up front, so the transaction never has to
+    upgrade a read lock, and a concurrent completion queues behind it and
+    then finds nothing to complete. Returns whether an in-progress attempt
+    matched (owned by `user`, and within the time limit if `unexpired`).
+    """
+    attempts = TestAttempt.objects.filter(pk=test_id, is_completed=False)
+    if user is not None:
+        attempts = attempts.filter(user=user)
+    if unexpired:
+        attempts = attempts.filter(started_at__gte=attempt_expiry_cutoff())
+    return bool(attempts.update(is_completed=False))
+
+
+def record_answer(user, test_id, question_id, option_id, is_correct):
+    """
+    Record an answer with a single UPDATE.
+
+    Every question in a test already has a response row (see
+    provision_test), so the attempt's own question set is the set of rows
+    this UPDATE can match. Ownership and completion are checked in the same
+    statement; only a rejected submission costs an extra query to explain why.
+    
+    With QUIZ_ANSWER_BUFFER_BACKEND set, the same check is a read-only
+    EXISTS and the answer goes to the write-behind buffer instead.
+    """
+    responses = TestResponse.objects.filter(
+        attempt_id=test_id,
+        attempt__user=user,
+        attempt__is_completed=False,
+        attempt__started_at__gte=attempt_expiry_cutoff(),
+        question_id=question_id,
+    )
+    
+    buffer = get_answer_buffer()
+    if buffer is not None:
+        if not responses.exists():
+            raise explain_rejected_submission(user, test_id)
+        buffer.put(test_id, question_id, option_id, is_correct)
+        metrics.incr('quiz.answer_buffer.buffered')
+        return
+    
+    updated = responses.update(
+        selected_option_id=option_id,
+        is_correct=is_correct,
+        is_unanswered=False,
+    )
+    
+    if not updated:
+        raise explain_rejected_submission(user, test_id)
+
+
+def explain_rejected_submission(user, test_id):
+    """Build the SubmissionError for an answer that matched no response row"""
+    state = TestAttempt.objects.filter(
+        id=test_id,
+        user=user
+    ).values_list('is_completed', 'started_at').first()
+    
+    if state is None:
+        return SubmissionError('Test not found', status.HTTP_404_NOT_FOUND)
+    is_completed, started_at = state
+    if is_completed:
+        return SubmissionError('Test is already completed')
+    if started_at < attempt_expiry_cutoff():
+        return SubmissionError('Test time limit has expired')
+    return SubmissionError('Question is not part of this test')
+
+
+def record_answers(test, answers):
+    """
+    Record many answers for one attempt with a single bulk upsert.
+
+    The caller must have claimed the attempt (claim_attempt) in the current
+    transaction, so a concurrent completion cannot score it in between.
+    `answers` is a list of {'question_id', 'option_id'} dicts. Every item is
+    validated first (cached answer keys + the attempt's own question set);
+    if any item is invalid nothing is written. Returns (results, ok) where
+    results holds one entry per input item, in order.
+    """
+    from .question_cache import get_answer_keys
+    
+    question_ids = {answer['question_id'] for answer in answers}
+    answer_keys = get_answer_keys(question_ids)
+    test_question_ids = set(
+        TestResponse.objects.filter(
+            attempt=test,
+            question_id__in=question_ids
+        ).values_list('question_id', flat=True)
+    )
+    
+    results = []
+    latest = {}
+    for answer in answers:
+        question_id = answer['question_id']
+        option_id = answer['option_id']
+        answer_key = answer_keys.get(question_id)
+        
+        if not answer_key:
+            error = 'Question not found'
+        elif option_id not in answer_key:
+            error = 'Invalid option for this question'
+        elif question_id not in test_question_ids:
+            error = 'Question is not part of this test'
+        else:
+            error = None
+        
+        if error:
+            results.append({'question_id': question_id, 'status': 'error', 'error': error})
+        else:
+            results.append({
+                'question_id': question_id,
+                'status': 'ok',
+                'is_correct': answer_key[option_id],
+            })
+            # Later answers to the same question win
+            latest[question_id] = TestResponse(
+                attempt=test,
+                question_id=question_id,
+                selected_option_id=option_id,
+                is_correct=answer_key[option_id],
+                is_unanswered=False,
+            )
+    
+    ok = all(result['status'] == 'ok' for result in results)
+    if ok and latest:
+        # Buffered answers are older than this batch, so write them first
+        flush_attempt(test.id, claimed=True)
+        TestResponse.objects.bulk_create(
+            latest.values(),
+            update_conflicts=True,
+            unique_fields=['attempt', 'question'],
+            update_fields=['selected_option', 'is_correct', 'is_unanswered'],
+        )
+    return results, ok
+
+
+# ============================================================================
+# TEST COMPLETION
+# ============================================================================
+def complete_test(test, time_taken_seconds=None):
+    """
+    Score an attempt from its responses and mark it completed.
+
+    The conditional UPDATE that marks the attempt completed runs first and
+    is the serialization point: only one request can win it, and the write
+    lock it takes is held until commit. Buffered answers are flushed after
+    the claim wins, so scoring sees every one of them, and a concurrent
+    flush queues behind the claim and then drops its entries. All counts
+    come from one conditional aggregate and the scores are written with a
+    single UPDATE. Only the winner records its points grant and adds it to
+    the user's profile totals (in the same transaction).
+
+    Returns True when this call completed the attempt. False means another
+    request completed it first: nothing was saved and `test` holds scores
+    that were never stored, so callers must not serve or snapshot them.
+    """
+    # No savepoint: callers already in a transaction just extend it
+    with transaction.atomic(savepoint=False):
+        completed_at = timezone.now()
+        claimed = TestAttempt.objects.filter(pk=test.pk, is_completed=False).update(
+            is_completed=True,
+            completed_at=completed_at,
+        )
+        if not claimed:
+            return False
+
+        # Persist any write-behind answers before scoring
+        flush_attempt(test.id, claimed=True)
+        
+        # Calculate statistics in one pass over the responses
+        counts = TestResponse.objects.filter(attempt=test).aggregate(
+            correct=Count('id', filter=Q(is_correct=True)),
+            answered=Count('id', filter=Q(is_unanswered=False)),
+            unanswered=Count('id', filter=Q(is_unanswered=True)),
+        )
+        
+        # Update test attempt with counts
+        test.correct_answers = counts['correct']
+        test.answered_questions = counts['answered']
+        test.unanswered_questions = counts['unanswered']
+        test.incorrect_answers = counts['answered'] - counts['correct']
+        
+        # Calculate scores based on difficulty
+        test.calculate_scores()
+        
+        # Set completion details
+        test.completed_at = completed_at
+        test.is_completed = True
+        
+        # Optional: set time taken if provided
+        if time_taken_seconds:
+            test.time_taken_seconds = int(time_taken_seconds)
+        
+        TestAttempt.objects.filter(pk=test.pk).update(
+            **{field: getattr(test, field) for field in COMPLETION_FIELDS}
+        )
+        record_test_points(test)
+        record_test_completion(test)
+    return True
+
+
+COMPLETION_FIELDS = [
+    'correct_answers',
+    'answered_questions',
+    'unanswered_questions',
+    'incorrect_answers',
+    'total_score',
+    'max_score',
+    'percentage',
+    'earned_points',
+    'completed_at',
+    'is_completed',
+    'time_taken_seconds',
+]
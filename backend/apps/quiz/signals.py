@@ -0,0 +1,107 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Question, QuestionOption
+from .paper_pool import discard_papers
+from .question_cache import invalidate_question
+from .question_counts import adjust_question_count
+from .question_pool import question_pool
+from .search import reindex_questions
+
+
+# ============================================================================
+# QUESTION POOL SYNC - Keep in-memory ID pools in step with the question bank
+# ============================================================================
+@receiver(post_save, sender=Question)
+def sync_question_pool_on_save(sender, instance, created, **kwargs):
+    """Add new questions to their pool; move edited ones if difficulty changed"""
+    def apply():
+        if not created:
+            question_pool.discard(instance.pk)
+        question_pool.add(instance.pk, instance.difficulty)
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Question)
+def discard_papers_on_difficulty_change(sender, instance, created, **kwargs):
+    """Papers of the old difficulty would keep serving a moved question"""
+    previous = getattr(instance, '_previous_difficulty', None)
+    if previous is not None and previous != instance.difficulty:
+        discard_papers(previous)
+
+
+@receiver(post_delete, sender=Question)
+def sync_question_pool_on_delete(sender, instance, **kwargs):
+    """Remove deleted questions from their pool and any papers using them"""
+    question_pool.discard(instance.pk)
+    discard_papers(instance.difficulty)
+
+
+# ============================================================================
+# QUESTION CACHE SYNC - Drop cached fragments and answer keys on content changes
+# ============================================================================
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_cache_on_question_change(sender, instance, **kwargs):
+    """Invalidate the cached question once the change is committed"""
+    question_id = instance.pk
+    transaction.on_commit(lambda: invalidate_question(question_id))
+
+
+@receiver(post_save, sender=QuestionOption)
+@receiver(post_delete, sender=QuestionOption)
+def invalidate_cache_on_option_change(sender, instance, **kwargs):
+    """Invalidate the parent question once the change is committed"""
+    question_id = instance.question_id
+    transaction.on_commit(lambda: invalidate_question(question_id))
+
+
+# ============================================================================
+# QUESTION COUNTERS - Per-difficulty totals updated in the same transaction
+# ============================================================================
+@receiver(pre_save, sender=Question)
+def remember_previous_difficulty(sender, instance, **kwargs):
+    """Record the stored difficulty of an edited question"""
+    instance._previous_difficulty = None
+    if not instance._state.adding:
+        instance._previous_difficulty = Question.objects.filter(
+            pk=instance.pk
+        ).values_list('difficulty', flat=True).first()
+
+
+@receiver(post_save, sender=Question)
+def count_question_on_save(sender, instance, created, **kwargs):
+    """Count new questions and move edited ones between difficulties"""
+    previous = getattr(instance, '_previous_difficulty', None)
+    if created or previous is None:
+        adjust_question_count(instance.difficulty, 1)
+    elif previous != instance.difficulty:
+        adjust_question_count(previous, -1)
+        adjust_question_count(instance.difficulty, 1)
+
+
+@receiver(post_delete, sender=Question)
+def count_question_on_delete(sender, instance, **kwargs):
+    """Uncount deleted questions"""
+    adjust_question_count(instance.difficulty, -1)
+
+
+# ============================================================================
+# SEARCH INDEX SYNC - Reindex questions once their changes are committed
+# ============================================================================
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def reindex_question_on_change(sender, instance, **kwargs):
+    """Index new or edited questions; drop deleted ones"""
+    question_id = instance.pk
+    transaction.on_commit(lambda: reindex_questions([question_id]))
+
+
+@receiver(post_save, sender=QuestionOption)
+@receiver(post_delete, sender=QuestionOption)
+def reindex_question_on_option_change(sender, instance, **kwargs):
+    """Options are part of their question's search document"""
+    question_id = instance.question_id
+    transaction.on_commit(lambda: reindex_questions([question_id]))
@@ -0,0 +1,93 @@
+import json
+import zlib
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.core.metrics import metrics
+from .models import TestResultSnapshot
+from .serializers import TestResultSerializer, prefetch_test_results, render_score_summary
+
+
+# ============================================================================
+# RESULT SNAPSHOTS - Frozen results of completed tests
+# ============================================================================
+# Bump when TestResultSerializer or render_score_summary output changes;
+# older snapshots are then re-rendered on first read
+SNAPSHOT_SCHEMA_VERSION = 1
+
+
+def _compress(data):
+    return zlib.compress(json.dumps(data, cls=JSONEncoder).encode())
+
+
+def _decompress(blob):
+    return json.loads(zlib.decompress(bytes(blob)))
+
+
+def build_snapshot(test):
+    """
+    Render a completed attempt into an unsaved TestResultSnapshot.
+
+    Expects test.user to be loaded and the results prefetched (see
+    prefetch_test_results); returns (snapshot, result_data).
+    """
+    result = TestResultSerializer(test).data
+    snapshot = TestResultSnapshot(
+        attempt=test,
+        user_id=test.user_id,
+        schema_version=SNAPSHOT_SCHEMA_VERSION,
+        result=_compress(result),
+        summary=_compress(render_score_summary(test)),
+    )
+    return snapshot, result
+
+
+def save_snapshots(snapshots, replace_outdated=False):
+    """
+    Insert snapshots. Attempts that already have one keep it, unless
+    replace_outdated is set (backfills and re-renders of snapshots from an
+    older schema version), which upserts instead.
+    """
+    if replace_outdated:
+        TestResultSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['attempt'],
+            update_fields=['schema_version', 'result', 'summary'],
+        )
+    else:
+        TestResultSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+
+
+def write_snapshot(test, replace_outdated=False):
+    """Snapshot a completed attempt and return its rendered results"""
+    snapshot, result = build_snapshot(test)
+    save_snapshots([snapshot], replace_outdated=replace_outdated)
+    return result
+
+
+def load_snapshot(user, test_id, field):
+    """
+    Return the decoded 'result' or 'summary' of a user's test snapshot with
+    a single-row read, or None if there is no current snapshot.
+    """
+    row = TestResultSnapshot.objects.filter(
+        attempt_id=test_id,
+        user=user,
+        schema_version=SNAPSHOT_SCHEMA_VERSION
+    ).values_list(field, flat=True).first()
+
+    if row is None:
+        metrics.incr('quiz.result_snapshot.miss')
+        return None
+    metrics.incr('quiz.result_snapshot.hit')
+    return _decompress(row)
+
+
+def snapshot_test(test):
+    """
+    Build and save a snapshot for an attempt loaded without its results,
+    replacing a snapshot from an older schema version (a read-time miss).
+    """
+    prefetch_test_results([test])
+    return write_snapshot(test, replace_outdated=True)
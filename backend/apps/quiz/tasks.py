@@ -0,0 +1,51 @@
+from celery import shared_task
+
+from . import answer_buffer, expiry, paper_pool, sampling
+from .models import Question
+
+
+# ============================================================================
+# PAPER POOL TASKS
+# ============================================================================
+@shared_task
+def refill_paper_pool(difficulty):
+    """Refill the prepared paper pool for one difficulty"""
+    return paper_pool.refill(difficulty)
+
+
+@shared_task
+def refill_all_paper_pools():
+    """Periodic top-up of every difficulty so pools are warm before peaks"""
+    if not paper_pool.is_enabled():
+        return {}
+    return {
+        difficulty: paper_pool.refill(difficulty)
+        for difficulty, _ in Question.DIFFICULTY_CHOICES
+    }
+
+
+# ============================================================================
+# SAMPLING TASKS
+# ============================================================================
+@shared_task
+def redraw_question_keys(question_ids):
+    """Give questions picked by the random_key sampler fresh keys"""
+    sampling.redraw_keys(question_ids)
+
+
+# ============================================================================
+# ANSWER BUFFER TASKS
+# ============================================================================
+@shared_task
+def flush_answer_buffers():
+    """Periodically persist write-behind answers for in-progress tests"""
+    return answer_buffer.flush_all()
+
+
+# ============================================================================
+# ATTEMPT EXPIRY TASKS
+# ============================================================================
+@shared_task
+def expire_stale_attempts():
+    """Periodically expire attempts abandoned past the time limit"""
+    return expiry.expire_stale_attempts()
@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from . import answer_buffer
+from .models import Question, QuestionOption, TestResponse
+from .services import complete_test, provision_test
+
+
+# ============================================================================
+# ANSWER ENDPOINT - Query counts for POST /api/quiz/test/<id>/answer/
+# ============================================================================
+class SubmitAnswerQueryCountTests(APITestCase):
+    """The answer endpoint is the hottest write path; pin its query count"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='answers@example.com', password='answer-pass-123')
+        questions = Question.objects.bulk_create([
+            Question(text=f'Answer question {i}', difficulty='easy')
+            for i in range(15)
+        ])
+        QuestionOption.objects.bulk_create([
+            QuestionOption(question=question, text=f'Option {order}', order=order, is_correct=order == 0)
+            for question in questions
+            for order in range(4)
+        ])
+        cls.question_ids = [question.id for question in questions]
+
+    def setUp(self):
+        cache.clear()
+        # Buffer backends are cached per process; give each test a fresh one
+        answer_buffer._load_backend.cache_clear()
+        self.addCleanup(answer_buffer._load_backend.cache_clear)
+        self.client.force_authenticate(self.user)
+        self.test = provision_test(self.user, 'easy', self.question_ids)
+        self.url = f'/api/quiz/test/{self.test.id}/answer/'
+
+    def answer(self, question_id, order=0):
+        option = QuestionOption.objects.get(question_id=question_id, order=order)
+        return {'question_id': question_id, 'option_id': option.id}
+
+    def test_answer_with_cached_answer_key_is_one_update(self):
+        # The first answer caches the question's answer key
+        self.client.post(self.url, self.answer(self.question_ids[1]), format='json')
+        data = self.answer(self.question_ids[1], order=2)
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['is_correct'])
+        saved = TestResponse.objects.get(attempt=self.test, question_id=self.question_ids[1])
+        self.assertEqual(saved.selected_option_id, data['option_id'])
+        self.assertFalse(saved.is_unanswered)
+
+    def test_answer_key_miss_costs_one_lookup(self):
+        data = self.answer(self.question_ids[0])
+
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_correct'])
+
+    def test_answer_to_completed_test_is_rejected(self):
+        complete_test(self.test)
+        data = self.answer(self.question_ids[0])
+        self.client.post(self.url, data, format='json')
+
+        # The UPDATE matches nothing, then one read explains why
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Test is already completed')
+
+    @override_settings(QUIZ_ANSWER_BUFFER_BACKEND='apps.quiz.answer_buffer.LocMemAnswerBuffer')
+    def test_buffered_answer_is_one_exists_check(self):
+        data = self.answer(self.question_ids[1])
+        self.client.post(self.url, data, format='json')
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            TestResponse.objects.get(attempt=self.test, question_id=self.question_ids[1]).is_unanswered
+        )
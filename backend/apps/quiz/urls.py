@@ -3,12 +3,16 @@ from .views import (
     StartTestView,
     GetTestView,
     SubmitAnswerView,
+    SubmitAnswersBatchView,
     CompleteTestView,
     TestResultsView,
     TestScoreSummaryView,
     UserTestHistoryView,
+    UserTestHistoryStatsView,
     ActiveTestView,
     QuestionListView,
+    QuestionExportView,
+    QuestionSearchView,
 )
 
 app_name = 'quiz'
@@ -16,6 +20,8 @@ app_name = 'quiz'
 urlpatterns = [
     # Questions
     path('questions/', QuestionListView.as_view(), name='question-list'),
+    path('questions/export/', QuestionExportView.as_view(), name='question-export'),
+    path('questions/search/', QuestionSearchView.as_view(), name='question-search'),
     
     # Test Management
     path('start/', StartTestView.as_view(), name='start-test'),
@@ -25,6 +31,7 @@ urlpatterns = [
     
     # Answer Submission
     path('test/<int:test_id>/answer/', SubmitAnswerView.as_view(), name='submit-answer'),
+    path('test/<int:test_id>/answers/', SubmitAnswersBatchView.as_view(), name='submit-answers-batch'),
     
     # Test Completion & Results
     path('test/<int:test_id>/complete/', CompleteTestView.as_view(), name='complete-test'),
@@ -33,4 +40,5 @@ urlpatterns = [
     
     # History
     path('history/', UserTestHistoryView.as_view(), name='test-history'),
+    path('history/stats/', UserTestHistoryStatsView.as_view(), name='test-history-stats'),
 ]
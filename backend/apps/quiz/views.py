@@ -3,16 +3,43 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-from django.utils import timezone
-from django.db.models import Q
-import random
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Case, Count, IntegerField, Max, Q, Value, When
+from apps.core.conditional import conditional, get_version
+from apps.core.pagination import KeysetPagination
+from apps.core.streaming import iter_csv, iter_json_array, iter_jsonl, streaming_response
 from .models import Question, QuestionOption, TestAttempt, TestResponse
+from .answer_buffer import flush_attempt
+from .expiry import expire_attempt
+from .paper_pool import pop_paper
+from .permissions import IsContentEditor
+from .question_cache import QUESTION_BANK_VERSION
+from .question_counts import DIFFICULTIES, get_question_counts
+from .question_export import csv_row, iter_question_records
+from .question_import import CSV_FIELDS
+from .search import QuestionSearchResults
+from .sampling import sample_question_ids
+from .snapshots import load_snapshot, snapshot_test, write_snapshot
+from .services import (
+    SubmissionError,
+    claim_attempt,
+    complete_test,
+    explain_rejected_submission,
+    is_attempt_expired,
+    provision_test,
+    record_answer,
+    record_answers,
+)
 from .serializers import (
     StartTestSerializer,
     TestSessionSerializer,
     TestAttemptSerializer,
-    TestResultSerializer,
     SubmitAnswerSerializer,
+    SubmitAnswersBatchSerializer,
+    QuestionSearchResultSerializer,
+    prefetch_test_results,
+    render_score_summary,
 )
 
 
@@ -32,7 +59,7 @@ class StartTestView(APIView):
             "difficulty": "easy|medium|hard"
         }
         
-        Returns: Active test with 15 random questions
+        Returns: Active test with QUIZ_QUESTIONS_PER_TEST random questions
         """
         serializer = StartTestSerializer(data=request.data)
         
@@ -40,6 +67,7 @@ class StartTestView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         difficulty = serializer.validated_data['difficulty']
+        question_count = settings.QUIZ_QUESTIONS_PER_TEST
         
         # Check if user has an active test
         active_test = TestAttempt.objects.filter(
@@ -47,41 +75,47 @@ class StartTestView(APIView):
             is_completed=False
         ).first()
         
+        if active_test and is_attempt_expired(active_test):
+            # Abandoned past the time limit - close it instead of blocking
+            expire_attempt(active_test)
+            active_test = None
+        
         if active_test:
             return Response(
                 {'error': 'You already have an active test. Complete or abandon it first.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get 15 random questions of selected difficulty
-        questions = list(
-            Question.objects.filter(difficulty=difficulty)
-            .values_list('id', flat=True)
-        )
-        
-        if len(questions) < 15:
-            return Response(
-                {'error': f'Not enough questions available for {difficulty} difficulty. '
-                          f'Available: {len(questions)}, Required: 15'},
-                status=status.HTTP_400_BAD_REQUEST
+        # Questions this user has already been given (optional)
+        seen_question_ids = None
+        if settings.QUIZ_EXCLUDE_SEEN_QUESTIONS:
+            seen_question_ids = set(
+                TestResponse.objects.filter(attempt__user=request.user)
+                .values_list('question_id', flat=True)
             )
         
-        # Randomly select 15 questions
-        selected_questions = random.sample(questions, 15)
+        # Prefer a pre-generated paper; fall back to sampling on demand.
+        # Papers are not per-user, so skip them when excluding seen questions.
+        selected_questions = None if seen_question_ids else pop_paper(difficulty)
         
-        # Create test attempt
-        test_attempt = TestAttempt.objects.create(
-            user=request.user,
-            difficulty=difficulty,
-            total_questions=15
-        )
-        
-        # Create test responses for each question (no answer yet)
-        for question_id in selected_questions:
-            TestResponse.objects.create(
-                attempt=test_attempt,
-                question_id=question_id
+        if selected_questions is None:
+            selected_questions = sample_question_ids(
+                difficulty, question_count, seen_question_ids
             )
+            
+            if seen_question_ids and len(selected_questions) < question_count:
+                # Not enough unseen questions left - allow repeats
+                selected_questions = sample_question_ids(difficulty, question_count)
+            
+            if len(selected_questions) < question_count:
+                return Response(
+                    {'error': f'Not enough questions available for {difficulty} difficulty. '
+                              f'Available: {len(selected_questions)}, Required: {question_count}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        # Create test attempt and blank responses in one transaction
+        test_attempt = provision_test(request.user, difficulty, selected_questions)
         
         # Return test session with questions
         test_session = TestSessionSerializer(test_attempt).data
@@ -102,6 +136,10 @@ class ActiveTestView(APIView):
             is_completed=False
         ).first()
         
+        if active_test and is_attempt_expired(active_test):
+            expire_attempt(active_test)
+            active_test = None
+        
         if not active_test:
             return Response(
                 {'error': 'No active test'},
@@ -119,10 +157,34 @@ class ActiveTestView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+def test_session_validators(request, test_id=None):
+    """
+    Validate a test session by its state and the question bank version.
+    
+    Resuming an in-progress test persists answers still sitting in the
+    write-behind buffer here, so it happens even when the response is a 304.
+    """
+    tests = TestAttempt.objects.filter(user=request.user)
+    if test_id:
+        tests = tests.filter(id=test_id)
+    else:
+        tests = tests.filter(is_completed=False)
+    
+    state = tests.values_list('id', 'is_completed').first()
+    if state is None:
+        return None
+    
+    attempt_id, is_completed = state
+    if not is_completed:
+        flush_attempt(attempt_id)
+    return (state, get_version(QUESTION_BANK_VERSION)), None
+
+
 class GetTestView(APIView):
     """Retrieve active test session"""
     permission_classes = [IsAuthenticated]
     
+    @conditional('quiz.test_session', test_session_validators)
     def get(self, request, test_id=None):
         """
         Get test session
@@ -150,6 +212,7 @@ class GetTestView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
         
+        # Buffered answers were flushed by test_session_validators
         serializer = TestSessionSerializer(test)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -173,44 +236,86 @@ class SubmitAnswerView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        # Get test attempt
+        question_id = serializer.validated_data['question_id']
+        option_id = serializer.validated_data['option_id']
+        is_correct = serializer.validated_data['is_correct']
+        
+        # Validate against this attempt's questions and save in one statement
         try:
-            test = TestAttempt.objects.get(id=test_id, user=request.user)
-        except TestAttempt.DoesNotExist:
-            return Response(
-                {'error': 'Test not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            record_answer(request.user, test_id, question_id, option_id, is_correct)
+        except SubmissionError as e:
+            return Response({'error': e.message}, status=e.status_code)
         
-        if test.is_completed:
-            return Response(
-                {'error': 'Test is already completed'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        return Response({
+            'message': 'Answer submitted',
+            'is_correct': is_correct,
+            'question_id': question_id,
+        }, status=status.HTTP_200_OK)
+
+
+class SubmitAnswersBatchView(APIView):
+    """Submit many answers (and optionally complete the test) in one request"""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, test_id):
+        """
+        Submit a batch of answers
         
-        question = serializer.validated_data['question']
-        option = serializer.validated_data['option']
+        Request body:
+        {
+            "answers": [
+                {"question_id": 1, "option_id": 4},
+                {"question_id": 2, "option_id": 7}
+            ],
+            "complete": false,
+            "time_taken_seconds": 1200
+        }
         
-        # Get or create test response
-        test_response, created = TestResponse.objects.get_or_create(
-            attempt=test,
-            question=question,
-            defaults={'selected_option': option}
-        )
+        All answers are applied in one transaction, or none are if any item
+        is invalid. Returns per-item results, plus the full test results
+        when "complete" is true.
+        """
+        serializer = SubmitAnswersBatchSerializer(data=request.data)
         
-        if not created:
-            # Update existing response
-            test_response.selected_option = option
-            test_response.save()
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        # Check if answer is correct
-        is_correct = option.is_correct
+        data = serializer.validated_data
         
-        return Response({
-            'message': 'Answer submitted',
-            'is_correct': is_correct,
-            'question_id': question.id,
-        }, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            # Claim the attempt with a write before reading anything, so a
+            # completion cannot score it between these checks and the upsert
+            if not claim_attempt(test_id, user=request.user, unexpired=True):
+                error = explain_rejected_submission(request.user, test_id)
+                return Response({'error': error.message}, status=error.status_code)
+            
+            test = TestAttempt.objects.select_related('user').get(id=test_id)
+            results, ok = record_answers(test, data['answers'])
+            
+            if not ok:
+                return Response({
+                    'error': 'Some answers were rejected; nothing was saved',
+                    'results': results,
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if data['complete'] and not complete_test(test, data.get('time_taken_seconds')):
+                # A concurrent request completed it first; keep none of this batch
+                transaction.set_rollback(True)
+                return Response(
+                    {'error': 'Test is already completed'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        response_data = {
+            'message': f'{len(results)} answers submitted',
+            'results': results,
+            'is_completed': test.is_completed,
+        }
+        if test.is_completed:
+            prefetch_test_results([test])
+            response_data['test'] = write_snapshot(test)
+        
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 class CompleteTestView(APIView):
@@ -234,7 +339,7 @@ class CompleteTestView(APIView):
         }
         """
         try:
-            test = TestAttempt.objects.get(id=test_id, user=request.user)
+            test = TestAttempt.objects.select_related('user').get(id=test_id, user=request.user)
         except TestAttempt.DoesNotExist:
             return Response(
                 {'error': 'Test not found'},
@@ -247,38 +352,26 @@ class CompleteTestView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get all responses for this test
-        responses = TestResponse.objects.filter(attempt=test)
-        
-        # Calculate statistics
-        correct_count = responses.filter(is_correct=True).count()
-        answered_count = responses.filter(is_unanswered=False).count()
-        unanswered_count = responses.filter(is_unanswered=True).count()
-        incorrect_count = answered_count - correct_count
-        
-        # Update test attempt with counts
-        test.correct_answers = correct_count
-        test.answered_questions = answered_count
-        test.unanswered_questions = unanswered_count
-        test.incorrect_answers = incorrect_count
-        
-        # Calculate scores based on difficulty
-        test.calculate_scores()
-        
-        # Set completion details
-        test.completed_at = timezone.now()
-        test.is_completed = True
-        
-        # Optional: set time taken if provided
-        time_taken = request.data.get('time_taken_seconds')
-        if time_taken:
-            test.time_taken_seconds = int(time_taken)
-        
-        test.save()
+        if is_attempt_expired(test):
+            # Closed per QUIZ_EXPIRED_ATTEMPT_ACTION, as the sweep would
+            expire_attempt(test)
+            return Response(
+                {'error': 'Test time limit has expired'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not complete_test(test, request.data.get('time_taken_seconds')):
+            # A concurrent request completed it first and wrote the snapshot
+            return Response(
+                {'error': 'Test is already completed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Return comprehensive results
-        serializer = TestResultSerializer(test)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Results never change from here on, so freeze the rendered results
+        # built from the in-memory attempt
+        prefetch_test_results([test])
+        result = write_snapshot(test)
+        return Response(result, status=status.HTTP_200_OK)
 
 
 class TestResultsView(APIView):
@@ -287,8 +380,12 @@ class TestResultsView(APIView):
     
     def get(self, request, test_id):
         """Get completed test results with answers"""
+        result = load_snapshot(request.user, test_id, 'result')
+        if result is not None:
+            return Response(result, status=status.HTTP_200_OK)
+        
         try:
-            test = TestAttempt.objects.get(id=test_id, user=request.user)
+            test = TestAttempt.objects.select_related('user').get(id=test_id, user=request.user)
         except TestAttempt.DoesNotExist:
             return Response(
                 {'error': 'Test not found'},
@@ -301,23 +398,114 @@ class TestResultsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        serializer = TestResultSerializer(test)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # No snapshot yet (completed before snapshots, or the write failed)
+        result = snapshot_test(test)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class TestHistoryPagination(KeysetPagination):
+    """Newest-first keyset pages over completed tests"""
+    timestamp_field = 'completed_at'
+
+
+def test_history_validators(request):
+    """Completed tests never change, so count + latest completion suffice"""
+    state = TestAttempt.objects.filter(
+        user=request.user,
+        is_completed=True
+    ).aggregate(count=Count('id'), latest=Max('completed_at'))
+    return (state['count'], state['latest']), state['latest']
 
 
 class UserTestHistoryView(APIView):
-    """Get all completed tests for user"""
+    """
+    Get completed tests for user.
+    
+    Returns keyset-paginated pages ({'next', 'results'}); follow `next` to
+    page further back. `?export=json` or `?export=csv` streams the full
+    history instead, reading it in chunks so memory stays flat.
+    """
     permission_classes = [IsAuthenticated]
     
+    EXPORT_CHUNK_SIZE = 500
+    
+    @conditional('quiz.test_history', test_history_validators)
     def get(self, request):
         """Get user's test history"""
         tests = TestAttempt.objects.filter(
             user=request.user,
             is_completed=True
-        ).order_by('-completed_at')
+        ).select_related('user')
         
-        serializer = TestAttemptSerializer(tests, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        export = request.query_params.get('export')
+        if export:
+            return self.export(tests, export)
+        
+        paginator = TestHistoryPagination()
+        page = paginator.paginate_queryset(tests, request, view=self)
+        serializer = TestAttemptSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
+    def export(self, tests, export_format):
+        """Stream the full history as a JSON array or CSV"""
+        rows = (
+            TestAttemptSerializer(test).data
+            for test in tests.order_by('-completed_at', '-id').iterator(
+                chunk_size=self.EXPORT_CHUNK_SIZE
+            )
+        )
+        
+        if export_format == 'json':
+            return streaming_response(iter_json_array(rows), 'application/json')
+        if export_format == 'csv':
+            return streaming_response(
+                iter_csv(TestAttemptSerializer.Meta.fields, rows),
+                'text/csv',
+                filename='test_history.csv'
+            )
+        return Response(
+            {'error': 'Invalid export format. Use json or csv'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class UserTestHistoryStatsView(APIView):
+    """
+    Lifetime stats over the user's completed tests, in one aggregate query,
+    so clients don't have to download the full history to show them.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    DIFFICULTY_RANK = {difficulty: rank for rank, difficulty in enumerate(DIFFICULTIES, 1)}
+    
+    @conditional('quiz.test_history_stats', test_history_validators)
+    def get(self, request):
+        """Get tests completed, average percentage and best difficulty"""
+        stats = TestAttempt.objects.filter(
+            user=request.user,
+            is_completed=True
+        ).aggregate(
+            tests_completed=Count('id'),
+            average_percentage=Avg('percentage'),
+            best_rank=Max(Case(
+                *(When(difficulty=difficulty, then=Value(rank))
+                  for difficulty, rank in self.DIFFICULTY_RANK.items()),
+                output_field=IntegerField()
+            )),
+        )
+        
+        best_difficulty = next(
+            (difficulty for difficulty, rank in self.DIFFICULTY_RANK.items()
+             if rank == stats['best_rank']),
+            None
+        )
+        average = stats['average_percentage']
+        return Response({
+            'tests_completed': stats['tests_completed'],
+            'average_percentage': round(average, 2) if average is not None else None,
+            'best_difficulty': best_difficulty,
+            'best_difficulty_display': dict(Question.DIFFICULTY_CHOICES).get(best_difficulty),
+        }, status=status.HTTP_200_OK)
 
 
 class TestScoreSummaryView(APIView):
@@ -326,8 +514,12 @@ class TestScoreSummaryView(APIView):
     
     def get(self, request, test_id):
         """Get score summary for completed test"""
+        summary = load_snapshot(request.user, test_id, 'summary')
+        if summary is not None:
+            return Response(summary, status=status.HTTP_200_OK)
+        
         try:
-            test = TestAttempt.objects.get(id=test_id, user=request.user)
+            test = TestAttempt.objects.select_related('user').get(id=test_id, user=request.user)
         except TestAttempt.DoesNotExist:
             return Response(
                 {'error': 'Test not found'},
@@ -340,48 +532,9 @@ class TestScoreSummaryView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get score summary
-        summary = {
-            'test_id': test.id,
-            'user_email': test.user.email,
-            'difficulty': test.difficulty,
-            'difficulty_display': test.get_difficulty_display(),
-            'started_at': test.started_at,
-            'completed_at': test.completed_at,
-            'time_taken_seconds': test.time_taken_seconds,
-            'scoring': {
-                'total_questions': test.total_questions,
-                'answered_questions': test.answered_questions,
-                'unanswered_questions': test.unanswered_questions,
-                'correct_answers': test.correct_answers,
-                'incorrect_answers': test.incorrect_answers,
-                'total_score': test.total_score,
-                'max_score': test.max_score,
-                'percentage': round(test.percentage, 2),
-                'points_per_question': test.get_points_per_question(),
-            },
-            'rewards': {
-                'earned_points': test.earned_points,
-                'performance_rating': self._get_performance_rating(test.percentage),
-            }
-        }
-        
-        return Response(summary, status=status.HTTP_200_OK)
+        snapshot_test(test)
+        return Response(render_score_summary(test), status=status.HTTP_200_OK)
     
-    def _get_performance_rating(self, percentage):
-        """Get performance rating based on percentage"""
-        if percentage >= 90:
-            return 'Excellent'
-        elif percentage >= 80:
-            return 'Very Good'
-        elif percentage >= 70:
-            return 'Good'
-        elif percentage >= 60:
-            return 'Satisfactory'
-        elif percentage >= 50:
-            return 'Pass'
-        else:
-            return 'Needs Improvement'
     """Abandon active test"""
     permission_classes = [IsAuthenticated]
     
@@ -424,18 +577,98 @@ class QuestionListView(APIView):
         Query parameters:
         - difficulty: 'easy', 'medium', or 'hard' (optional)
         
-        Returns: {'count': <int>, 'results': [...]}
+        Returns: {'count': <int>, 'counts': {<difficulty>: <int>}, 'results': [...]}
+        
+        Counts come from the maintained QuestionCounter rows, so every
+        difficulty's availability is one small read instead of a COUNT(*).
         """
         difficulty = request.query_params.get('difficulty')
         
-        queryset = Question.objects.all()
+        counts = get_question_counts()
         
         if difficulty:
-            queryset = queryset.filter(difficulty=difficulty)
-        
-        count = queryset.count()
+            count = counts.get(difficulty, 0)
+        else:
+            count = sum(counts.values())
         
         return Response({
             'count': count,
+            'counts': counts,
             'results': []
         }, status=status.HTTP_200_OK)
+
+
+class QuestionExportView(APIView):
+    """
+    Stream the whole question bank with options and explanations.
+    
+    `?export=jsonl` (default) or `?export=csv`, in the formats accepted by
+    `manage.py import_questions`; `?difficulty=` narrows the export.
+    Restricted to content editors since it includes the correct answers.
+    """
+    permission_classes = [IsContentEditor]
+    
+    def get(self, request):
+        difficulty = request.query_params.get('difficulty')
+        if difficulty and difficulty not in DIFFICULTIES:
+            return Response(
+                {'error': f'Invalid difficulty. Use one of: {", ".join(DIFFICULTIES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        records = iter_question_records(difficulty=difficulty)
+        export_format = request.query_params.get('export', 'jsonl')
+        if export_format == 'jsonl':
+            return streaming_response(
+                iter_jsonl(records),
+                'application/x-ndjson',
+                filename='questions.jsonl'
+            )
+        if export_format == 'csv':
+            return streaming_response(
+                iter_csv(CSV_FIELDS, (csv_row(record) for record in records)),
+                'text/csv',
+                filename='questions.csv'
+            )
+        return Response(
+            {'error': 'Invalid export format. Use jsonl or csv'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class QuestionSearchPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class QuestionSearchView(APIView):
+    """
+    Ranked full-text search over question text, options and explanations.
+    
+    `?q=` is required (every word must match, the last as a prefix);
+    `?difficulty=` narrows it. Page-numbered results, best match first.
+    Restricted to content editors since results include the correct answers.
+    """
+    permission_classes = [IsContentEditor]
+    
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query parameter q is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        difficulty = request.query_params.get('difficulty')
+        if difficulty and difficulty not in DIFFICULTIES:
+            return Response(
+                {'error': f'Invalid difficulty. Use one of: {", ".join(DIFFICULTIES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        paginator = QuestionSearchPagination()
+        page = paginator.paginate_queryset(
+            QuestionSearchResults(query, difficulty), request, view=self
+        )
+        serializer = QuestionSearchResultSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
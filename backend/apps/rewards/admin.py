@@ -1,6 +1,6 @@
 from django.contrib import admin
 from .models import (
-    Reward, UserReward, Badge, UserBadge, LeaderboardEntry
+    Reward, UserReward, PointsLedgerEntry, Badge, UserBadge, LeaderboardEntry
 )
 
 
@@ -21,7 +21,7 @@ class RewardAdmin(admin.ModelAdmin):
 class UserRewardAdmin(admin.ModelAdmin):
     """Admin for UserReward model"""
     list_display = ('user', 'reward_name', 'earned_at')
-    search_fields = ('user__username', 'reward__name')
+    search_fields = ('user__email', 'reward__name')
     list_filter = ('reward__name', 'earned_at')
     readonly_fields = ('earned_at',)
     
@@ -30,6 +30,25 @@ class UserRewardAdmin(admin.ModelAdmin):
     reward_name.short_description = 'Reward'
 
 
+@admin.register(PointsLedgerEntry)
+class PointsLedgerEntryAdmin(admin.ModelAdmin):
+    """Read-only admin for the append-only points ledger"""
+    list_display = ('user', 'points', 'reason', 'attempt', 'created_at')
+    search_fields = ('user__email', 'note')
+    list_filter = ('reason', 'created_at')
+    raw_id_fields = ('user', 'attempt')
+    
+    # Grants go through ledger.grant_points so the balance stays in step
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 # ============================================================================
 # LEGACY ADMIN - Kept for backward compatibility
 # ============================================================================
@@ -42,11 +61,11 @@ class BadgeAdmin(admin.ModelAdmin):
 @admin.register(UserBadge)
 class UserBadgeAdmin(admin.ModelAdmin):
     list_display = ('user', 'badge', 'earned_at')
-    search_fields = ('user__username', 'badge__name')
+    search_fields = ('user__email', 'badge__name')
 
 
 @admin.register(LeaderboardEntry)
 class LeaderboardAdmin(admin.ModelAdmin):
     list_display = ('user', 'rank', 'total_points')
-    search_fields = ('user__username',)
+    search_fields = ('user__email',)
     list_filter = ('rank',)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_LEADERBOARD = 'apps.rewards.leaderboard.LocMemLeaderboard'
+
+
+@register(Tags.compatibility, deploy=True)
+def check_shared_leaderboard(app_configs, **kwargs):
+    """
+    Points are added to the live leaderboard by the worker that awarded
+    them, so a per-process board drifts apart between workers until the
+    next snapshot rebuild. Deployments need a shared board.
+    """
+    if settings.REWARDS_LEADERBOARD_BACKEND != PROCESS_LOCAL_LEADERBOARD:
+        return []
+    return [Error(
+        'The leaderboard backend is process-local, so each worker would rank '
+        'users from its own copy of the board.',
+        hint='Set REWARDS_LEADERBOARD_BACKEND to '
+             'apps.rewards.leaderboard.RedisLeaderboard.',
+        id='rewards.E001',
+    )]
@@ -0,0 +1,276 @@
+import threading
+from bisect import bisect_left, insort
+from functools import lru_cache
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from apps.accounts.models import User, UserProfile
+from apps.core.metrics import metrics
+from .models import LeaderboardEntry
+
+
+# ============================================================================
+# LEADERBOARD BACKENDS - Users sorted by points balance
+# ============================================================================
+# Scores mirror UserProfile.total_points. Ledger grants bump them on commit
+# (see ledger.py); rebuild_leaderboard() reloads them from the profiles and
+# the periodic snapshot persists the top of the board to LeaderboardEntry.
+# Every user with a profile is on the board (so deductions below 0 rank
+# correctly); users without one rank as 0 points.
+class LocMemLeaderboard:
+    """
+    In-process sorted list (bisect) for tests and single-process development.
+
+    Lookups are O(log n); inserts shift the list, which is a memmove and
+    fast at this scale. Scores live in this worker only, so every process
+    keeps its own copy; use RedisLeaderboard with more than one worker.
+    """
+
+    def __init__(self, **kwargs):
+        self._lock = threading.Lock()
+        self._scores = {}
+        # (-score, user_id), so the highest score comes first
+        self._entries = []
+        self._built = False
+
+    def is_built(self):
+        return self._built
+
+    def incr(self, user_id, delta):
+        """Add delta to a user's score"""
+        with self._lock:
+            old = self._scores.get(user_id)
+            if old is not None:
+                del self._entries[bisect_left(self._entries, (-old, user_id))]
+            score = (old or 0) + delta
+            self._scores[user_id] = score
+            insort(self._entries, (-score, user_id))
+
+    def replace(self, scores):
+        """Swap in a full set of (user_id, score) pairs"""
+        scores = dict(scores)
+        entries = sorted((-score, user_id) for user_id, score in scores.items())
+        with self._lock:
+            self._scores = scores
+            self._entries = entries
+            self._built = True
+
+    def score(self, user_id):
+        return self._scores.get(user_id)
+
+    def count(self):
+        return len(self._entries)
+
+    def count_above(self, score):
+        """Number of users with a strictly higher score"""
+        with self._lock:
+            return bisect_left(self._entries, (-score,))
+
+    def position(self, user_id):
+        """0-based position on the board, or None if the user has no score"""
+        with self._lock:
+            score = self._scores.get(user_id)
+            if score is None:
+                return None
+            return bisect_left(self._entries, (-score, user_id))
+
+    def range(self, start, stop):
+        """[(user_id, score)] for positions start..stop-1, best first"""
+        with self._lock:
+            return [(user_id, -negated) for negated, user_id in self._entries[start:stop]]
+
+
+class RedisLeaderboard:
+    """
+    Redis sorted set shared by all workers.
+
+    ZINCRBY on grants; ranks, ranges and counts are O(log n) ZREVRANK /
+    ZREVRANGE / ZCOUNT. A rebuild loads a temporary key and RENAMEs it over
+    the live one, so readers never see a partial board.
+    """
+
+    KEY = 'rewards:leaderboard'
+    BUILT_KEY = 'rewards:leaderboard:built'
+    LOAD_BATCH_SIZE = 5000
+
+    def __init__(self, url=None, **kwargs):
+        import redis
+
+        self._redis = redis.Redis.from_url(url or settings.REWARDS_LEADERBOARD_URL)
+
+    def is_built(self):
+        return bool(self._redis.exists(self.BUILT_KEY))
+
+    def incr(self, user_id, delta):
+        self._redis.zincrby(self.KEY, delta, user_id)
+
+    def replace(self, scores):
+        staging = f'{self.KEY}:staging'
+        pipe = self._redis.pipeline()
+        pipe.delete(staging)
+        scores = iter(scores)
+        for batch in iter(lambda: dict(islice(scores, self.LOAD_BATCH_SIZE)), {}):
+            pipe.zadd(staging, batch)
+            pipe.execute()
+        if self._redis.exists(staging):
+            pipe.rename(staging, self.KEY)
+        else:
+            pipe.delete(self.KEY)
+        pipe.set(self.BUILT_KEY, 1)
+        pipe.execute()
+
+    def score(self, user_id):
+        score = self._redis.zscore(self.KEY, user_id)
+        return None if score is None else int(score)
+
+    def count(self):
+        return self._redis.zcard(self.KEY)
+
+    def count_above(self, score):
+        return self._redis.zcount(self.KEY, f'({score}', '+inf')
+
+    def position(self, user_id):
+        return self._redis.zrevrank(self.KEY, user_id)
+
+    def range(self, start, stop):
+        if stop <= start:
+            return []
+        return [
+            (int(user_id), int(score))
+            for user_id, score in self._redis.zrevrange(self.KEY, start, stop - 1, withscores=True)
+        ]
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_leaderboard():
+    """Return the configured backend, loading it from the profiles on first use"""
+    board = _load_backend(settings.REWARDS_LEADERBOARD_BACKEND)
+    if not board.is_built():
+        rebuild_leaderboard(board)
+    return board
+
+
+# ============================================================================
+# UPDATES
+# ============================================================================
+def record_points(user_id, points):
+    """Move a user's score once the grant's transaction commits"""
+    def update():
+        board = _load_backend(settings.REWARDS_LEADERBOARD_BACKEND)
+        # An unbuilt board picks the grant up when it is first loaded
+        if board.is_built():
+            board.incr(user_id, points)
+
+    if points:
+        transaction.on_commit(update)
+
+
+def rebuild_leaderboard(board=None, batch_size=5000):
+    """
+    Reload every score from UserProfile.total_points; returns the number of
+    users on the board.
+
+    This also repairs drift from grants whose post-commit update was lost.
+    Grants committed while the rebuild runs may be missed until the next one.
+    """
+    board = board or _load_backend(settings.REWARDS_LEADERBOARD_BACKEND)
+    loaded = 0
+
+    def scores():
+        nonlocal loaded
+        rows = (
+            UserProfile.objects.order_by()
+            .values_list('user_id', 'total_points')
+            .iterator(chunk_size=batch_size)
+        )
+        for row in rows:
+            loaded += 1
+            yield row
+
+    board.replace(scores())
+    metrics.incr('rewards.leaderboard.rebuilt')
+    return loaded
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+def _ranked(board, start, rows):
+    """
+    Attach competition ranks ("1224") to a contiguous slice of the board:
+    a user's rank is one more than the number of users scoring higher.
+    """
+    ranked = []
+    previous = None
+    for offset, (user_id, score) in enumerate(rows):
+        if previous is None:
+            rank = board.count_above(score) + 1
+        elif score != previous:
+            rank = start + offset + 1
+        ranked.append({'rank': rank, 'user_id': user_id, 'total_points': score})
+        previous = score
+    return ranked
+
+
+def _with_usernames(entries):
+    """Add each user's email as `username` with one query"""
+    emails = dict(
+        User.objects.filter(id__in=[entry['user_id'] for entry in entries]).values_list('id', 'email')
+    )
+    for entry in entries:
+        entry['username'] = emails.get(entry['user_id'])
+    return entries
+
+
+def top_entries(limit):
+    """The best `limit` users, best first"""
+    board = get_leaderboard()
+    return _with_usernames(_ranked(board, 0, board.range(0, limit)))
+
+
+def user_standing(user, radius):
+    """
+    A user's rank and points plus up to `radius` users either side of them.
+    Users not on the board yet stand just below its last user.
+    """
+    board = get_leaderboard()
+    score = board.score(user.id)
+    position = board.position(user.id)
+    if position is None:
+        score = 0
+        position = board.count()
+    start = max(position - radius, 0)
+    neighbors = _with_usernames(_ranked(board, start, board.range(start, position + radius + 1)))
+    return {
+        'rank': board.count_above(score) + 1,
+        'total_points': score,
+        'neighbors': neighbors,
+    }
+
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+def snapshot_leaderboard(size=None):
+    """
+    Compact the live board (rebuild it from the profiles) and persist its
+    top `size` users to LeaderboardEntry. Returns the number of rows saved.
+    """
+    size = size or settings.REWARDS_LEADERBOARD_SNAPSHOT_SIZE
+    board = get_leaderboard()
+    rebuild_leaderboard(board)
+    entries = _ranked(board, 0, board.range(0, size))
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(user_id=entry['user_id'], total_points=entry['total_points'], rank=entry['rank'])
+            for entry in entries
+        ])
+    return len(entries)
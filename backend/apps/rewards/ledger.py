@@ -0,0 +1,60 @@
+from django.db import transaction
+
+from apps.accounts.models import UserProfile
+from apps.accounts.stats import increment_profile_stats
+from apps.friends.leaderboard import invalidate_points
+from .leaderboard import record_points
+from .models import PointsLedgerEntry
+
+
+# ============================================================================
+# POINTS LEDGER - Append-only grants plus a maintained balance
+# ============================================================================
+# Every grant is a PointsLedgerEntry row; the balance is
+# UserProfile.total_points, bumped in the same transaction as the grant, so
+# reward endpoints read it in O(1) instead of summing history. Each grant
+# also moves the user's leaderboard score and drops the cached friends
+# leaderboards that list them once it commits.
+# `manage.py reconcile_profile_stats` rebuilds balances from the ledger.
+def record_test_points(test):
+    """
+    Append the grant for a just-completed attempt.
+
+    Must run in the completion transaction, next to record_test_completion
+    (which adds the same points to the balance). The ledger allows one
+    grant per attempt, so a second award raises IntegrityError and rolls
+    the completion back instead of double counting.
+    """
+    if test.earned_points:
+        PointsLedgerEntry.objects.create(
+            user_id=test.user_id,
+            attempt_id=test.id,
+            points=test.earned_points,
+            reason=PointsLedgerEntry.REASON_TEST_COMPLETED,
+            created_at=test.completed_at,
+        )
+        _points_changed(test.user_id, test.earned_points)
+
+
+def grant_points(user, points, reason=PointsLedgerEntry.REASON_ADJUSTMENT, note=''):
+    """Append a grant (negative to deduct) and apply it to the balance"""
+    with transaction.atomic():
+        entry = PointsLedgerEntry.objects.create(
+            user=user,
+            points=points,
+            reason=reason,
+            note=note,
+        )
+        increment_profile_stats(user.id, total_points=points)
+        _points_changed(user.id, points)
+    return entry
+
+
+def get_points_balance(user):
+    """The user's current balance (0 before their first grant)"""
+    return UserProfile.objects.filter(user=user).values_list('total_points', flat=True).first() or 0
+
+
+def _points_changed(user_id, points):
+    record_points(user_id, points)
+    transaction.on_commit(lambda: invalidate_points(user_id))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.rewards.ledger import get_points_balance, grant_points
+
+
+class Command(BaseCommand):
+    help = 'Record a manual points adjustment in the ledger and apply it to the balance'
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='User to adjust')
+        parser.add_argument('points', type=int, help='Points to grant (negative to deduct)')
+        parser.add_argument('--note', default='', help='Reason, kept with the ledger entry')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f'No such user: {options["email"]}')
+        if not options['points']:
+            raise CommandError('Points must be non-zero')
+
+        grant_points(user, options['points'], note=options['note'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["points"]:+d} points for {user.email}; balance {get_points_balance(user)}'
+        ))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.rewards.leaderboard import rebuild_leaderboard, snapshot_leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the live leaderboard from profile balances (fallback for the beat task)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--snapshot',
+            action='store_true',
+            help='Also save the top of the board to LeaderboardEntry'
+        )
+        parser.add_argument('--size', type=int, help='Override REWARDS_LEADERBOARD_SNAPSHOT_SIZE')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['snapshot']:
+            saved = snapshot_leaderboard(size=options['size'])
+            summary = f'Rebuilt the leaderboard and saved the top {saved} users'
+        else:
+            summary = f'Rebuilt the leaderboard with {rebuild_leaderboard()} users'
+        self.stdout.write(self.style.SUCCESS(f'{summary} in {time.perf_counter() - started:.1f}s'))
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_ledger(apps, schema_editor):
+    """Record a grant for every completed attempt that earned points"""
+    TestAttempt = apps.get_model('quiz', 'TestAttempt')
+    PointsLedgerEntry = apps.get_model('rewards', 'PointsLedgerEntry')
+    attempts = (
+        TestAttempt.objects.filter(is_completed=True, earned_points__gt=0)
+        .order_by('id')
+        .values_list('id', 'user_id', 'earned_points', 'completed_at')
+        .iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    )
+    batch = []
+    for attempt_id, user_id, points, completed_at in attempts:
+        batch.append(PointsLedgerEntry(
+            user_id=user_id,
+            attempt_id=attempt_id,
+            points=points,
+            reason='test_completed',
+            created_at=completed_at or django.utils.timezone.now(),
+        ))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            PointsLedgerEntry.objects.bulk_create(batch)
+            batch = []
+    PointsLedgerEntry.objects.bulk_create(batch)
+    backfill_balances(apps)
+
+
+def backfill_balances(apps):
+    """
+    Make every profile's total_points the sum of its user's ledger (0 with
+    no entries), the way reconcile_profile_stats computes the balance.
+    """
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    PointsLedgerEntry = apps.get_model('rewards', 'PointsLedgerEntry')
+    balances = dict(
+        PointsLedgerEntry.objects.values('user_id')
+        .annotate(total=models.Sum('points'))
+        .values_list('user_id', 'total')
+    )
+    now = django.utils.timezone.now()
+    drifted = []
+    profiles = UserProfile.objects.order_by('user_id').only('id', 'user_id', 'total_points')
+    for profile in profiles.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        balance = balances.get(profile.user_id) or 0
+        if profile.total_points != balance:
+            profile.total_points = balance
+            profile.updated_at = now
+            drifted.append(profile)
+    UserProfile.objects.bulk_update(drifted, ['total_points', 'updated_at'], batch_size=BACKFILL_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('accounts', '0005_userprofile_total_questions'),
+        ('quiz', '0001_initial'),
+        ('rewards', '0003_remove_userreward_unique_user_reward_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(help_text='Points granted (negative for deductions)')),
+                ('reason', models.CharField(choices=[('test_completed', 'Test completed'), ('adjustment', 'Adjustment')], max_length=20)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('attempt', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='points_grant', to='quiz.testattempt')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_ledger', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'rewards_points_ledger',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='rewards_poi_user_id_629f53_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
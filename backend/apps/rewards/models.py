@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.db.models import Sum
+from django.utils import timezone
 
 # ============================================================================
 # REWARD MODEL - Point-based achievement tiers
@@ -71,7 +72,53 @@ class UserReward(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.user.username} - {self.reward.get_name_display()}"
+        return f"{self.user.email} - {self.reward.get_name_display()}"
+
+
+# ============================================================================
+# POINTS LEDGER MODEL - Append-only history of point grants
+# ============================================================================
+class PointsLedgerEntry(models.Model):
+    """
+    One point grant. Rows are only ever inserted; the user's balance is
+    maintained alongside in UserProfile.total_points (see ledger.py) and
+    always equals the sum of their entries.
+    """
+    REASON_TEST_COMPLETED = 'test_completed'
+    REASON_ADJUSTMENT = 'adjustment'
+    REASON_CHOICES = [
+        (REASON_TEST_COMPLETED, 'Test completed'),
+        (REASON_ADJUSTMENT, 'Adjustment'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='points_ledger'
+    )
+    points = models.IntegerField(help_text='Points granted (negative for deductions)')
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    # Unique, so an attempt can never be awarded twice
+    attempt = models.OneToOneField(
+        'quiz.TestAttempt',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='points_grant'
+    )
+    note = models.CharField(max_length=255, blank=True)
+    # Not auto_now_add, so backfilled grants keep their completion time
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        db_table = 'rewards_points_ledger'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.email} {self.points:+d} ({self.get_reason_display()})"
 
 
 # ============================================================================
@@ -98,7 +145,7 @@ class UserBadge(models.Model):
         unique_together = ('user', 'badge')
 
     def __str__(self):
-        return f'{self.user.username} - {self.badge.name}'
+        return f'{self.user.email} - {self.badge.name}'
 
 
 class LeaderboardEntry(models.Model):
@@ -109,4 +156,4 @@ class LeaderboardEntry(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f'{self.user.username} - Rank {self.rank}'
+        return f'{self.user.email} - Rank {self.rank}'
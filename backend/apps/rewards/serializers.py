@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.db.models import Sum
-from .models import Reward, UserReward, Badge, UserBadge, LeaderboardEntry
+from .models import Reward, UserReward, Badge, UserBadge, LeaderboardEntry, PointsLedgerEntry
 
 
 class RewardSerializer(serializers.ModelSerializer):
@@ -65,6 +65,30 @@ class UserRewardsResponseSerializer(serializers.Serializer):
         return RewardSerializer(locked, many=True).data
 
 
+class PointsLedgerEntrySerializer(serializers.ModelSerializer):
+    """Serializer for one points ledger entry"""
+    reason_display = serializers.CharField(source='get_reason_display', read_only=True)
+    
+    class Meta:
+        model = PointsLedgerEntry
+        fields = ['id', 'points', 'reason', 'reason_display', 'attempt', 'note', 'created_at']
+
+
+class LeaderboardRankSerializer(serializers.Serializer):
+    """One ranked user from the live leaderboard"""
+    rank = serializers.IntegerField()
+    user_id = serializers.IntegerField()
+    username = serializers.CharField(allow_null=True)
+    total_points = serializers.IntegerField()
+
+
+class LeaderboardStandingSerializer(serializers.Serializer):
+    """The current user's rank plus the users ranked around them"""
+    rank = serializers.IntegerField()
+    total_points = serializers.IntegerField()
+    neighbors = LeaderboardRankSerializer(many=True)
+
+
 # ============================================================================
 # LEGACY SERIALIZERS - Kept for backward compatibility
 # ============================================================================
@@ -86,7 +110,7 @@ class UserBadgeSerializer(serializers.ModelSerializer):
 
 class LeaderboardSerializer(serializers.ModelSerializer):
     """Legacy leaderboard serializer"""
-    username = serializers.CharField(source='user.username', read_only=True)
+    username = serializers.CharField(source='user.email', read_only=True)
     
     class Meta:
         model = LeaderboardEntry
@@ -97,7 +121,7 @@ class LeaderboardSerializer(serializers.ModelSerializer):
         fields = ('id', 'badge', 'earned_at')
 
 class LeaderboardSerializer(serializers.ModelSerializer):
-    username = serializers.CharField(source='user.username', read_only=True)
+    username = serializers.CharField(source='user.email', read_only=True)
 
     class Meta:
         model = LeaderboardEntry
@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from . import leaderboard
+
+
+# ============================================================================
+# LEADERBOARD TASKS
+# ============================================================================
+@shared_task
+def snapshot_leaderboard():
+    """Periodically compact the live leaderboard and persist its top users"""
+    return leaderboard.snapshot_leaderboard()
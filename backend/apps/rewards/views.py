@@ -3,17 +3,29 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
-from django.db.models import Sum
-from .models import Reward, UserReward, LeaderboardEntry, UserBadge
+from django.db.models import Count, Max
+from apps.core.conditional import conditional
+from apps.core.pagination import KeysetPagination
+from .leaderboard import top_entries, user_standing
+from .ledger import get_points_balance
+from .models import Reward, UserReward, UserBadge, PointsLedgerEntry
 from .serializers import (
+    PointsLedgerEntrySerializer,
     RewardSerializer,
     UserRewardSerializer,
     UserRewardsResponseSerializer,
-    LeaderboardSerializer,
+    LeaderboardRankSerializer,
+    LeaderboardStandingSerializer,
     UserBadgeSerializer
 )
 
 
+def reward_catalog_validators(request, *args, **kwargs):
+    """Validate the reward catalog by its size and latest update"""
+    state = Reward.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    return (state['count'], state['latest']), state['latest']
+
+
 class RewardViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Reward management.
@@ -24,11 +36,20 @@ class RewardViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /rewards/{id}/ - Retrieve specific reward
     - GET /rewards/user-rewards/ - Get user's reward progress
     - POST /rewards/check-and-award/ - Award unlocked rewards
+    - GET /rewards/points-history/ - User's points ledger
     """
     queryset = Reward.objects.all().order_by('min_points')
     serializer_class = RewardSerializer
     permission_classes = [IsAuthenticated]
     
+    @conditional('rewards.catalog', reward_catalog_validators)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional('rewards.catalog', reward_catalog_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_serializer_class(self):
         if self.action == 'user_rewards':
             return UserRewardsResponseSerializer
@@ -105,18 +126,24 @@ class RewardViewSet(viewsets.ReadOnlyModelViewSet):
     @staticmethod
     def _get_user_total_points(user):
         """
-        Calculate total points earned by user across all completed quizzes.
-        Queries the quiz app's QuizResult model.
+        User's points balance, maintained alongside the points ledger
+        (one indexed lookup, no aggregate over quiz history).
         """
-        try:
-            from apps.quiz.models import QuizResult
-            total = QuizResult.objects.filter(
-                user=user,
-                is_completed=True
-            ).aggregate(Sum('earned_points'))['earned_points__sum'] or 0
-            return total
-        except (ImportError, Exception):
-            return 0
+        return get_points_balance(user)
+    
+    @action(detail=False, methods=['get'], url_path='points-history')
+    def points_history(self, request):
+        """
+        GET /rewards/points-history/
+        
+        The user's point grants, newest first, as keyset-paginated pages
+        ({'next', 'results'}); follow `next` to page further back.
+        """
+        entries = PointsLedgerEntry.objects.filter(user=request.user)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(entries, request, view=self)
+        serializer = PointsLedgerEntrySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['post'], url_path='check-and-award')
     def check_and_award(self, request):
@@ -162,19 +189,53 @@ class RewardViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 # ============================================================================
-# LEGACY VIEWS - Kept for backward compatibility
+# LEADERBOARD VIEWS
 # ============================================================================
+def _int_param(request, name, default, maximum):
+    try:
+        value = int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(1, min(value, maximum))
+
+
 class LeaderboardView(APIView):
-    """Legacy leaderboard view"""
+    """
+    GET /rewards/leaderboard/?limit=100
+    
+    Top users by points from the live leaderboard, best first. Users with
+    equal points share a rank (1, 2, 2, 4).
+    """
+    MAX_LIMIT = 100
+    
+    def get(self, request):
+        limit = _int_param(request, 'limit', self.MAX_LIMIT, self.MAX_LIMIT)
+        serializer = LeaderboardRankSerializer(top_entries(limit), many=True)
+        return Response(serializer.data)
+
+
+class LeaderboardStandingView(APIView):
+    """
+    GET /rewards/leaderboard/me/?radius=5
+    
+    The current user's rank and points plus up to `radius` users ranked
+    either side of them.
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_RADIUS = 25
+    
     def get(self, request):
-        leaderboard = LeaderboardEntry.objects.all().order_by('rank')[:100]
-        serializer = LeaderboardSerializer(leaderboard, many=True)
+        radius = _int_param(request, 'radius', 5, self.MAX_RADIUS)
+        serializer = LeaderboardStandingSerializer(user_standing(request.user, radius))
         return Response(serializer.data)
 
 
+# ============================================================================
+# LEGACY VIEWS - Kept for backward compatibility
+# ============================================================================
 class UserBadgesView(APIView):
     """Legacy user badges view"""
     def get(self, request, user_id):
-        badges = UserBadge.objects.filter(user_id=user_id)
+        badges = UserBadge.objects.filter(user_id=user_id).select_related('badge')
         serializer = UserBadgeSerializer(badges, many=True)
         return Response(serializer.data)
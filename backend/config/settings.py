@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'corsheaders',
     'channels',
+    'apps.core',
     'apps.accounts',
     'apps.quiz',
     'apps.rewards',
@@ -187,6 +188,20 @@ CHANNEL_LAYERS = {
     },
 }
 
+# ============================================================================
+# CACHE CONFIGURATION
+# ============================================================================
+# Local memory by default; point at Redis in production (`check --deploy`
+# fails without a shared cache, see apps/quiz/checks.py), e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://localhost:6379/1
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='quiz-platform'),
+    },
+}
+
 # ============================================================================
 # CELERY CONFIGURATION
 # ============================================================================
@@ -195,6 +210,89 @@ CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
+# Run tasks in-process (no broker/worker needed) - useful for tests and local dev
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_BEAT_SCHEDULE = {
+    'refill-paper-pools': {
+        'task': 'apps.quiz.tasks.refill_all_paper_pools',
+        'schedule': 60.0,
+    },
+}
+
+# ============================================================================
+# QUIZ ENGINE CONFIGURATION
+# ============================================================================
+# Number of questions drawn for each test
+QUIZ_QUESTIONS_PER_TEST = config('QUIZ_QUESTIONS_PER_TEST', default=15, cast=int)
+
+# How test questions are drawn: 'pool' (in-memory ID arrays, fine up to a few
+# hundred thousand questions) or 'random_key' (indexed probes, no full ID load;
+# picked questions get fresh keys from a Celery task, so it needs a worker
+# unless tasks run eagerly)
+QUIZ_SAMPLING_STRATEGY = config('QUIZ_SAMPLING_STRATEGY', default='pool')
+
+# Avoid giving users questions they have already seen while unseen ones remain
+QUIZ_EXCLUDE_SEEN_QUESTIONS = config('QUIZ_EXCLUDE_SEEN_QUESTIONS', default=False, cast=bool)
+
+# Pre-generated paper pool (needs a Celery worker unless tasks run eagerly)
+QUIZ_PAPER_POOL_ENABLED = config('QUIZ_PAPER_POOL_ENABLED', default=False, cast=bool)
+QUIZ_PAPER_POOL_TARGET_SIZE = config('QUIZ_PAPER_POOL_TARGET_SIZE', default=200, cast=int)
+QUIZ_PAPER_POOL_LOW_WATERMARK = config('QUIZ_PAPER_POOL_LOW_WATERMARK', default=50, cast=int)
+QUIZ_PAPER_POOL_REFILL_LOCK_SECONDS = 30
+
+# Write-behind answer buffer for in-progress tests (off when empty). Use
+# apps.quiz.answer_buffer.RedisAnswerBuffer in production so answers survive
+# worker restarts; LocMemAnswerBuffer is in-process only.
+QUIZ_ANSWER_BUFFER_BACKEND = config('QUIZ_ANSWER_BUFFER_BACKEND', default='')
+QUIZ_ANSWER_BUFFER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+QUIZ_ANSWER_BUFFER_FLUSH_INTERVAL = config('QUIZ_ANSWER_BUFFER_FLUSH_INTERVAL', default=30, cast=int)
+CELERY_BEAT_SCHEDULE['flush-answer-buffers'] = {
+    'task': 'apps.quiz.tasks.flush_answer_buffers',
+    'schedule': float(QUIZ_ANSWER_BUFFER_FLUSH_INTERVAL),
+}
+
+# Seconds before a per-difficulty question ID pool is reloaded from the DB
+QUIZ_QUESTION_POOL_TTL = config('QUIZ_QUESTION_POOL_TTL', default=300, cast=int)
+
+# Users (by email) allowed to export the question bank, answers included
+QUIZ_CONTENT_EDITOR_EMAILS = config('QUIZ_CONTENT_EDITOR_EMAILS', default='', cast=Csv())
+
+# Time limit for a test attempt. Past it, answers are rejected and the attempt
+# is expired: 'complete' scores what was answered, 'delete' removes it.
+# A periodic sweep (or `manage.py expire_attempts`) handles abandoned attempts
+# in batches of QUIZ_EXPIRY_BATCH_SIZE.
+QUIZ_ATTEMPT_TIME_LIMIT_SECONDS = config('QUIZ_ATTEMPT_TIME_LIMIT_SECONDS', default=1800, cast=int)
+QUIZ_EXPIRED_ATTEMPT_ACTION = config('QUIZ_EXPIRED_ATTEMPT_ACTION', default='complete')
+QUIZ_EXPIRY_BATCH_SIZE = config('QUIZ_EXPIRY_BATCH_SIZE', default=200, cast=int)
+CELERY_BEAT_SCHEDULE['expire-stale-attempts'] = {
+    'task': 'apps.quiz.tasks.expire_stale_attempts',
+    'schedule': 300.0,
+}
+
+# ============================================================================
+# REWARDS CONFIGURATION
+# ============================================================================
+# Live leaderboard (users sorted by points balance). Use
+# apps.rewards.leaderboard.RedisLeaderboard in production so every worker
+# shares one board; LocMemLeaderboard keeps a copy per process and fails the
+# deploy check (rewards.E001).
+REWARDS_LEADERBOARD_BACKEND = config(
+    'REWARDS_LEADERBOARD_BACKEND',
+    default='apps.rewards.leaderboard.LocMemLeaderboard'
+)
+REWARDS_LEADERBOARD_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+# The periodic compaction rebuilds the board from the profiles and saves its
+# top REWARDS_LEADERBOARD_SNAPSHOT_SIZE users to LeaderboardEntry
+REWARDS_LEADERBOARD_SNAPSHOT_SIZE = config('REWARDS_LEADERBOARD_SNAPSHOT_SIZE', default=1000, cast=int)
+CELERY_BEAT_SCHEDULE['snapshot-leaderboard'] = {
+    'task': 'apps.rewards.tasks.snapshot_leaderboard',
+    'schedule': config('REWARDS_LEADERBOARD_SNAPSHOT_INTERVAL', default=600.0, cast=float),
+}
+
+# Seconds a user's friends leaderboard and friend set stay cached; both are
+# also invalidated on friendship and points changes
+FRIENDS_LEADERBOARD_CACHE_TIMEOUT = config('FRIENDS_LEADERBOARD_CACHE_TIMEOUT', default=300, cast=int)
 
 # ============================================================================
 # DJANGO ADMIN DISABLED (per requirements - no admin, no superuser)
@@ -11,6 +11,7 @@ urlpatterns = [
     path('api/rewards/', include('apps.rewards.urls')),
     path('api/friends/', include('apps.friends.urls')),
     path('api/chat/', include('apps.chat.urls')),
+    path('api/metrics/', include('apps.core.urls')),
 ]
 
 if settings.DEBUG:
@@ -7,6 +7,9 @@ Usage:
 
 Or run directly:
     python seed_questions.py
+
+For large question banks use the streaming importer instead:
+    python manage.py import_questions bank.jsonl
 """
 
 import os
@@ -17,6 +20,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
 from apps.quiz.models import Question, QuestionOption
+from apps.quiz.question_import import parse_question_row, save_question_chunk
 
 
 # ============================================================================
@@ -319,39 +323,19 @@ QUESTIONS_DATA = {
 def seed_questions():
     """
     Seed the database with quiz questions.
-    Creates 15 easy, 15 medium, and 15 hard questions with their options.
+    Upserts 15 easy, 15 medium, and 15 hard questions with their options in
+    one bulk transaction, so running it again is safe.
     """
     print("Starting database seeding...")
     
-    total_created = 0
-    
-    for difficulty, questions in QUESTIONS_DATA.items():
-        print(f"\nCreating {len(questions)} {difficulty.upper()} questions...")
-        
-        for i, question_data in enumerate(questions, 1):
-            # Create Question
-            question = Question.objects.create(
-                text=question_data['text'],
-                difficulty=difficulty,
-                explanation=question_data['explanation'],
-            )
-            
-            # Create Options for this Question
-            options = question_data['options']
-            correct_idx = question_data['correct_idx']
-            
-            for order, option_text in enumerate(options):
-                QuestionOption.objects.create(
-                    question=question,
-                    text=option_text,
-                    is_correct=(order == correct_idx),
-                    order=order,
-                )
-            
-            print(f"   [OK] Question {i}/15: {question.text[:60]}...")
-            total_created += 1
+    rows = [
+        parse_question_row(dict(question_data, difficulty=difficulty))
+        for difficulty, questions in QUESTIONS_DATA.items()
+        for question_data in questions
+    ]
+    created, updated = save_question_chunk(rows)
     
-    print(f"\n[SUCCESS] Created {total_created} questions with {total_created * 4} options!")
+    print(f"\n[SUCCESS] {created} questions created, {updated} updated!")
     print(f"\nDatabase Summary:")
     print(f"   - Easy:   {Question.objects.filter(difficulty='easy').count()} questions")
     print(f"   - Medium: {Question.objects.filter(difficulty='medium').count()} questions")
@@ -379,7 +363,7 @@ def clear_questions():
 if __name__ == '__main__':
     import sys
     
-    # Check for command line arguments
+    # Seeding upserts, so existing questions are updated rather than duplicated
     if len(sys.argv) > 1 and sys.argv[1] == '--clear':
         response = input("[WARNING] Are you sure you want to delete all questions? (yes/no): ")
         if response.lower() == 'yes':
@@ -389,14 +373,4 @@ if __name__ == '__main__':
         else:
             print("Cancelled.")
     else:
-        # Check if data already exists
-        if Question.objects.exists():
-            print("[ERROR] Questions already exist in the database!")
-            response = input("Do you want to:\n  1) Skip seeding\n  2) Clear and reseed\n\nEnter choice (1 or 2): ")
-            if response == '2':
-                clear_questions()
-                seed_questions()
-            else:
-                print("Skipped seeding.")
-        else:
-            seed_questions()
+        seed_questions()
@@ -8,18 +8,22 @@ export default function Dashboard() {
   const { user, logout } = useContext(AuthContext);
   const [profile, setProfile] = useState(null);
   const [testHistory, setTestHistory] = useState([]);
+  const [historyStats, setHistoryStats] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        // Fetch user profile
-        const profileResponse = await api.get('/auth/profile/');
+        // Lifetime stats are aggregated on the server; the table only
+        // needs the first page of history
+        const [profileResponse, statsResponse, historyResponse] = await Promise.all([
+          api.get('/auth/profile/'),
+          api.get('/quiz/history/stats/'),
+          api.get('/quiz/history/', { params: { page_size: 5 } }),
+        ]);
         setProfile(profileResponse.data);
-
-        // Fetch test history
-        const historyResponse = await api.get('/quiz/history/');
-        setTestHistory(historyResponse.data);
+        setHistoryStats(statsResponse.data);
+        setTestHistory(historyResponse.data.results);
       } catch (error) {
         console.error('Failed to fetch data:', error);
       } finally {
@@ -133,14 +137,14 @@ export default function Dashboard() {
               <div className="stat-card">
                 <span className="stat-icon">✅</span>
                 <span className="stat-label">Tests Completed</span>
-                <span className="stat-value">{testHistory.length}</span>
+                <span className="stat-value">{historyStats?.tests_completed ?? 0}</span>
               </div>
               <div className="stat-card">
                 <span className="stat-icon">🎯</span>
                 <span className="stat-label">Avg Score</span>
                 <span className="stat-value">
-                  {testHistory.length > 0
-                    ? (testHistory.reduce((sum, test) => sum + test.percentage, 0) / testHistory.length).toFixed(1)
+                  {historyStats?.average_percentage != null
+                    ? historyStats.average_percentage.toFixed(1)
                     : '--'}
                   %
                 </span>
@@ -149,12 +153,7 @@ export default function Dashboard() {
                 <span className="stat-icon">🏆</span>
                 <span className="stat-label">Best Difficulty</span>
                 <span className="stat-value">
-                  {testHistory.length > 0
-                    ? testHistory.reduce((prev, current) => {
-                      const difficultyOrder = { easy: 1, medium: 2, hard: 3 };
-                      return difficultyOrder[current.difficulty] > difficultyOrder[prev.difficulty] ? current : prev;
-                    }).difficulty_display || '--'
-                    : '--'}
+                  {historyStats?.best_difficulty_display || '--'}
                 </span>
               </div>
             </div>
@@ -189,8 +189,14 @@ frontend/src/
  * GET /quiz/test/{testId}/results/
  * Response: Full test results with all responses
  * 
- * GET /quiz/history/
- * Response: Array of completed tests
+ * GET /quiz/history/?cursor=<cursor>&page_size=20
+ * Response: { next: <url or null>, results: [completed tests, newest first] }
+ * 
+ * GET /quiz/history/?export=json (or ?export=csv)
+ * Response: Full history, streamed (array of completed tests / CSV file)
+ * 
+ * GET /quiz/history/stats/
+ * Response: { tests_completed, average_percentage, best_difficulty, best_difficulty_display }
  */
 
 // ============================================================================
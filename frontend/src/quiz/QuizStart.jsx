@@ -84,17 +84,16 @@ const QuizStart = () => {
         setCheckingQuestions(true);
         const counts = {};
         
-        // Fetch count for each difficulty
+        // One request returns the count for every difficulty
+        let available = {};
+        try {
+          const response = await api.get(`/quiz/questions/`);
+          available = response.data?.counts || {};
+        } catch (err) {
+          available = {};
+        }
         for (const difficulty of ['easy', 'medium', 'hard']) {
-          try {
-            const response = await api.get(`/quiz/questions/`, {
-              params: { difficulty: difficulty, page_size: 1 },
-            });
-            counts[difficulty] = response.data?.count || 0;
-          } catch (err) {
-            // If endpoint doesn't support filtering, try individual fetch
-            counts[difficulty] = 0;
-          }
+          counts[difficulty] = available[difficulty] || 0;
         }
         
         setQuestionCounts(counts);